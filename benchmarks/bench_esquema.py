@@ -0,0 +1,118 @@
+# benchmarks/bench_esquema.py
+"""
+Benchmark do esquema de entrada compilado (src/utils/esquema_entrada.py) x
+pipeline do scikit-learn recebendo um DataFrame.
+
+- Pré-processamento: ColumnTransformer.transform(DataFrame) x
+  EsquemaEntrada.transformar(dicionário de arrays).
+- Ponta a ponta (formulário -> probabilidades): preparar_lote_para_previsao
+  + pipeline.predict_proba x preparar_colunas_para_previsao +
+  PipelineCompilado.predict_proba (sem DataFrame).
+
+Confere que a matriz pré-processada e as probabilidades são idênticas nos
+dois caminhos, também com valores ausentes (None/NaN nas categóricas, uma
+categórica inteira vazia e NaN na idade), que o OneHotEncoder trata como
+categoria desconhecida. Sai com código 1 se houver divergência.
+
+Uso:
+    python benchmarks/bench_esquema.py
+    python benchmarks/bench_esquema.py --linhas 1 100 --repeticoes 50
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.features.engenharia import ORDEM_COLUNAS, gerar_formularios, preparar_colunas_para_previsao, preparar_lote_para_previsao
+from src.utils.esquema_entrada import PipelineCompilado
+from src.utils.registro_modelos import caminhos_modelo_atual
+
+MODEL_PATH, _ = caminhos_modelo_atual()
+
+LINHAS_PADRAO = [1, 100, 10_000]
+
+
+def melhor_tempo(funcao, repeticoes):
+    """Menor tempo (s) entre `repeticoes` execuções e o resultado da última."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def com_ausentes(colunas_features):
+    """Cópia das features com None/NaN em algumas linhas, uma coluna categórica vazia e NaN na idade."""
+    ausentes = {coluna: np.array(valores, dtype=object if valores.dtype == object else np.float64)
+                for coluna, valores in colunas_features.items()}
+    ausentes["genero"][::7] = None
+    ausentes["transporte_habitual"][::5] = np.nan
+    ausentes["habito_fumar"][:] = None
+    ausentes["idade"][::11] = np.nan
+    return ausentes
+
+
+def mesma_saida(modelo_pipeline, compilado, colunas_features):
+    """Matriz pré-processada e probabilidades iguais (NaN na mesma posição conta como igual)."""
+    df_features = pd.DataFrame(colunas_features, columns=ORDEM_COLUNAS)
+    preprocessor = modelo_pipeline.named_steps["preprocessor"]
+    return (np.array_equal(preprocessor.transform(df_features), compilado.esquema.transformar(colunas_features),
+                           equal_nan=True)
+            and np.array_equal(modelo_pipeline.predict_proba(df_features), compilado.predict_proba(colunas_features)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Esquema de entrada compilado x ColumnTransformer.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=LINHAS_PADRAO)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        modelo_pipeline = joblib.load(args.modelo)
+    preprocessor = modelo_pipeline.named_steps["preprocessor"]
+    compilado = PipelineCompilado(modelo_pipeline)
+
+    print(f"{'linhas':>8} {'transform (ms)':>15} {'esquema (ms)':>13} {'ganho':>7} "
+          f"{'pipeline (ms)':>14} {'compilado (ms)':>15} {'ganho':>7}  {'iguais':<10} {'com ausentes'}")
+    tudo_igual = True
+    for n_linhas in args.linhas:
+        formularios = gerar_formularios(n_linhas)
+        df_features = preparar_lote_para_previsao(formularios)
+        colunas_features = preparar_colunas_para_previsao(formularios)
+
+        t_transform, X_pipeline = melhor_tempo(lambda: preprocessor.transform(df_features), args.repeticoes)
+        t_esquema, X_esquema = melhor_tempo(lambda: compilado.esquema.transformar(colunas_features), args.repeticoes)
+
+        t_pipeline, p_pipeline = melhor_tempo(
+            lambda: modelo_pipeline.predict_proba(preparar_lote_para_previsao(formularios)), args.repeticoes)
+        t_compilado, p_compilado = melhor_tempo(
+            lambda: compilado.predict_proba(preparar_colunas_para_previsao(formularios)), args.repeticoes)
+
+        iguais = np.array_equal(X_pipeline, X_esquema) and np.array_equal(p_pipeline, p_compilado)
+        iguais_ausentes = mesma_saida(modelo_pipeline, compilado, com_ausentes(colunas_features))
+        tudo_igual &= iguais and iguais_ausentes
+        print(f"{n_linhas:>8,} {t_transform * 1000:>15.2f} {t_esquema * 1000:>13.2f} "
+              f"{t_transform / max(t_esquema, 1e-9):>6.1f}x {t_pipeline * 1000:>14.2f} "
+              f"{t_compilado * 1000:>15.2f} {t_pipeline / max(t_compilado, 1e-9):>6.1f}x  "
+              f"{'OK' if iguais else 'DIVERGENTE':<10} {'OK' if iguais_ausentes else 'DIVERGENTE'}")
+
+    if not tudo_igual:
+        print("\n[ERRO] O esquema compilado divergiu do pipeline original.")
+        sys.exit(1)
+    print("\n[OK] Mesma matriz pré-processada e mesmas probabilidades nos dois caminhos (com e sem ausentes).")
+
+
+if __name__ == "__main__":
+    main()
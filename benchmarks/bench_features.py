@@ -0,0 +1,144 @@
+# benchmarks/bench_features.py
+"""
+Benchmark da engenharia de features: implementação vetorizada
+(src/features/engenharia.py) x caminho linha a linha.
+
+- Formulário -> modelo: preparar_lote_para_previsao (N linhas de uma vez)
+  x preparar_dados_para_previsao chamada uma vez por paciente.
+- Silver -> Gold: construir_features_gold x o cálculo linha a linha com
+  dicionários e if/elif (como era feito antes de existir o módulo).
+
+Além do tempo, confere que os dois caminhos produzem exatamente as mesmas
+features. Sai com código 1 se houver divergência (teste de regressão de
+training/serving skew).
+
+Uso:
+    python benchmarks/bench_features.py
+    python benchmarks/bench_features.py --linhas 100 10000 --repeticoes 3
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.features.engenharia import (
+    MAP_RISCO_NUMERICO, gerar_formularios,
+    preparar_dados_para_previsao, preparar_lote_para_previsao, construir_features_gold,
+)
+from src.utils.dados_gold import GOLD_CSV_PATH
+
+LINHAS_PADRAO = [1, 100, 10_000]
+#O caminho linha a linha é lento: acima disso ele é medido em uma amostra e extrapolado
+LIMITE_POR_LINHA = 2_000
+
+
+def gerar_silver(n_linhas):
+    """Colunas da Silver (as 17 primeiras da Gold) repetidas até `n_linhas`."""
+    silver = pd.read_csv(GOLD_CSV_PATH).iloc[:, :17]
+    repeticoes = -(-n_linhas // len(silver))
+    return pd.concat([silver] * repeticoes, ignore_index=True).iloc[:n_linhas]
+
+
+def formulario_por_linha(df_formularios):
+    return pd.concat([preparar_dados_para_previsao(linha) for linha in df_formularios.to_dict("records")],
+                     ignore_index=True)
+
+
+def _classe_oms(imc):
+    if imc < 18.5:
+        return "Peso Insuficiente"
+    elif imc < 25:
+        return "Peso Normal"
+    elif imc < 30:
+        return "Sobrepeso"
+    elif imc < 35:
+        return "Obesidade Grau I"
+    elif imc < 40:
+        return "Obesidade Grau II"
+    return "Obesidade Grau III"
+
+
+def gold_por_linha(df_silver):
+    """Silver -> Gold uma linha por vez (dicionários e if/elif)."""
+    linhas = df_silver.to_dict("records")
+    for linha in linhas:
+        linha["IMC"] = linha["peso_kg"] / (linha["altura_m"] ** 2)
+        linha["indice_estilo_vida"] = (linha["consumo_frequente_vegetais"] + linha["consumo_diario_agua"]
+                                       + linha["frequencia_semanal_atividade_fisica"] - linha["tempo_uso_dispositivo"])
+        linha["risco_alimentos_caloricos_num"] = MAP_RISCO_NUMERICO[linha["consumo_frequente_alimentos_caloricos"]]
+        linha["risco_lanches_num"] = MAP_RISCO_NUMERICO[linha["consumo_lanches_entre_refeicoes"]]
+        linha["risco_alcool_num"] = MAP_RISCO_NUMERICO[linha["consumo_bebida_alcoolica"]]
+        linha["indice_risco_alimentar"] = (linha["risco_alimentos_caloricos_num"] + linha["risco_lanches_num"]
+                                           + linha["risco_alcool_num"])
+    media = sum(linha["indice_estilo_vida"] for linha in linhas) / len(linhas)
+    for linha in linhas:
+        linha["comportamento_saudavel"] = int(linha["indice_estilo_vida"] > media)
+        linha["classe_peso_oms"] = _classe_oms(linha["IMC"])
+    return pd.DataFrame(linhas)
+
+
+def medir(funcao, entrada, repeticoes):
+    """Menor tempo (s) entre as repetições e o resultado da última."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(entrada)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def comparar(nome, n_linhas, por_linha, vetorizado, entrada, repeticoes):
+    """Mede os dois caminhos e confere se o resultado é o mesmo. Retorna False se divergir."""
+    n_amostra = min(n_linhas, LIMITE_POR_LINHA)
+    tempo_linha, resultado_linha = medir(por_linha, entrada.iloc[:n_amostra], 1)
+    tempo_linha *= n_linhas / n_amostra
+    tempo_vetor, resultado_vetor = medir(vetorizado, entrada, repeticoes)
+
+    #Quando o caminho linha a linha foi extrapolado, compara na mesma amostra
+    #(comportamento_saudavel depende da média de todas as linhas)
+    if n_amostra < n_linhas:
+        resultado_vetor = vetorizado(entrada.iloc[:n_amostra])
+    amostra_vetor = resultado_vetor.reset_index(drop=True)
+    try:
+        pd.testing.assert_frame_equal(resultado_linha, amostra_vetor, check_dtype=False)
+        iguais = True
+    except AssertionError:
+        iguais = False
+
+    extrapolado = "*" if n_amostra < n_linhas else " "
+    print(f"{nome:<22} {n_linhas:>8,} {tempo_linha * 1000:>11.1f}{extrapolado} {tempo_vetor * 1000:>11.1f} "
+          f"{tempo_linha / max(tempo_vetor, 1e-9):>8.1f}x  {'OK' if iguais else 'DIVERGENTE'}")
+    return iguais
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Engenharia de features vetorizada x linha a linha.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=LINHAS_PADRAO)
+    parser.add_argument("--repeticoes", type=int, default=3, help="Repetições do caminho vetorizado (menor tempo).")
+    args = parser.parse_args()
+
+    print(f"{'caminho':<22} {'linhas':>8} {'linha a linha':>12} {'vetorizado':>11} {'ganho':>9}")
+    print(f"{'':<22} {'':>8} {'(ms)':>12} {'(ms)':>11}")
+    tudo_igual = True
+    for n_linhas in args.linhas:
+        tudo_igual &= comparar("formulario -> modelo", n_linhas, formulario_por_linha,
+                               preparar_lote_para_previsao, gerar_formularios(n_linhas), args.repeticoes)
+    for n_linhas in args.linhas:
+        tudo_igual &= comparar("silver -> gold", n_linhas, gold_por_linha,
+                               construir_features_gold, gerar_silver(n_linhas), args.repeticoes)
+    print(f"* extrapolado a partir de {LIMITE_POR_LINHA:,} linhas")
+
+    if not tudo_igual:
+        print("\n[ERRO] Os caminhos produziram features diferentes.")
+        sys.exit(1)
+    print("\n[OK] Mesmas features nos dois caminhos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_importacao.py
+"""
+Benchmark de tempo de importação (cold start) das páginas do app Streamlit.
+
+Roda `python -X importtime -c "import <módulo>"` em um processo novo para cada
+página, soma o tempo acumulado e lista as importações mais lentas. Também
+verifica que bibliotecas pesadas (scikit-learn, XGBoost, SHAP) não são
+carregadas só por importar as páginas: elas devem vir sob demanda.
+
+Sai com código 1 se algum limite for ultrapassado, para servir de teste de
+regressão.
+
+Uso:
+    python benchmarks/bench_importacao.py
+    python benchmarks/bench_importacao.py --limite-ms 2500 --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+APP_DIR = os.path.join(project_root, "src", "app")
+
+#Módulos importados pelo app (a partir de src/app, como no `streamlit run`)
+MODULOS = ["streamlit", "modulo.sistema_preditivo", "modulo.painel_analitico"]
+
+#Bibliotecas que NÃO podem ser importadas só por importar as páginas
+PROIBIDOS_NA_IMPORTACAO = ["sklearn", "xgboost", "shap"]
+
+LIMITE_PADRAO_MS = 3000.0
+
+
+def medir_importacao(modulo):
+    """
+    Importa o módulo em um processo novo com -X importtime.
+    Retorna (lista de (ms acumulado, profundidade, nome), módulos carregados).
+    """
+    codigo = (
+        f"import {modulo}, sys; "
+        "print('\\n'.join(sorted(sys.modules)))"
+    )
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": APP_DIR},
+    )
+    if processo.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {modulo}:\n{processo.stderr[-2000:]}")
+
+    importacoes = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, acumulado, nome = linha.split("|")
+        #Cada nível de importação aninhada acrescenta 2 espaços antes do nome
+        profundidade = (len(nome) - len(nome.lstrip()) - 1) // 2
+        importacoes.append((int(acumulado) / 1000, profundidade, nome.strip()))
+
+    modulos_carregados = set(processo.stdout.split())
+    return importacoes, modulos_carregados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de importação das páginas do app.")
+    parser.add_argument("--limite-ms", type=float, default=LIMITE_PADRAO_MS,
+                        help="Tempo máximo de importação por página (ms).")
+    parser.add_argument("--top", type=int, default=10, help="Quantas importações mais lentas listar.")
+    args = parser.parse_args(argv)
+
+    falhas = []
+    for modulo in MODULOS:
+        importacoes, modulos_carregados = medir_importacao(modulo)
+        #O acumulado do nível 0 já inclui as importações aninhadas
+        total_ms = sum(ms for ms, profundidade, _ in importacoes if profundidade == 0)
+        diretas = [(ms, nome) for ms, profundidade, nome in importacoes if profundidade == 1]
+
+        print(f"\n--- {modulo}: {total_ms:.0f} ms ---")
+        for ms, nome in sorted(diretas, reverse=True)[:args.top]:
+            print(f"{ms:10.1f} ms  {nome}")
+
+        proibidos = [p for p in PROIBIDOS_NA_IMPORTACAO if p in modulos_carregados]
+        if proibidos:
+            falhas.append(f"{modulo} importa {proibidos} na inicialização")
+        if total_ms > args.limite_ms:
+            falhas.append(f"{modulo} levou {total_ms:.0f} ms (limite: {args.limite_ms:.0f} ms)")
+
+    print()
+    if falhas:
+        for falha in falhas:
+            print(f"[REGRESSÃO] {falha}")
+        sys.exit(1)
+    print("[OK] Todas as páginas dentro do limite de importação.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_pontuacao.py
+"""
+Benchmark da pontuação em lote (src/utils/pontuacao.py) x caminho antigo do
+app: um predict por paciente, inverse_transform do LabelEncoder e o nível de
+risco decidido por if/elif sobre o nome da classe.
+
+Além do tempo, confere que a classe prevista e o nível de risco são os
+mesmos nos dois caminhos e que as probabilidades batem com o predict_proba
+do pipeline. Sai com código 1 se houver divergência.
+
+Uso:
+    python benchmarks/bench_pontuacao.py
+    python benchmarks/bench_pontuacao.py --linhas 1000 10000 --modelo models/xgboost_pipeline.joblib
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import joblib
+import numpy as np
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from benchmarks.bench_features import gerar_formularios
+from src.features.engenharia import preparar_lote_para_previsao
+from src.utils.pontuacao import Pontuador
+from src.utils.registro_modelos import caminhos_modelo_atual
+
+MODEL_PATH, LE_PATH = caminhos_modelo_atual()
+
+LINHAS_PADRAO = [1, 1_000, 10_000]
+#O caminho por linha é lento: acima disso ele é medido em uma amostra e extrapolado
+LIMITE_POR_LINHA = 500
+
+
+def nivel_if_elif(resultado):
+    """Nível de risco como o app decidia antes (comparação de strings)."""
+    if resultado in ['Obesidade Grau I', 'Obesidade Grau II', 'Obesidade Grau III']:
+        return "Alto"
+    elif resultado == 'Sobrepeso':
+        return "Moderado"
+    return "Baixo"
+
+
+def pontuar_por_linha(df_features, modelo_pipeline, label_encoder):
+    """Um predict por paciente, como o formulário do app fazia."""
+    classes, niveis = [], []
+    for i in range(len(df_features)):
+        previsao = modelo_pipeline.predict(df_features.iloc[i:i + 1])
+        classe = label_encoder.inverse_transform(previsao)[0]
+        classes.append(classe)
+        niveis.append(nivel_if_elif(classe))
+    return np.asarray(classes, dtype=object), np.asarray(niveis, dtype=object)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pontuação em lote x predict por linha.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=LINHAS_PADRAO)
+    parser.add_argument("--modelo", default=MODEL_PATH)
+    parser.add_argument("--label-encoder", default=LE_PATH)
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        modelo_pipeline = joblib.load(args.modelo)
+        label_encoder = joblib.load(args.label_encoder)
+    pontuador = Pontuador.do_pipeline(modelo_pipeline, label_encoder)
+
+    print(f"{'linhas':>8} {'por linha (ms)':>15} {'lote (ms)':>10} {'ganho':>8}")
+    tudo_igual = True
+    for n_linhas in args.linhas:
+        df_features = preparar_lote_para_previsao(gerar_formularios(n_linhas))
+        n_amostra = min(n_linhas, LIMITE_POR_LINHA)
+
+        inicio = time.perf_counter()
+        classes_linha, niveis_linha = pontuar_por_linha(df_features.iloc[:n_amostra], modelo_pipeline, label_encoder)
+        tempo_linha = (time.perf_counter() - inicio) * n_linhas / n_amostra
+
+        inicio = time.perf_counter()
+        pontuacao = pontuador.pontuar(df_features)
+        tempo_lote = time.perf_counter() - inicio
+
+        iguais = (
+            np.array_equal(pontuacao.classe_prevista[:n_amostra], classes_linha)
+            and np.array_equal(pontuacao.nivel_risco[:n_amostra], niveis_linha)
+            and np.allclose(pontuacao.probabilidades, modelo_pipeline.predict_proba(df_features))
+            and np.allclose(pontuacao.probabilidades_nivel.sum(axis=1), 1.0)
+        )
+        tudo_igual &= iguais
+        extrapolado = "*" if n_amostra < n_linhas else " "
+        print(f"{n_linhas:>8,} {tempo_linha * 1000:>14.1f}{extrapolado} {tempo_lote * 1000:>10.1f} "
+              f"{tempo_linha / max(tempo_lote, 1e-9):>7.1f}x  {'OK' if iguais else 'DIVERGENTE'}")
+    print(f"* extrapolado a partir de {LIMITE_POR_LINHA:,} linhas")
+
+    if not tudo_igual:
+        print("\n[ERRO] A pontuação em lote divergiu do caminho por linha.")
+        sys.exit(1)
+    print("\n[OK] Mesma classe, nível de risco e probabilidades nos dois caminhos.")
+
+
+if __name__ == "__main__":
+    main()
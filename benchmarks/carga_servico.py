@@ -0,0 +1,200 @@
+# benchmarks/carga_servico.py
+"""
+Teste de carga local do serviço HTTP de previsão (src/servico/servico_previsao.py).
+
+Abre `--conexoes` conexões HTTP/1.1 keep-alive (asyncio, só biblioteca
+padrão); cada uma envia pedidos em sequência durante `--duracao` segundos
+(POST /prever com um paciente aleatório, ou /prever/lote com `--lote`
+pacientes). Informa a vazão (pedidos/s e pacientes/s), os percentis de
+latência do lado do cliente e, ao final, as métricas do próprio serviço
+(tamanho médio dos microlotes).
+
+Sem `--url`, sobe o serviço em um processo separado (com as opções de
+microlote informadas) e o encerra no final. Para ver o ganho dos microlotes,
+compare com `--tamanho-max 1`.
+
+Uso:
+    python benchmarks/carga_servico.py
+    python benchmarks/carga_servico.py --conexoes 64 --duracao 15
+    python benchmarks/carga_servico.py --tamanho-max 1
+    python benchmarks/carga_servico.py --url http://127.0.0.1:8000 --lote 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from benchmarks.bench_features import gerar_formularios
+
+SERVICO_PATH = os.path.join(project_root, "src", "servico", "servico_previsao.py")
+#Corpos de pedido pré-gerados (o cliente não pode ser o gargalo)
+N_CORPOS = 1_000
+
+
+class ClienteHTTP:
+    """Conexão HTTP/1.1 keep-alive mínima (o serviço sempre responde com Content-Length)."""
+
+    def __init__(self, host, porta):
+        self.host, self.porta = host, porta
+        self.leitor = self.escritor = None
+
+    async def conectar(self):
+        self.leitor, self.escritor = await asyncio.open_connection(self.host, self.porta)
+
+    async def requisitar(self, metodo, caminho, corpo=b""):
+        cabecalho = (f"{metodo} {caminho} HTTP/1.1\r\nHost: {self.host}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(corpo)}\r\n\r\n")
+        self.escritor.write(cabecalho.encode() + corpo)
+        await self.escritor.drain()
+
+        linhas = (await self.leitor.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(linhas[0].split()[1])
+        tamanho = next(int(linha.split(":", 1)[1]) for linha in linhas if linha.lower().startswith("content-length:"))
+        return status, await self.leitor.readexactly(tamanho)
+
+    def fechar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+
+
+def gerar_corpos(lote, n_corpos=N_CORPOS):
+    """Pedidos JSON com pacientes aleatórios (1 por pedido ou `lote` por pedido)."""
+    pacientes = gerar_formularios(n_corpos * lote).to_dict("records")
+    pacientes = [{campo: (int(valor) if campo == "idade" else valor) for campo, valor in paciente.items()}
+                 for paciente in pacientes]
+    if lote == 1:
+        return [json.dumps(paciente).encode() for paciente in pacientes]
+    return [json.dumps({"pacientes": pacientes[i:i + lote]}).encode() for i in range(0, len(pacientes), lote)]
+
+
+async def conexao_de_carga(host, porta, caminho, corpos, fim, latencias, erros, deslocamento):
+    """Envia pedidos em sequência até `fim` (relógio monotônico), registrando a latência de cada um."""
+    cliente = ClienteHTTP(host, porta)
+    await cliente.conectar()
+    try:
+        i = deslocamento
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            status, _ = await cliente.requisitar("POST", caminho, corpos[i % len(corpos)])
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if status != 200:
+                erros[status] = erros.get(status, 0) + 1
+            i += 1
+    finally:
+        cliente.fechar()
+
+
+async def obter_json(host, porta, caminho):
+    cliente = ClienteHTTP(host, porta)
+    await cliente.conectar()
+    try:
+        _, corpo = await cliente.requisitar("GET", caminho)
+        return json.loads(corpo)
+    finally:
+        cliente.fechar()
+
+
+async def executar_carga(host, porta, conexoes, duracao, lote):
+    corpos = gerar_corpos(lote)
+    caminho = "/prever" if lote == 1 else "/prever/lote"
+    latencias, erros = [], {}
+
+    #Aquecimento (primeiras previsões e conexões)
+    await asyncio.gather(*(conexao_de_carga(host, porta, caminho, corpos, time.perf_counter() + 1, [], {}, c)
+                           for c in range(min(conexoes, 8))))
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(conexao_de_carga(host, porta, caminho, corpos, inicio + duracao, latencias, erros, c * 7)
+                           for c in range(conexoes)))
+    decorrido = time.perf_counter() - inicio
+    return latencias, erros, decorrido, await obter_json(host, porta, "/metricas")
+
+
+def porta_livre():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def iniciar_servico(porta, espera_ms, tamanho_max, trabalhadores, tempo_limite=120):
+    """Sobe o serviço em outro processo e espera o /saude responder."""
+    processo = subprocess.Popen(
+        [sys.executable, SERVICO_PATH, "--porta", str(porta), "--espera-ms", str(espera_ms),
+         "--tamanho-max", str(tamanho_max), "--trabalhadores", str(trabalhadores)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    limite = time.perf_counter() + tempo_limite
+    while time.perf_counter() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError("O serviço terminou durante a inicialização.")
+        try:
+            asyncio.run(obter_json("127.0.0.1", porta, "/saude"))
+            return processo
+        except OSError:
+            time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError(f"O serviço não respondeu em {tempo_limite} s.")
+
+
+def exibir_resultado(latencias, erros, decorrido, lote, metricas):
+    latencias = np.asarray(latencias)
+    pedidos = len(latencias)
+    p50, p95, p99 = np.percentile(latencias, [50, 95, 99]) if pedidos else (0, 0, 0)
+    print(f"Pedidos: {pedidos:,} em {decorrido:.1f} s -> {pedidos / decorrido:,.0f} pedidos/s "
+          f"({pedidos * lote / decorrido:,.0f} pacientes/s)")
+    print(f"Latência (ms): p50 {p50:.1f} | p95 {p95:.1f} | p99 {p99:.1f} | máx {latencias.max(initial=0):.1f}")
+    if erros:
+        print(f"Erros por status HTTP: {erros}")
+
+    lotes = metricas.get("linhas_por_lote", {})
+    pedidos_lote = metricas.get("pedidos_por_lote", {})
+    if lotes:
+        print(f"Microlotes (últimos {lotes['n']:,}): p50 de {lotes['p50']:.0f} linhas / "
+              f"{pedidos_lote.get('p50', 0):.0f} pedidos por chamada do modelo")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço HTTP de previsão.")
+    parser.add_argument("--url", default=None, help="Serviço já em execução (sem isso, sobe um localmente).")
+    parser.add_argument("--conexoes", type=int, default=32, help="Clientes simultâneos (conexões keep-alive).")
+    parser.add_argument("--duracao", type=float, default=10.0, help="Segundos de carga.")
+    parser.add_argument("--lote", type=int, default=1, help="Pacientes por pedido (1 = /prever).")
+    parser.add_argument("--espera-ms", type=float, default=2.0, help="Microlote do serviço local: espera.")
+    parser.add_argument("--tamanho-max", type=int, default=512, help="Microlote do serviço local: linhas (1 desliga).")
+    parser.add_argument("--trabalhadores", type=int, default=2, help="Threads de inferência do serviço local.")
+    args = parser.parse_args()
+
+    processo = None
+    if args.url:
+        partes = urlsplit(args.url)
+        host, porta = partes.hostname, partes.port or 80
+    else:
+        host, porta = "127.0.0.1", porta_livre()
+        print(f"--- Subindo o serviço local na porta {porta} "
+              f"(microlote: {args.tamanho_max} linhas, {args.espera_ms} ms) ---")
+        processo = iniciar_servico(porta, args.espera_ms, args.tamanho_max, args.trabalhadores)
+
+    try:
+        print(f"--- Carga: {args.conexoes} conexões, {args.duracao:.0f} s, {args.lote} paciente(s) por pedido ---")
+        latencias, erros, decorrido, metricas = asyncio.run(
+            executar_carga(host, porta, args.conexoes, args.duracao, args.lote))
+        exibir_resultado(latencias, erros, decorrido, args.lote, metricas)
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/memoria_servidor.py
+"""
+Memória do servidor multiprocesso (src/servico/servidor_multiprocesso.py):
+modelo compacto compartilhado (mmap, carregado pelo pai antes do fork) x um
+joblib.load do pipeline por trabalhador.
+
+Para cada modo, sobe o servidor com `--processos` trabalhadores, aplica
+carga por alguns segundos (para que todos os trabalhadores usem o modelo) e
+mostra RSS, PSS e memória compartilhada/privada de cada trabalhador. A soma
+do PSS é a memória realmente ocupada pelos trabalhadores.
+
+Uso (Linux):
+    python benchmarks/memoria_servidor.py
+    python benchmarks/memoria_servidor.py --processos 8 --modos compacto
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from benchmarks.carga_servico import executar_carga, obter_json, porta_livre
+from src.utils.memoria_processo import processos_filhos, relatorio_memoria_processos
+
+SERVIDOR_PATH = os.path.join(project_root, "src", "servico", "servidor_multiprocesso.py")
+
+
+def subir_servidor(modo, processos, porta, tempo_limite=180):
+    """Sobe o servidor e espera todos os trabalhadores responderem."""
+    processo = subprocess.Popen(
+        [sys.executable, SERVIDOR_PATH, "--modo", modo, "--processos", str(processos),
+         "--porta", str(porta), "--intervalo-relatorio", "0"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    limite = time.perf_counter() + tempo_limite
+    while time.perf_counter() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"O servidor ({modo}) terminou durante a inicialização.")
+        try:
+            asyncio.run(obter_json("127.0.0.1", porta, "/saude"))
+            if len(processos_filhos(processo.pid)) >= processos:
+                return processo
+        except OSError:
+            pass
+        time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError(f"O servidor ({modo}) não respondeu em {tempo_limite} s.")
+
+
+def medir_modo(modo, processos, duracao):
+    porta = porta_livre()
+    print(f"--- {modo}: {processos} trabalhadores ---")
+    processo = subir_servidor(modo, processos, porta)
+    try:
+        latencias, erros, decorrido, _ = asyncio.run(
+            executar_carga("127.0.0.1", porta, processos * 8, duracao, 1))
+        trabalhadores = processos_filhos(processo.pid)
+        relatorio = relatorio_memoria_processos(trabalhadores)
+        print(relatorio.to_string())
+        print(f"Carga: {len(latencias) / decorrido:,.0f} pedidos/s, {sum(erros.values())} erros\n")
+        return relatorio
+    finally:
+        processo.terminate()
+        processo.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória por trabalhador do servidor multiprocesso.")
+    parser.add_argument("--processos", type=int, default=4)
+    parser.add_argument("--duracao", type=float, default=3.0, help="Segundos de carga antes da medição.")
+    parser.add_argument("--modos", nargs="+", choices=["compacto", "pipeline"], default=["compacto", "pipeline"])
+    args = parser.parse_args()
+
+    totais = {modo: medir_modo(modo, args.processos, args.duracao).loc["TOTAL"] for modo in args.modos}
+    print(f"{'modo':<10} {'RSS total (MB)':>15} {'PSS total (MB)':>15} {'PSS/trabalhador':>16}")
+    for modo, total in totais.items():
+        print(f"{modo:<10} {total['rss_mb']:>15.1f} {total['pss_mb']:>15.1f} {total['pss_mb'] / args.processos:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
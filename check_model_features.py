@@ -1,13 +1,17 @@
 # check_model_features.py
 import joblib
 import os
+import sys
 
 print("--- Verificador de Features do Modelo ---")
 
 try:
-    # 1. Monta o caminho para o modelo
+    # 1. Monta o caminho para o modelo (versão em produção no registro de modelos)
     project_root = os.path.abspath(os.path.dirname(__file__))
-    model_path = os.path.join(project_root, "models", "random_forest_pipeline.joblib")
+    if project_root not in sys.path:
+        sys.path.append(project_root)
+    from src.utils.registro_modelos import caminhos_modelo_atual
+    model_path, _ = caminhos_modelo_atual()
     
     # 2. Carrega o pipeline treinado
     modelo_carregado = joblib.load(model_path)
@@ -17,21 +21,25 @@ try:
     # (Isso só funciona se você nomeou o passo de 'preprocessor' no seu train_model.py)
     preprocessor = modelo_carregado.named_steps['preprocessor']
     
-    # 4. Pergunta ao pré-processador: "Quais features você foi treinado para esperar?"
-    features_esperadas = preprocessor.feature_names_in_
+    # 4. Compila o contrato de entrada: ordem, tipo, categorias do OneHotEncoder e parâmetros do scaler
+    from src.utils.esquema_entrada import EsquemaEntrada
+    esquema = EsquemaEntrada.do_preprocessador(preprocessor)
     
-    print(f"\n[SUCESSO] O modelo foi treinado e espera EXATAMENTE estas {len(features_esperadas)} colunas:")
+    print(f"\n[SUCESSO] O modelo foi treinado e espera EXATAMENTE estas {len(esquema.colunas)} colunas:")
     print("--------------------------------------------------")
     
-    # Imprime a lista
-    for i, feature in enumerate(features_esperadas):
-        print(f"{i+1:02d}: {feature}")
+    # Imprime o esquema (uma linha por coluna, na ordem do pipeline)
+    print(esquema.descrever().to_string())
         
     print("--------------------------------------------------")
-    print("O app Streamlit DEVE enviar um DataFrame com estas colunas.")
+
+    # 5. Confere a engenharia de features do app contra o esquema (todas as opções do formulário)
+    from src.features.engenharia import gerar_formularios, preparar_colunas_para_previsao
+    esquema.validar(preparar_colunas_para_previsao(gerar_formularios(1_000)))
+    print("[SUCESSO] A engenharia de features do app (src/features/engenharia.py) respeita este esquema.")
 
 except Exception as e:
     print(f"\n[ERRO] Não foi possível carregar ou inspecionar o modelo:")
     print(e)
-    print("\nVerifique se o nome 'random_forest_pipeline.joblib' está correto e se o")
+    print("\nVerifique se há um modelo registrado (python src/utils/registro_modelos.py listar) e se o")
     print("primeiro passo do seu pipeline se chama 'preprocessor'.")
\ No newline at end of file
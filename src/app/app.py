@@ -1,5 +1,6 @@
 import streamlit as st
-from modulo import sistema_preditivo, painel_analitico
+#As páginas são importadas só quando selecionadas (ver ROTEAMENTO): cada uma
+#carrega suas dependências pesadas (modelo, plotly, base Gold) sob demanda.
 # --- Configuração da Página ---
 st.set_page_config(
     page_title="Predição de Obesidade",
@@ -19,7 +20,9 @@ selecao = st.sidebar.radio(
 
 # --- ROTEAMENTO (Decidindo qual página mostrar) ---
 if selecao == "Sistema Preditivo":
+    from modulo import sistema_preditivo #1. Importa a página sob demanda
     sistema_preditivo.run() #2. Chame a função run() do sistema
 
 elif selecao == "Painel Analítico":
+    from modulo import painel_analitico #1. Importa a página sob demanda
     painel_analitico.run()  #2. Chame a função run() do painel_analitico
\ No newline at end of file
@@ -1,24 +1,83 @@
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
 import os
+import sys
+import time
+import importlib.util
 
 #Caminho da base do projeto (3 níveis acima deste arquivo)
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.utils.dados_gold import carregar_gold, caminho_gold
+from src.utils.cache_previsao import versao_artefato
+from src.utils.memoria_dataframe import compactar_dataframe, relatorio_memoria, gravar_arrow, abrir_arrow_mmap
+from src.utils.cubo_analitico import construir_cubo
+from src.utils.latencia import MonitorLatencia
+
 REPORTS_DIR = os.path.join(project_root, "reports", "figures")
 
+#Cópia compactada da base em Arrow (mmap), compartilhada pelos processos do app
+PAINEL_ARROW_MMAP = os.getenv("PAINEL_ARROW_MMAP", "1") == "1"
+ARROW_DIR = os.path.join(project_root, ".cache", "painel")
+
+#Gráficos como imagem estática (svg/png, leve para conexões lentas) em vez de
+#Plotly interativo. Requer o pacote 'kaleido'; sem ele o painel volta ao interativo.
+PAINEL_GRAFICOS_ESTATICOS = os.getenv("PAINEL_GRAFICOS_ESTATICOS", "0") == "1"
+FORMATO_ESTATICO = os.getenv("PAINEL_FORMATO_ESTATICO", "svg")
+FIGURAS_DIR = os.path.join(ARROW_DIR, "figuras")
+TEMA_GRAFICOS = "plotly_dark"
+LARGURA_ESTATICA, ALTURA_ESTATICA = 1000, 500
+
 # Imagens de Validação
 CM_PATH = os.path.join(REPORTS_DIR, "matriz_confusao_final.png")
 SHAP_PATH = os.path.join(REPORTS_DIR, "shap_summary_bar.png")
 
-#Caminho do arquivo CSV da camada Gold
-csv_path = os.path.join(project_root, "data", "processed", "obesity_gold.csv")
+CORES_GENERO = {'Female': '#FF69B4', 'Male': '#1E90FF'}
+CATEGORIAS_OMS = [
+    'Peso Insuficiente', 'Peso Normal', 'Sobrepeso',
+    'Obesidade Grau I', 'Obesidade Grau II', 'Obesidade Grau III'
+]
+
+
+def obter_versao_dados():
+    """Hash do arquivo da base Gold (None se ele não existir)."""
+    try:
+        return versao_artefato(caminho_gold())
+    except FileNotFoundError:
+        return None
 
 
-@st.cache_data
-def carregar_dados():
+def _compartilhar_via_arrow(df_compacto, versao_dados):
+    """Grava (uma vez por versão dos dados) e abre a cópia Arrow memory-mapped."""
+    caminho = os.path.join(ARROW_DIR, f"obesity_gold_{versao_dados[:16]}.arrow")
+    if not os.path.exists(caminho):
+        gravar_arrow(df_compacto, caminho)
+    return abrir_arrow_mmap(caminho)
+
+
+#A base Gold é lida por src/utils/dados_gold.py (Parquet tipado, ou o CSV).
+#cache_resource devolve o mesmo objeto a todas as sessões (cache_data faria
+#uma cópia por chamada); o DataFrame é tratado como somente leitura.
+@st.cache_resource(max_entries=1)
+def carregar_dados(versao_dados=None):
     try:
-        df_gold = pd.read_csv(csv_path)
+        df_original = carregar_gold()
+        #Tipos mínimos (category/int8/float32) + relatório de memória por coluna
+        df_gold = compactar_dataframe(df_original)
+        relatorio = relatorio_memoria(df_original, df_gold)
+        if PAINEL_ARROW_MMAP and versao_dados:
+            try:
+                df_gold = _compartilhar_via_arrow(df_gold, versao_dados)
+            except OSError as e:
+                st.warning(f"⚠️ Não foi possível usar a cópia compartilhada (Arrow): {e}")
+        df_gold.attrs["relatorio_memoria"] = relatorio
+
         #Garante que a tabela contém as colunas essenciais
         colunas_esperadas = ['IMC', 'classe_peso_oms']
         for col in colunas_esperadas:
@@ -26,17 +85,290 @@ def carregar_dados():
                 st.warning(f"⚠️ Coluna ausente na base: {col}")
         return df_gold
     except FileNotFoundError:
-        st.error("❌ Arquivo 'obesity_gold.csv' não encontrado em data/processed/.")
+        st.error("❌ Base Gold ('obesity_gold.parquet' ou 'obesity_gold.csv') não encontrada em data/processed/.")
         return pd.DataFrame()
     except Exception as e:
         st.error(f"⚠️ Erro ao carregar dados: {e}")
         return pd.DataFrame()
 
-#Carrega globalmente
-df_gold = carregar_dados()
+
+#Agregados dos gráficos (contagens, quantis, boxplots), calculados uma vez por
+#versão dos dados: a página não percorre mais as linhas da base a cada rerun
+@st.cache_resource(max_entries=1)
+def carregar_cubo(versao_dados=None):
+    df_gold = carregar_dados(versao_dados)
+    if df_gold.empty:
+        return None
+    return construir_cubo(df_gold)
+
+
+def grafico_barras(contagem, x, cor=None, **kwargs):
+    """Barras a partir de uma tabela de contagens (substitui o px.histogram sobre as linhas)."""
+    return px.bar(contagem, x=x, y='contagem', color=cor or x, text_auto=True, **kwargs)
+
+
+def grafico_boxplot(resumo, x, titulo, ordem, cor=None, cores=None):
+    """
+    Boxplot desenhado a partir dos cinco números já calculados (q1, mediana,
+    q3 e bigodes): nenhuma linha da base é enviada ao navegador.
+    """
+    fig = go.Figure()
+    grupos = resumo.groupby(cor or x, observed=True, sort=False)
+    for nome, grupo in grupos:
+        #Mesma ordem de categorias para todos os traços
+        grupo = grupo.set_index(x).reindex([c for c in ordem if c in set(grupo[x])]).reset_index()
+        fig.add_trace(go.Box(
+            name=str(nome),
+            x=grupo[x],
+            q1=grupo['q1'], median=grupo['mediana'], q3=grupo['q3'],
+            lowerfence=grupo['limite_inferior'], upperfence=grupo['limite_superior'],
+            marker_color=(cores or {}).get(nome),
+            offsetgroup=str(nome) if cor else None,
+        ))
+    fig.update_layout(title=titulo, boxmode='group' if cor else 'overlay', legend_title_text=cor or x)
+    fig.update_xaxes(categoryorder='array', categoryarray=ordem)
+    return fig
+
+
+def figura_contagem_classe(cubo, tema):
+    #1. Criar o gráfico (a partir das contagens do cubo)
+    fig_peso = grafico_barras(
+    cubo['contagem_classe'],
+    x='classe_peso_corporal',
+    title='Contagem por Classe de Peso Corporal',
+    category_orders={'classe_peso_corporal': cubo['ordem']['classe_peso_corporal']}
+    )
+
+    #2. Ajustar layout
+    fig_peso.update_layout(
+    template=tema,
+    yaxis_title='Contagem',
+    xaxis_title='Classe de Peso' #Ajusta o nome do eixo X
+    )
+    return fig_peso
+
+
+def figura_contagem_classe_genero(cubo, tema):
+    #1. Criar o Gráfico Agrupado
+    fig_obesidade_genero = grafico_barras(
+        cubo['contagem_classe_genero'],
+        x='classe_peso_corporal',
+        cor='genero',        #Cria as barras agrupadas por gênero
+        barmode='group',     #'group' coloca as barras lado a lado
+        title='Contagem de Gênero por Classe de Peso',
+        color_discrete_map=CORES_GENERO,
+        category_orders={'classe_peso_corporal': cubo['ordem']['classe_peso_corporal']}
+    )
+
+    #2. Ajustar layout
+    fig_obesidade_genero.update_layout(
+        template=tema,
+        yaxis_title='Contagem',
+        xaxis_title='Classe de Peso'
+    )
+    return fig_obesidade_genero
+
+
+def figura_imc_classe_genero(cubo, tema):
+    #1. Criar o Boxplot (quartis e bigodes pré-calculados)
+    fig_val = grafico_boxplot(
+        cubo['imc_classe_genero'],
+        x='classe_peso_corporal',
+        cor='genero',
+        titulo='Distribuição do IMC por Classe de Peso e Gênero',
+        ordem=cubo['ordem']['classe_peso_corporal'],
+        cores=CORES_GENERO
+    )
+
+    #2. Ajustar layout
+    fig_val.update_layout(
+        template=tema,
+        yaxis_title='IMC',
+        xaxis_title='Classe de Peso'
+    )
+    return fig_val
+
+
+def figura_contagem_oms(cubo, tema):
+    #1. Criar o gráfico
+    fig_peso_oms = grafico_barras(
+        cubo['contagem_oms'],
+        x='classe_peso_oms', 
+        title='Contagem por Classe de Peso (Padrão OMS)',
+        category_orders={'classe_peso_oms': cubo['ordem']['classe_peso_oms']}
+    )
+
+    #2. Ordenar as barras
+    fig_peso_oms.update_xaxes(categoryorder='array', categoryarray=CATEGORIAS_OMS)
+
+    #3. Ajustar layout
+    fig_peso_oms.update_layout(
+        template=tema,
+        yaxis_title='Contagem',
+        xaxis_title='Classe de Peso (OMS)',
+        showlegend=False
+    )
+    return fig_peso_oms
+
+
+def figura_faixas_imc_oms(cubo, tema):
+    #Histograma do IMC por classe OMS (faixas de 1 ponto de IMC, do cubo)
+    fig_faixas_imc = px.bar(
+        cubo['faixas_imc_oms'].sort_values('inicio'),
+        x='inicio',
+        y='contagem',
+        color='classe_peso_oms',
+        title='Distribuição do IMC por Classe de Peso (Padrão OMS)',
+        category_orders={'classe_peso_oms': CATEGORIAS_OMS}
+    )
+    fig_faixas_imc.update_layout(
+        template=tema,
+        bargap=0,
+        yaxis_title='Contagem',
+        xaxis_title='IMC'
+    )
+    return fig_faixas_imc
+
+
+def figura_contagem_oms_genero(cubo, tema):
+    #1. Criar um Gráfico Agrupado
+    fig_genero_oms = grafico_barras(
+        cubo['contagem_oms_genero'],
+        x='classe_peso_oms', 
+        cor='genero',        
+        barmode='group',     
+        title='Contagem de Gênero por Classe de Peso (Padrão OMS)',
+        color_discrete_map=CORES_GENERO
+    )
+
+    #2. Ordenar as barras
+    fig_genero_oms.update_xaxes(categoryorder='array', categoryarray=CATEGORIAS_OMS)
+
+    #3. Ajustar layout
+    fig_genero_oms.update_layout(
+        template=tema,
+        yaxis_title='Contagem',
+        xaxis_title='Classe de Peso (OMS)'
+    )
+    return fig_genero_oms
+
+
+def figura_estilo_vida_oms(cubo, tema):
+    #Criar o Gráfico de Boxplot (cinco números pré-calculados no cubo)
+    fig_estilo_vida = grafico_boxplot(
+        cubo['estilo_vida_oms'],
+        x='classe_peso_oms',
+        titulo='Distribuição do Índice de Estilo de Vida por Classe de Peso (OMS)',
+        ordem=CATEGORIAS_OMS
+    )
+
+    fig_estilo_vida.update_layout(
+        template=tema,
+        yaxis_title='Pontuação do Estilo de Vida (Quanto maior, melhor)', 
+        xaxis_title='Classe de Peso (OMS)'
+    )
+    return fig_estilo_vida
+
+
+def figura_risco_alimentar_oms(cubo, tema):
+    fig_risco_alim = grafico_boxplot(
+        cubo['risco_alimentar_oms'],
+        x='classe_peso_oms',
+        titulo='Distribuição do Risco Alimentar por Classe de Peso (OMS)',
+        ordem=CATEGORIAS_OMS
+    )
+
+    fig_risco_alim.update_layout(
+        template=tema,
+        yaxis_title='Pontuação de Risco Alimentar (Quanto maior, pior)', 
+        xaxis_title='Classe de Peso (OMS)'
+    )
+    return fig_risco_alim
+
+
+#Gráficos do painel por nome (chave do cache de figuras)
+FIGURAS = {
+    'contagem_classe': figura_contagem_classe,
+    'contagem_classe_genero': figura_contagem_classe_genero,
+    'imc_classe_genero': figura_imc_classe_genero,
+    'contagem_oms': figura_contagem_oms,
+    'faixas_imc_oms': figura_faixas_imc_oms,
+    'contagem_oms_genero': figura_contagem_oms_genero,
+    'estilo_vida_oms': figura_estilo_vida_oms,
+    'risco_alimentar_oms': figura_risco_alimentar_oms,
+}
+
+
+#Figuras prontas, uma por (gráfico, versão dos dados, tema): um rerun só
+#serializa a figura já montada. As figuras são compartilhadas (somente leitura).
+@st.cache_resource(max_entries=4 * len(FIGURAS))
+def obter_figura(nome, versao_dados, tema=TEMA_GRAFICOS):
+    return FIGURAS[nome](carregar_cubo(versao_dados), tema)
+
+
+@st.cache_resource(max_entries=4 * len(FIGURAS))
+def obter_imagem_estatica(nome, versao_dados, formato=FORMATO_ESTATICO, tema=TEMA_GRAFICOS):
+    """
+    Imagem (svg/png) do gráfico, gravada em .cache/painel/figuras e reaproveitada
+    entre reinícios do app. Levanta a exceção da exportação se ela falhar (ex: sem
+    kaleido), assim só as imagens geradas com sucesso ficam em cache.
+    """
+    caminho = os.path.join(FIGURAS_DIR, f"{nome}_{tema}_{(versao_dados or 'sem_versao')[:16]}.{formato}")
+    if not os.path.exists(caminho):
+        imagem = obter_figura(nome, versao_dados, tema).to_image(
+            format=formato, width=LARGURA_ESTATICA, height=ALTURA_ESTATICA)
+        os.makedirs(FIGURAS_DIR, exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(imagem)
+        os.replace(temporario, caminho)
+    with open(caminho, "rb") as arquivo:
+        imagem = arquivo.read()
+    #st.image recebe o SVG como texto
+    return imagem.decode("utf-8") if formato == "svg" else imagem
+
+
+#Tempo de cada gráfico (montagem/cache + envio), compartilhado entre sessões
+@st.cache_resource
+def obter_monitor_graficos():
+    return MonitorLatencia()
+
+
+def modo_estatico():
+    """True se os gráficos estáticos foram pedidos e o kaleido está instalado."""
+    return PAINEL_GRAFICOS_ESTATICOS and importlib.util.find_spec("kaleido") is not None
+
+
+def exibir_grafico(nome, versao_dados, monitor):
+    """Exibe o gráfico do cache (interativo ou estático), medindo o tempo gasto."""
+    with monitor.medir(nome):
+        imagem = None
+        if modo_estatico():
+            try:
+                imagem = obter_imagem_estatica(nome, versao_dados)
+            except (ImportError, ValueError, RuntimeError) as e:
+                #Falha não fica em cache: tenta exportar de novo no próximo rerun
+                st.warning(f"⚠️ Exportação estática indisponível ({e}); exibindo o gráfico interativo.")
+        if imagem is not None:
+            st.image(imagem, use_container_width=True)
+        else:
+            st.plotly_chart(obter_figura(nome, versao_dados), use_container_width=True)
+
 
 def run():  
 
+    #Carrega a base e o cubo de agregados na primeira abertura (depois vêm do cache)
+    inicio_pagina = time.perf_counter()
+    monitor = obter_monitor_graficos()
+    versao_dados = obter_versao_dados()
+    df_gold = carregar_dados(versao_dados)
+    cubo = carregar_cubo(versao_dados)
+    if cubo is None:
+        return
+    metricas = cubo["metricas"]
+    if PAINEL_GRAFICOS_ESTATICOS and not modo_estatico():
+        st.caption("⚠️ Gráficos estáticos pedidos, mas o pacote 'kaleido' não está instalado: exibindo os gráficos interativos.")
+
     st.title("Visão Analítica - Nível Obesidade")
 
     st.markdown(
@@ -95,25 +427,25 @@ def run():
     with col1:
      st.metric(
      label="Total de indivíduos", 
-     value=f"{len(df_gold):,}".replace(",", ".")
+     value=f"{metricas['total']:,}".replace(",", ".")
     )
 
     with col2:
      st.metric(
      label="Idade média", 
-     value=f"{df_gold['idade'].mean():.1f} anos"
+     value=f"{metricas['idade_media']:.1f} anos"
     )
 
     with col3:
      st.metric(
      label="IMC médio", 
-     value=f"{df_gold['IMC'].mean():.1f}"
+     value=f"{metricas['imc_medio']:.1f}"
     )
 
     with col4:
      st.metric(
      label="Taxa de hábitos saudáveis", 
-     value=f"{df_gold['comportamento_saudavel'].mean()*100:.1f}%"
+     value=f"{metricas['taxa_saudavel']*100:.1f}%"
     )
     st.info(
     "**Interpretação:** A base apresenta indivíduos predominantemente jovens (média de 24.3 anos), "
@@ -133,8 +465,8 @@ def run():
     )
 
     # 1. Calcular os valores
-    contagem_genero = df_gold['genero'].value_counts()
-    total_individuos = len(df_gold)
+    contagem_genero = metricas['contagem_genero']
+    total_individuos = metricas['total']
     cont_female = contagem_genero.get('Female', 0)
     cont_male = contagem_genero.get('Male', 0)
     pct_female = (cont_female / total_individuos) * 100
@@ -172,24 +504,7 @@ def run():
     st.header("Distribuição dos Níveis de Peso Corporal")
     st.markdown("A análise da variável `classe_peso_corporal` revela a proporção de indivíduos em cada categoria de peso.")
 
-    #1. Criar o gráfico
-    fig_peso = px.histogram(
-    df_gold, 
-    x='classe_peso_corporal',
-    title='Contagem por Classe de Peso Corporal',
-    color='classe_peso_corporal', #Uma cor para cada barra
-    text_auto=True #Adiciona os rótulos
-    )
-
-    #2. Ajustar layout
-    fig_peso.update_layout(
-    template='plotly_dark',
-    yaxis_title='Contagem',
-    xaxis_title='Classe de Peso' #Ajusta o nome do eixo X
-    )
-
-    #3. Exibir o gráfico
-    st.plotly_chart(fig_peso, use_container_width=True)
+    exibir_grafico('contagem_classe', versao_dados, monitor)
 
     #4. Adicionar o Insight
     st.info(
@@ -215,29 +530,7 @@ def run():
     st.header("Nível de Obesidade por Gênero")
     st.markdown("Comparação da distribuição dos níveis de obesidade entre homens e mulheres.")
 
-    #1. Criar o Gráfico Agrupado
-    fig_obesidade_genero = px.histogram(
-        df_gold,
-        x='classe_peso_corporal',
-        color='genero',        #Cria as barras agrupadas por gênero
-        barmode='group',     #'group' coloca as barras lado a lado
-        text_auto=True,      #Adiciona os rótulos
-        title='Contagem de Gênero por Classe de Peso',
-        color_discrete_map={ 
-            'Female': '#FF69B4', 
-            'Male': '#1E90FF'
-        }
-    )
-
-    #2. Ajustar layout
-    fig_obesidade_genero.update_layout(
-        template='plotly_dark',
-        yaxis_title='Contagem',
-        xaxis_title='Classe de Peso'
-    )
-
-    #3. Exibir o gráfico
-    st.plotly_chart(fig_obesidade_genero, use_container_width=True) 
+    exibir_grafico('contagem_classe_genero', versao_dados, monitor)
 
     #4. Adicionar o Insight
     st.info(
@@ -260,28 +553,7 @@ def run():
         "definir cada classe."
     )
 
-    #1. Criar o Boxplot
-    fig_val = px.box(
-        df_gold,
-        x='classe_peso_corporal',
-        y='IMC',
-        color='genero',  
-        title='Distribuição do IMC por Classe de Peso e Gênero',
-        color_discrete_map={
-            'Female': '#FF69B4', 
-            'Male': '#1E90FF'
-        }
-    )
-
-    #2. Ajustar layout
-    fig_val.update_layout(
-        template='plotly_dark',
-        yaxis_title='IMC',
-        xaxis_title='Classe de Peso'
-    )
-
-    #3. Exibir o gráfico
-    st.plotly_chart(fig_val, use_container_width=True)
+    exibir_grafico('imc_classe_genero', versao_dados, monitor)
 
     #4. Adicionar o Insight
     st.warning(
@@ -302,12 +574,12 @@ def run():
         "não se sobrepõem entre os gêneros."
     )
 
-    #1. Agrupar os dados com Pandas
-    tabela_prova = df_gold.groupby(['classe_peso_corporal', 'genero'])['IMC'].agg(['count', 'min', 'mean', 'max']
-        ).reset_index()
+    #1. Mesmo agrupamento do boxplot, já calculado no cubo
+    tabela_prova = cubo['imc_classe_genero'][['classe_peso_corporal', 'genero', 'count', 'min', 'mean', 'max']]
+    tabela_prova = tabela_prova.sort_values(['classe_peso_corporal', 'genero'], ignore_index=True)
 
     #2. Arredondar os valores para melhor leitura
-    tabela_prova = tabela_prova.round(1)
+    tabela_prova = tabela_prova.astype({'count': 'int64'}).round(1)
 
     #3. Exibir a tabela no Streamlit
     st.dataframe(tabela_prova)     
@@ -330,36 +602,7 @@ def run():
                 "Verificamos como ela é mais orgânica, com a maioria dos indivíduos "
                 "na categoria 'Sobrepeso', ao contrário da distribuição artificial original.")
 
-    #1. Criar o gráfico
-    fig_peso_oms = px.histogram(
-        df_gold, 
-        x='classe_peso_oms', 
-        title='Contagem por Classe de Peso (Padrão OMS)',
-        color='classe_peso_oms',
-        text_auto=True
-    )
-
-    #2. Ordenar as barras
-    categorias_oms = [
-        'Peso Insuficiente', 
-        'Peso Normal', 
-        'Sobrepeso', 
-        'Obesidade Grau I', 
-        'Obesidade Grau II', 
-        'Obesidade Grau III'
-    ]
-    fig_peso_oms.update_xaxes(categoryorder='array', categoryarray=categorias_oms)
-
-    #3. Ajustar layout
-    fig_peso_oms.update_layout(
-        template='plotly_dark',
-        yaxis_title='Contagem',
-        xaxis_title='Classe de Peso (OMS)',
-        showlegend=False
-    )
-
-    #4. Exibir
-    st.plotly_chart(fig_peso_oms, use_container_width=True)
+    exibir_grafico('contagem_oms', versao_dados, monitor)
 
     st.info(
         "**Interpretação:** A nova distribuição revela a verdadeira natureza do dataset: "
@@ -368,6 +611,9 @@ def run():
         "curva muito mais natural e confiável para a modelagem."
     )
 
+    exibir_grafico('faixas_imc_oms', versao_dados, monitor)
+    st.caption("Cada classe OMS ocupa um intervalo contínuo de IMC, sem sobreposição entre as classes.")
+
     st.markdown("---")
 
     #Gráfico 2: A Confirmação Final     
@@ -377,32 +623,7 @@ def run():
         "podemos confirmar se o viés desapareceu. "
     )
 
-    #1. Criar um Gráfico Agrupado
-    fig_genero_oms = px.histogram(
-        df_gold,
-        x='classe_peso_oms', 
-        color='genero',        
-        barmode='group',     
-        text_auto=True,      
-        title='Contagem de Gênero por Classe de Peso (Padrão OMS)',
-        color_discrete_map={ 
-            'Female': '#FF69B4', 
-            'Male': '#1E90FF'
-        }
-    )
-
-    #2. Ordenar as barras
-    fig_genero_oms.update_xaxes(categoryorder='array', categoryarray=categorias_oms)
-
-    #3. Ajustar layout
-    fig_genero_oms.update_layout(
-        template='plotly_dark',
-        yaxis_title='Contagem',
-        xaxis_title='Classe de Peso (OMS)'
-    )
-
-    #4. Exibir o gráfico
-    st.plotly_chart(fig_genero_oms, use_container_width=True)
+    exibir_grafico('contagem_oms_genero', versao_dados, monitor)
 
     st.success(
         "**Conclusão da Investigação:** Validação concluída. A aplicação da variável-alvo `classe_peso_oms` **corrigiu o viés** de gênero. \n\n"
@@ -420,27 +641,7 @@ def run():
         "hábitos positivos) contra cada classe de peso corrigida."
     )
 
-    #Criar o Gráfico de Boxplot
-    categorias_oms = [
-        'Peso Insuficiente', 'Peso Normal', 'Sobrepeso', 
-        'Obesidade Grau I', 'Obesidade Grau II', 'Obesidade Grau III'
-    ]
-
-    fig_estilo_vida = px.box(
-        df_gold,
-        x='classe_peso_oms',
-        y='indice_estilo_vida',
-        color='classe_peso_oms',
-        title='Distribuição do Índice de Estilo de Vida por Classe de Peso (OMS)',
-        category_orders={'classe_peso_oms': categorias_oms} 
-    )
-
-    fig_estilo_vida.update_layout(
-        template='plotly_dark',
-        yaxis_title='Pontuação do Estilo de Vida (Quanto maior, melhor)', 
-        xaxis_title='Classe de Peso (OMS)'
-    )
-    st.plotly_chart(fig_estilo_vida, use_container_width=True)
+    exibir_grafico('estilo_vida_oms', versao_dados, monitor)
 
     st.info(
         "**Interpretação:** Devemos ver uma **tendência de queda** clara. "
@@ -456,21 +657,7 @@ def run():
         "hábitos negativos) contra cada classe de peso corrigida."
     )
 
-    fig_risco_alim = px.box(
-        df_gold,
-        x='classe_peso_oms',
-        y='indice_risco_alimentar', 
-        color='classe_peso_oms',
-        title='Distribuição do Risco Alimentar por Classe de Peso (OMS)',
-        category_orders={'classe_peso_oms': categorias_oms} 
-    )
-
-    fig_risco_alim.update_layout(
-        template='plotly_dark',
-        yaxis_title='Pontuação de Risco Alimentar (Quanto maior, pior)', 
-        xaxis_title='Classe de Peso (OMS)'
-    )
-    st.plotly_chart(fig_risco_alim, use_container_width=True)
+    exibir_grafico('risco_alimentar_oms', versao_dados, monitor)
 
     st.info(
         "**Interpretação:** Aqui, esperamos a **tendência oposta (de subida)**. "
@@ -543,4 +730,40 @@ def run():
         "\n\n"
         "Com esta base de dados validada e os insights claros, estamos prontos "
         "para prosseguir para a próxima seção: o **Sistema Preditivo**."
-    )
\ No newline at end of file
+    )
+
+    monitor.registrar("pagina", (time.perf_counter() - inicio_pagina) * 1000)
+
+    #Diagnóstico (opcional): tempo por gráfico e memória da base no processo do app
+    with st.expander("Diagnóstico de Desempenho"):
+        exibir_tempos_graficos(monitor)
+        exibir_diagnostico_memoria(df_gold)
+
+
+def exibir_tempos_graficos(monitor):
+    """Percentis do tempo de cada gráfico (e da página inteira) nas últimas execuções."""
+    resumo = monitor.resumo()
+    if not resumo:
+        return
+    tabela = pd.DataFrame.from_dict(resumo, orient="index").round(2)
+    tabela.index.name = "grafico (ms)"
+    st.caption(
+        "Tempo por gráfico: montagem (ou cache) da figura e envio ao navegador. "
+        + (f"Modo estático ({FORMATO_ESTATICO})." if modo_estatico() else "Modo interativo (Plotly).")
+    )
+    st.dataframe(tabela)
+
+
+def exibir_diagnostico_memoria(df_gold):
+    """Memória por coluna da base carregada vs. a base original (antes da compactação)."""
+    relatorio = df_gold.attrs.get("relatorio_memoria")
+    if relatorio is None:
+        st.caption("Relatório de memória indisponível.")
+        return
+    total = relatorio.loc["TOTAL"]
+    st.caption(
+        f"Base Gold em memória: {total['kb_depois']:,.1f} KB (como lida do arquivo: {total['kb_antes']:,.1f} KB, "
+        f"redução de {total['reducao_%']:.1f}%). "
+        + ("Cópia compartilhada via Arrow (mmap)." if PAINEL_ARROW_MMAP else "Cópia própria do processo.")
+    )
+    st.dataframe(relatorio)
\ No newline at end of file
@@ -2,147 +2,208 @@ import streamlit as st
 import pandas as pd
 import joblib
 import os
-import time #Para um efeito de "loading"
+import sys
 
 # --- 1. SETUP: CARREGAMENTO DOS MODELOS E CAMINHOS ---
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.features.engenharia import (
+    preparar_dados_para_previsao, preparar_lote_para_previsao, gerar_formularios,
+    OPCOES_FORMULARIO, IDADE_MIN, IDADE_MAX,
+)
+from src.utils.latencia import MonitorLatencia, ORCAMENTO_LATENCIA_MS
+from src.utils.cache_previsao import CachePrevisao, versao_artefato
+from src.utils.tabela_lookup import TabelaLookup
+from src.utils.pontuacao import NIVEIS_RISCO, Pontuador, nivel_risco
+from src.utils.recarregador_modelo import RecarregadorModelo, aquecer_pontuador
+from src.utils.registro_modelos import REGISTRO_DIR, resolver_versao
+
 MODELS_DIR = os.path.join(project_root, "models")
 REPORTS_DIR = os.path.join(project_root, "reports", "figures")
 
-#Caminhos para os artefatos treinados
-MODEL_PATH = os.path.join(MODELS_DIR, "random_forest_pipeline.joblib")
-LABEL_ENCODER_PATH = os.path.join(MODELS_DIR, "label_encoder.joblib")
+#Os artefatos treinados vêm da versão em produção no registro de modelos
+#(src/utils/registro_modelos.py); sem registro, de models/random_forest_pipeline.joblib
+
+#Motor de inferência: "pipeline" (modelo .joblib) ou "tabela" (tabela de
+#consulta gerada por src/models/build_lookup_table.py, só NumPy)
+MOTOR_INFERENCIA = os.getenv("MOTOR_INFERENCIA", "pipeline")
+TABELA_LOOKUP_PATH = os.getenv("TABELA_LOOKUP_PATH", os.path.join(MODELS_DIR, "tabela_lookup.npy"))
+
+#Explicação (SHAP) dos principais fatores de cada previsão do pipeline;
+#EXPLICACAO_APROXIMADA=1 troca o TreeSHAP exato pelo método de Saabas (mais rápido)
+EXPLICAR_PREVISOES = os.getenv("EXPLICAR_PREVISOES", "1") == "1"
+EXPLICACAO_APROXIMADA = os.getenv("EXPLICACAO_APROXIMADA", "0") == "1"
+
+#Mensagem exibida para cada nível de risco: (tipo do alerta, título, texto)
+MENSAGENS_RISCO = {
+    "Alto": (
+        "error", "🔴 **Risco Comportamental Alto**",
+        "Os hábitos informados sugerem alta probabilidade de manutenção ou evolução "
+        "de quadros relacionados à obesidade. Recomendam-se intervenções imediatas "
+        "e acompanhamento profissional.",
+    ),
+    "Moderado": (
+        "warning", "🟠 **Risco Comportamental Moderado**",
+        "Os hábitos informados colocam o paciente em uma **zona de atenção**. "
+        "Mudanças graduais no estilo de vida podem reduzir o risco de evolução do quadro.",
+    ),
+    "Baixo": (
+        "info", "🟢 **Risco Comportamental Baixo**",
+        "Os hábitos informados indicam um **baixo risco comportamental** para evolução "
+        "de quadros associados à obesidade. Ainda assim, recomenda-se manter rotinas "
+        "saudáveis e acompanhamento periódico.",
+    ),
+}
 
 
 
 # --- Cache de Recursos ---
 #@st.cache_resource é o comando para carregar
+#Cada versão do modelo é carregada junto com o pontuador e o explicador SHAP
+#(import do SHAP + TreeExplainer), para a primeira previsão não pagar esse custo.
+#Roda fora da sessão do Streamlit (thread do recarregador): sem chamadas st.*.
+def carregar_versao(versao):
+    """Pipeline, label encoder, pontuador e explicador de uma versão do registro."""
+    modelo = joblib.load(versao["modelo"])
+    label_encoder = joblib.load(versao["label_encoder"])
+    explicador = None
+    if EXPLICAR_PREVISOES:
+        from src.utils.explicacao import ExplicadorPrevisao
+        explicador = ExplicadorPrevisao(modelo, aproximado=EXPLICACAO_APROXIMADA)
+    return {"modelo": modelo, "label_encoder": label_encoder,
+            "pontuador": Pontuador.do_pipeline(modelo, label_encoder), "explicador": explicador}
+
+def aquecer_versao(carregado):
+    """Lote sintético pelo pontuador (e uma explicação) antes de a versão entrar em produção."""
+    aquecer_pontuador(carregado["pontuador"])
+    if carregado["explicador"] is not None:
+        carregado["explicador"].explicar(preparar_lote_para_previsao(gerar_formularios(1)), 0)
+
+#Uma versão em produção por processo, compartilhada por todas as sessões.
+#Uma nova versão ativada no registro é carregada e aquecida em segundo plano
+#e só então substitui a anterior: nenhuma sessão espera o joblib.load.
+@st.cache_resource
+def obter_recarregador():
+    """Carrega a versão atual do modelo e inicia a troca em segundo plano."""
+    return RecarregadorModelo(carregar_versao, aquecer_versao).iniciar()
+
+#Explicações já calculadas, por perfil (mesma chave do cache de previsões)
+@st.cache_resource(max_entries=1)
+def obter_cache_explicacao(versao_modelo):
+    """Cria o cache LRU/TTL de explicações da versão atual do modelo."""
+    return CachePrevisao(versao_modelo=versao_modelo)
+
+#Monitor de latência compartilhado por todas as sessões do app
 @st.cache_resource
-def carregar_modelo():
-    """Carrega o pipeline do modelo e o label encoder."""
+def obter_monitor_latencia():
+    """Cria (uma única vez) o monitor com as latências recentes da previsão."""
+    return MonitorLatencia()
+
+#Cache de previsões compartilhado entre sessões, um por versão do modelo
+@st.cache_resource(max_entries=1)
+def obter_cache_previsao(versao_modelo):
+    """Cria o cache LRU/TTL de previsões da versão atual do modelo."""
+    return CachePrevisao(versao_modelo=versao_modelo)
+
+@st.cache_resource
+def _abrir_tabela_lookup():
+    """Abre a tabela de consulta (mmap). Só aberturas bem-sucedidas ficam em cache."""
+    return TabelaLookup.carregar(TABELA_LOOKUP_PATH)
+
+def carregar_tabela_lookup():
+    """Tabela de consulta, ou None se ela ainda não existir (tenta de novo no próximo rerun)."""
     try:
-        modelo = joblib.load(MODEL_PATH)
-        label_encoder = joblib.load(LABEL_ENCODER_PATH)
-        return modelo, label_encoder
+        return _abrir_tabela_lookup()
     except FileNotFoundError:
-        st.error(
-            "Erro Crítico: Arquivos de modelo não encontrados."
-            f"Verifique se 'random_forest_pipeline.joblib' e 'label_encoder.joblib' "
-            f"existem na pasta: {MODELS_DIR}"
+        st.warning(
+            f"Tabela de consulta não encontrada em {TABELA_LOOKUP_PATH}. "
+            "Usando o pipeline do modelo."
         )
-        return None, None
+        return None
+
+#Pares (versão da tabela, versão do modelo) já avisados neste processo
+_TABELAS_AVISADAS = set()
+
+def avisar_tabela_desatualizada(versao_tabela, versao_modelo):
+    """Avisa (uma vez por par tabela/modelo) que a tabela é de outro modelo. Retorna False."""
+    if (versao_tabela, versao_modelo) in _TABELAS_AVISADAS:
+        return False
+    _TABELAS_AVISADAS.add((versao_tabela, versao_modelo))
+    mensagem = (
+        f"A tabela de consulta foi gerada por outro modelo ({str(versao_tabela)[:12]}; "
+        f"em produção: {versao_modelo[:12]}). Usando o pipeline do modelo até que ela seja "
+        "gerada de novo (src/models/build_lookup_table.py)."
+    )
+    print(f"[AVISO] {mensagem}")
+    st.warning(mensagem)
+    return False
 
-#Carrega os modelos uma vez
-modelo_pipeline, label_encoder = carregar_modelo()
+def tabela_lookup_em_dia(tabela_lookup):
+    """
+    A tabela só atende se foi gerada pelo modelo em produção: depois de um novo
+    treino ou de uma troca de versão no registro, as previsões voltam para o pipeline.
+    """
+    try:
+        versao_modelo = versao_artefato(resolver_versao()["modelo"])
+    except FileNotFoundError:
+        #Sem .joblib para comparar (deploy só com a tabela)
+        return True
+    return (tabela_lookup.gerada_pelo_modelo(versao_modelo)
+            or avisar_tabela_desatualizada(tabela_lookup.versao_modelo, versao_modelo))
+
+def prever_com_cache(df_predicao, pontuador, cache_previsao):
+    """Consulta o cache pelo perfil processado; só roda o pipeline em caso de falha."""
+    chave = CachePrevisao.chave(df_predicao)
+    pontuacao = cache_previsao.obter(chave)
+    if pontuacao is None:
+        pontuacao = pontuador.pontuar(df_predicao)
+        cache_previsao.guardar(chave, pontuacao)
+    return pontuacao
+
+def explicar_com_cache(df_predicao, indice_classe, explicador, cache_explicacao):
+    """Top-k fatores da previsão; perfis repetidos reaproveitam a explicação."""
+    chave = CachePrevisao.chave(df_predicao)
+    explicacao = cache_explicacao.obter(chave)
+    if explicacao is None:
+        explicacao = explicador.explicar(df_predicao, indice_classe)
+        cache_explicacao.guardar(chave, explicacao)
+    return explicacao
 
 # --- 2. BACKEND: A FUNÇÃO DE ENGENHARIA DE FEATURES ---
-def preparar_dados_para_previsao(inputs_humanos):
-    """
-    Pega o dicionário de inputs do médico, replica a engenharia de features
-    e retorna um DataFrame de 1 linha pronto para o modelo.
-    """    
-    # --- Mapeamentos (Baseado no dicionario_obesity_fiap.pdf) ---    
-    #Mapeamentos Simples
-    map_genero = {'Feminino': 'Female', 'Masculino': 'Male'}
-    map_sim_nao = {'Sim': 'yes', 'Não': 'no'}
-    map_transporte = {
-        'Automóvel': 'Automobile', 'Motocicleta': 'Motorbike', 
-        'Bicicleta': 'Bike', 'Transporte Público': 'Public_Transportation', 
-        'Caminhada': 'Walking'
-    }     
-    #Mapeamentos de Risco (para o índice de risco)
-    map_risco_calc = {
-        'Não': 'no', 'Às vezes': 'Sometimes', 
-        'Frequente': 'Frequently', 'Sempre': 'Always'
-    }
-    map_risco_caec = {
-        'Não': 'no', 'Às vezes': 'Sometimes', 
-        'Frequente': 'Frequently', 'Sempre': 'Always'
-    }
-    
-    #Mapeamentos Numéricos (para os índices)
-    map_fcvc = {'Raramente (ou nunca)': 1, 'Às vezes': 2, 'Sempre': 3}
-    map_ch2o = {'Menos de 1L': 1, 'Entre 1L e 2L': 2, 'Mais de 2L': 3}
-    map_faf = {
-        'Sedentário (0 dias)': 0, '1-2 dias': 1, 
-        '3-4 dias': 2, '4-5 dias ou mais': 3
-    }
-    map_tue = {
-        '0-2 horas/dia': 0, '3-5 horas/dia': 1, 'Mais de 5 horas/dia': 2
-    }
-    map_ncp = {
-        '1 refeição': 1, 
-        '2 refeições': 2, 
-        '3 refeições': 3, 
-        '4 ou mais': 4
-    }
-    # --- Início da Engenharia de Features (replicando seu notebook) ---
-    
-    #1. Criar Índices (baseado na sua lógica)
-    
-    #Índice de Estilo de Vida = (positivos) - (negativo)
-    val_fcvc = map_fcvc[inputs_humanos['consumo_frequente_vegetais']]
-    val_ch2o = map_ch2o[inputs_humanos['consumo_diario_agua']]
-    val_faf = map_faf[inputs_humanos['frequencia_semanal_atividade_fisica']]
-    val_tue = map_tue[inputs_humanos['tempo_uso_dispositivo']]
-    
-    indice_estilo_vida = (val_fcvc + val_ch2o + val_faf) - val_tue
-    
-    #Índice de Risco Alimentar (usando o mapeamento de risco do seu notebook)
-    map_risco_numerico = {'no': 0, 'Sometimes': 1, 'Frequently': 2, 'yes': 2, 'Always': 3}
-    
-    val_favc_txt = map_sim_nao[inputs_humanos['consumo_frequente_alimentos_caloricos']]
-    val_caec_txt = map_risco_caec[inputs_humanos['consumo_lanches_entre_refeicoes']]
-    val_calc_txt = map_risco_calc[inputs_humanos['consumo_bebida_alcoolica']]
-    
-    indice_risco_alimentar = (
-        map_risco_numerico[val_favc_txt] + 
-        map_risco_numerico[val_caec_txt] + 
-        map_risco_numerico[val_calc_txt]
-    )
+#A engenharia de features fica em src/features/engenharia.py (sem Streamlit),
+#para que o formulário e o processamento em lote usem a mesma lógica.
+#preparar_dados_para_previsao: 1 paciente (dicionário do formulário)
+#preparar_lote_para_previsao: N pacientes (DataFrame), vetorizado
 
-    #2. Criar o DataFrame de 1 linha
-    dados_para_modelo = {
-        'genero': map_genero[inputs_humanos['genero']],
-        'idade': inputs_humanos['idade'],
-        'historico_familiar': map_sim_nao[inputs_humanos['historico_familiar']],
-        'consumo_frequente_alimentos_caloricos': val_favc_txt,
-        'consumo_frequente_vegetais': val_fcvc,
-        'numero_refeicoes_principais_dia': map_ncp[inputs_humanos['numero_refeicoes_principais_dia']],
-        'consumo_lanches_entre_refeicoes': map_risco_caec[inputs_humanos['consumo_lanches_entre_refeicoes']],
-        'habito_fumar': map_sim_nao[inputs_humanos['habito_fumar']],
-        'consumo_diario_agua': val_ch2o,
-        'monitora_caloria_diaria': map_sim_nao[inputs_humanos['monitora_caloria_diaria']],
-        'frequencia_semanal_atividade_fisica': val_faf,
-        'tempo_uso_dispositivo': val_tue,
-        'consumo_bebida_alcoolica': val_calc_txt,
-        'transporte_habitual': map_transporte[inputs_humanos['transporte_habitual']],
-        'indice_estilo_vida': indice_estilo_vida,
-        'indice_risco_alimentar': indice_risco_alimentar,        
-    }
-    
-    #Pega as colunas na ordem correta que o pipeline espera
-    ordem_colunas = [
-        'genero', 'idade', 'historico_familiar', 
-        'consumo_frequente_alimentos_caloricos', 'consumo_frequente_vegetais',
-        'numero_refeicoes_principais_dia', 'consumo_lanches_entre_refeicoes', 
-        'habito_fumar', 'consumo_diario_agua', 'monitora_caloria_diaria',
-        'frequencia_semanal_atividade_fisica', 'tempo_uso_dispositivo',
-        'consumo_bebida_alcoolica', 'transporte_habitual', 'indice_estilo_vida',
-        'indice_risco_alimentar' 
-    ]
-
-    #Cria o DataFrame final com a ordem correta
-    df_predicao = pd.DataFrame([dados_para_modelo], columns=ordem_colunas)
-    
-    return df_predicao
+def carregar_motor_pipeline():
+    """Versão em produção: (versão, artefatos carregados, cache de previsões da versão)."""
+    try:
+        versao_modelo, carregado = obter_recarregador().atual()
+    except FileNotFoundError:
+        st.error(
+            "Erro Crítico: Arquivos de modelo não encontrados. "
+            f"Registre um modelo em {REGISTRO_DIR} (python src/utils/registro_modelos.py registrar ...) "
+            f"ou verifique se 'random_forest_pipeline.joblib' e 'label_encoder.joblib' existem na pasta: {MODELS_DIR}"
+        )
+        st.stop()
+    return versao_modelo, carregado, obter_cache_previsao(versao_modelo)
 
 # --- 3. FRONTEND: A APLICAÇÃO STREAMLIT ---
 def run():
-    
-    if not modelo_pipeline or not label_encoder:
-        st.stop()
+
+    #No motor "tabela" o modelo só é carregado se algum perfil cair fora da grade
+    tabela_lookup = carregar_tabela_lookup() if MOTOR_INFERENCIA == "tabela" else None
+    if tabela_lookup is not None and not tabela_lookup_em_dia(tabela_lookup):
+        tabela_lookup = None
+    #A mesma versão do modelo atende a execução inteira, mesmo que uma troca termine no meio
+    versao_modelo = carregado = cache_previsao = None
+    if tabela_lookup is None:
+        versao_modelo, carregado, cache_previsao = carregar_motor_pipeline()
         
     st.title("Sistema Preditivo de Nível de Obesidade")
 
@@ -169,59 +230,59 @@ def run():
         st.subheader("Perfil do Paciente")
         col1, col2 = st.columns(2)
         with col1:
-            inputs['idade'] = st.number_input("Idade (anos)", min_value=0, max_value=120, value=25)
+            inputs['idade'] = st.number_input("Idade (anos)", min_value=IDADE_MIN, max_value=IDADE_MAX, value=25)
         with col2:
-            inputs['genero'] = st.radio("Gênero do Paciente", ['Feminino', 'Masculino'], horizontal=True)
+            inputs['genero'] = st.radio("Gênero do Paciente", OPCOES_FORMULARIO['genero'], horizontal=True)
 
         # --- Grupo 2: Histórico Familiar ---
         st.subheader("Histórico Familiar")
-        inputs['historico_familiar'] = st.radio("Histórico familiar de obesidade?", ['Não', 'Sim'], horizontal=True)
+        inputs['historico_familiar'] = st.radio("Histórico familiar de obesidade?", OPCOES_FORMULARIO['historico_familiar'], horizontal=True)
 
         # --- Grupo 3: Modo de Locomoção ---
         st.subheader("Modo de Locomoção")
         inputs['transporte_habitual'] = st.selectbox(
             "Transporte habitual?", 
-            ['Automóvel', 'Motocicleta', 'Bicicleta', 'Transporte Público', 'Caminhada']
+            OPCOES_FORMULARIO['transporte_habitual']
         )
 
         # --- Grupo 4: Hábitos Diários ---
         st.subheader("Hábitos Diários")
-        inputs['habito_fumar'] = st.radio("O paciente fuma?", ['Não', 'Sim'], horizontal=True)
-        inputs['monitora_caloria_diaria'] = st.radio("Monitora calorias diárias?", ['Não', 'Sim'], horizontal=True)
+        inputs['habito_fumar'] = st.radio("O paciente fuma?", OPCOES_FORMULARIO['habito_fumar'], horizontal=True)
+        inputs['monitora_caloria_diaria'] = st.radio("Monitora calorias diárias?", OPCOES_FORMULARIO['monitora_caloria_diaria'], horizontal=True)
         inputs['numero_refeicoes_principais_dia'] = st.selectbox(
             "Número de refeições principais/dia (NCP):", 
-            ['1 refeição', '2 refeições', '3 refeições', '4 ou mais']
+            OPCOES_FORMULARIO['numero_refeicoes_principais_dia']
         )
         inputs['consumo_diario_agua'] = st.selectbox(
             "Consumo Diário de Água (CH2O):",
-            options=['Menos de 1L', 'Entre 1L e 2L', 'Mais de 2L']
+            options=OPCOES_FORMULARIO['consumo_diario_agua']
         )
 
         # --- Grupo 5: Comportamentos ---
         st.subheader("Comportamentos (Alimentação e Atividade)")
         inputs['consumo_frequente_vegetais'] = st.selectbox(
             "Consumo de Vegetais (FCVC):",
-            options=['Raramente (ou nunca)', 'Às vezes', 'Sempre']
+            options=OPCOES_FORMULARIO['consumo_frequente_vegetais']
         )
         inputs['frequencia_semanal_atividade_fisica'] = st.selectbox(
             "Atividade Física Semanal (FAF):",
-            options=['Sedentário (0 dias)', '1-2 dias', '3-4 dias', '4-5 dias ou mais']
+            options=OPCOES_FORMULARIO['frequencia_semanal_atividade_fisica']
         )
         inputs['tempo_uso_dispositivo'] = st.selectbox(
             "Tempo em dispositivos (TUE):",
-            options=['0-2 horas/dia', '3-5 horas/dia', 'Mais de 5 horas/dia']
+            options=OPCOES_FORMULARIO['tempo_uso_dispositivo']
         )
         inputs['consumo_frequente_alimentos_caloricos'] = st.radio(
             "Consumo Frequente de Alimentos Calóricos (FAVC)?",
-            ['Não', 'Sim'], index=1, horizontal=True
+            OPCOES_FORMULARIO['consumo_frequente_alimentos_caloricos'], index=1, horizontal=True
         )
         inputs['consumo_lanches_entre_refeicoes'] = st.selectbox(
             "Consumo de Lanches entre Refeições (CAEC):",
-            ['Não', 'Às vezes', 'Frequente', 'Sempre'], index=1
+            OPCOES_FORMULARIO['consumo_lanches_entre_refeicoes'], index=1
         )
         inputs['consumo_bebida_alcoolica'] = st.selectbox(
             "Consumo de Bebida Alcoólica (CALC):",
-            ['Não', 'Às vezes', 'Frequente', 'Sempre'], index=0
+            OPCOES_FORMULARIO['consumo_bebida_alcoolica'], index=0
         )
 
         st.markdown("---")
@@ -232,11 +293,31 @@ def run():
 
     # -------- LÓGICA DE PREVISÃO --------
     if submit_button:  
+        monitor = obter_monitor_latencia()
         with st.spinner("Analisando perfil e executando modelo..."):
-            df_predicao = preparar_dados_para_previsao(inputs)
-            previsao_numerica = modelo_pipeline.predict(df_predicao)
-            previsao_texto = label_encoder.inverse_transform(previsao_numerica)
-            time.sleep(1)
+            #Cada etapa é medida separadamente (p50/p95/p99 no diagnóstico)
+            with monitor.medir("total"):
+                resultado = explicacao = pontuacao = None
+                if tabela_lookup is not None:
+                    with monitor.medir("tabela_lookup"):
+                        resultado = tabela_lookup.prever(inputs)
+
+                #Motor "pipeline" ou perfil fora da tabela (ex: idade fora da faixa gerada)
+                if resultado is None:
+                    if carregado is None:
+                        versao_modelo, carregado, cache_previsao = carregar_motor_pipeline()
+                    with monitor.medir("preparacao_features"):
+                        df_predicao = preparar_dados_para_previsao(inputs)
+                    with monitor.medir("predict"):
+                        pontuacao = prever_com_cache(df_predicao, carregado["pontuador"], cache_previsao)
+                    resultado = pontuacao.classe_prevista[0]
+
+                    if carregado["explicador"] is not None:
+                        with monitor.medir("explicacao"):
+                            explicacao = explicar_com_cache(
+                                df_predicao, pontuacao.indice_previsto[0],
+                                carregado["explicador"], obter_cache_explicacao(versao_modelo),
+                            )
 
         # ----- EXIBIR IMC -----
         st.subheader("Informações Antropométricas")
@@ -254,40 +335,104 @@ def run():
             )
 
         # ----- RESULTADO -----
-        resultado = previsao_texto[0]
-
         st.subheader("Análise de Risco:")
 
-        if resultado in ['Obesidade Grau I', 'Obesidade Grau II', 'Obesidade Grau III']:
-            nivel_risco = "Alto"
-            st.error("🔴 **Risco Comportamental Alto**")
-            st.markdown(
-                "Os hábitos informados sugerem alta probabilidade de manutenção ou evolução "
-                "de quadros relacionados à obesidade. Recomendam-se intervenções imediatas "
-                "e acompanhamento profissional."
-            )
-
-        elif resultado == 'Sobrepeso':
-            nivel_risco = "Moderado"
-            st.warning("🟠 **Risco Comportamental Moderado**")
-            st.markdown(
-                "Os hábitos informados colocam o paciente em uma **zona de atenção**. "
-                "Mudanças graduais no estilo de vida podem reduzir o risco de evolução do quadro."
-            )
-
-        else:
-            nivel_risco = "Baixo"
-            st.info("🟢 **Risco Comportamental Baixo**")
-            st.markdown(
-                "Os hábitos informados indicam um **baixo risco comportamental** para evolução "
-                "de quadros associados à obesidade. Ainda assim, recomenda-se manter rotinas "
-                "saudáveis e acompanhamento periódico."
-            )
+        nivel = nivel_risco(resultado) if pontuacao is None else pontuacao.nivel_risco[0]
+        tipo_alerta, titulo, texto = MENSAGENS_RISCO[nivel]
+        getattr(st, tipo_alerta)(titulo)
+        st.markdown(texto)
+        if pontuacao is not None:
+            exibir_probabilidades(pontuacao)
 
+        # ----- FATORES DA PREVISÃO (SHAP) -----
+        if explicacao is not None:
+            exibir_explicacao(explicacao, resultado)
 
         #Rodapé
         st.markdown("---")
         st.caption(
             "⚕ *Importante:* Este modelo avalia **hábitos e comportamento**, "
             "não substitui diagnóstico clínico baseado em peso e altura."
-        )
\ No newline at end of file
+        )
+
+        #Diagnóstico (opcional): latências medidas no processo do app
+        with st.expander("Diagnóstico de Latência"):
+            exibir_diagnostico_latencia(monitor)
+            if cache_previsao is not None:
+                exibir_estatisticas_cache(cache_previsao)
+                exibir_versao_modelo(obter_recarregador().estado())
+            if tabela_lookup is not None:
+                st.caption(
+                    f"Motor de inferência: tabela de consulta ({len(tabela_lookup.tabela):,} perfis, "
+                    f"idades {tabela_lookup.idade_min}-{tabela_lookup.idade_max}, "
+                    f"gerada em {tabela_lookup.metadados.get('gerada_em')})."
+                )
+
+
+def exibir_diagnostico_latencia(monitor):
+    """Mostra os percentis de latência por etapa e compara o p95 total com o orçamento."""
+    resumo = monitor.resumo()
+    if not resumo:
+        st.caption("Nenhuma previsão medida ainda.")
+        return
+
+    tabela = pd.DataFrame.from_dict(resumo, orient="index").round(2)
+    tabela.index.name = "etapa"
+    st.dataframe(tabela)
+
+    p95_total = resumo.get("total", {}).get("p95")
+    if p95_total is None:
+        return
+    if monitor.dentro_do_orcamento("total", ORCAMENTO_LATENCIA_MS):
+        st.success(f"p95 total de {p95_total:.1f} ms, dentro do orçamento de {ORCAMENTO_LATENCIA_MS:.0f} ms.")
+    else:
+        st.warning(f"p95 total de {p95_total:.1f} ms, acima do orçamento de {ORCAMENTO_LATENCIA_MS:.0f} ms.")
+
+
+def exibir_probabilidades(pontuacao):
+    """Classes mais prováveis e probabilidade de cada nível de risco (1ª linha da pontuação)."""
+    classes = ", ".join(
+        f"{classe} ({probabilidade * 100:.0f}%)"
+        for classe, probabilidade in zip(pontuacao.classes_top_k[0], pontuacao.probabilidades_top_k[0])
+    )
+    niveis = ", ".join(
+        f"{nivel} {probabilidade * 100:.0f}%"
+        for nivel, probabilidade in reversed(list(zip(NIVEIS_RISCO, pontuacao.probabilidades_nivel[0])))
+    )
+    st.caption(f"Classes mais prováveis: {classes}. Probabilidade por nível de risco: {niveis}.")
+
+
+def exibir_explicacao(explicacao, resultado):
+    """Tabela com os fatores que mais pesaram a favor/contra a classe prevista."""
+    st.subheader("Principais Fatores desta Previsão")
+    st.caption(
+        f"Contribuição (SHAP) de cada resposta para a probabilidade de '{resultado}': "
+        "valores positivos aumentam e negativos reduzem essa probabilidade."
+    )
+    tabela = explicacao.rename(columns={"fator": "Fator", "valor": "Valor informado"})
+    tabela["Efeito"] = ["⬆ aumenta" if c > 0 else "⬇ reduz" for c in tabela["contribuicao"]]
+    tabela["Contribuição"] = tabela.pop("contribuicao").round(3)
+    st.dataframe(tabela, hide_index=True)
+
+
+def exibir_versao_modelo(estado):
+    """Versão do modelo em produção e o custo da última carga (feita em segundo plano)."""
+    texto = (
+        f"Versão do modelo: {str(estado['versao'])[:24]} (carregada em {estado['carregada_em']}: "
+        f"carga {estado['tempo_carga_ms']:.0f} ms, aquecimento {estado['tempo_aquecimento_ms']:.0f} ms, "
+        f"{estado['trocas']} troca(s) sem reinício)."
+    )
+    if estado["ultimo_erro"]:
+        texto += f" Última falha de troca: {estado['ultimo_erro']}"
+    st.caption(texto)
+
+
+def exibir_estatisticas_cache(cache_previsao):
+    """Mostra acertos/falhas do cache de previsões da versão atual do modelo."""
+    estatisticas = cache_previsao.estatisticas()
+    st.caption(
+        f"Cache de previsões: {estatisticas['acertos']} acertos, {estatisticas['falhas']} falhas "
+        f"(taxa de acerto {estatisticas['taxa_acerto'] * 100:.1f}%), "
+        f"{estatisticas['itens']}/{estatisticas['capacidade']} perfis guardados. "
+        f"Modelo: {str(estatisticas['versao_modelo'])[:12]}"
+    )
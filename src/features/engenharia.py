@@ -0,0 +1,355 @@
+# src/features/engenharia.py
+import numpy as np
+import pandas as pd
+
+# --- Mapeamentos (Baseado no dicionario_obesity_fiap.pdf) ---
+#Ficam no nível do módulo para serem compartilhados pelo caminho de 1 linha
+#(formulário do Streamlit) e pelo caminho em lote (listas de pacientes).
+
+#Mapeamentos Simples
+MAP_GENERO = {'Feminino': 'Female', 'Masculino': 'Male'}
+MAP_SIM_NAO = {'Sim': 'yes', 'Não': 'no'}
+MAP_TRANSPORTE = {
+    'Automóvel': 'Automobile', 'Motocicleta': 'Motorbike',
+    'Bicicleta': 'Bike', 'Transporte Público': 'Public_Transportation',
+    'Caminhada': 'Walking'
+}
+#Mapeamentos de Risco (para o índice de risco)
+MAP_RISCO_CALC = {
+    'Não': 'no', 'Às vezes': 'Sometimes',
+    'Frequente': 'Frequently', 'Sempre': 'Always'
+}
+MAP_RISCO_CAEC = {
+    'Não': 'no', 'Às vezes': 'Sometimes',
+    'Frequente': 'Frequently', 'Sempre': 'Always'
+}
+
+#Mapeamentos Numéricos (para os índices)
+MAP_FCVC = {'Raramente (ou nunca)': 1, 'Às vezes': 2, 'Sempre': 3}
+MAP_CH2O = {'Menos de 1L': 1, 'Entre 1L e 2L': 2, 'Mais de 2L': 3}
+MAP_FAF = {
+    'Sedentário (0 dias)': 0, '1-2 dias': 1,
+    '3-4 dias': 2, '4-5 dias ou mais': 3
+}
+MAP_TUE = {
+    '0-2 horas/dia': 0, '3-5 horas/dia': 1, 'Mais de 5 horas/dia': 2
+}
+MAP_NCP = {
+    '1 refeição': 1,
+    '2 refeições': 2,
+    '3 refeições': 3,
+    '4 ou mais': 4
+}
+
+#Mapeamento de risco do notebook create_gold.ipynb
+MAP_RISCO_NUMERICO = {'no': 0, 'Sometimes': 1, 'Frequently': 2, 'yes': 2, 'Always': 3}
+
+#Classes de IMC da OMS e o limite inferior de cada uma (a partir da segunda)
+CLASSES_OMS = [
+    'Peso Insuficiente', 'Peso Normal', 'Sobrepeso',
+    'Obesidade Grau I', 'Obesidade Grau II', 'Obesidade Grau III'
+]
+LIMITES_IMC_OMS = [18.5, 25, 30, 35, 40]
+
+#Colunas de hábitos (no formato da base) que viram pontuação de risco
+COLUNAS_RISCO = {
+    'consumo_frequente_alimentos_caloricos': 'risco_alimentos_caloricos_num',
+    'consumo_lanches_entre_refeicoes': 'risco_lanches_num',
+    'consumo_bebida_alcoolica': 'risco_alcool_num',
+}
+#Colunas criadas por calcular_indices, na ordem da base Gold
+COLUNAS_INDICES_GOLD = [
+    'indice_estilo_vida', 'risco_alimentos_caloricos_num', 'risco_lanches_num',
+    'risco_alcool_num', 'indice_risco_alimentar',
+]
+
+#Opções exibidas no formulário do Streamlit, na ordem em que aparecem.
+#Também definem a grade de perfis da tabela de consulta (build_lookup_table.py).
+OPCOES_FORMULARIO = {
+    'genero': ['Feminino', 'Masculino'],
+    'historico_familiar': ['Não', 'Sim'],
+    'transporte_habitual': ['Automóvel', 'Motocicleta', 'Bicicleta', 'Transporte Público', 'Caminhada'],
+    'habito_fumar': ['Não', 'Sim'],
+    'monitora_caloria_diaria': ['Não', 'Sim'],
+    'numero_refeicoes_principais_dia': ['1 refeição', '2 refeições', '3 refeições', '4 ou mais'],
+    'consumo_diario_agua': ['Menos de 1L', 'Entre 1L e 2L', 'Mais de 2L'],
+    'consumo_frequente_vegetais': ['Raramente (ou nunca)', 'Às vezes', 'Sempre'],
+    'frequencia_semanal_atividade_fisica': ['Sedentário (0 dias)', '1-2 dias', '3-4 dias', '4-5 dias ou mais'],
+    'tempo_uso_dispositivo': ['0-2 horas/dia', '3-5 horas/dia', 'Mais de 5 horas/dia'],
+    'consumo_frequente_alimentos_caloricos': ['Não', 'Sim'],
+    'consumo_lanches_entre_refeicoes': ['Não', 'Às vezes', 'Frequente', 'Sempre'],
+    'consumo_bebida_alcoolica': ['Não', 'Às vezes', 'Frequente', 'Sempre'],
+}
+IDADE_MIN, IDADE_MAX = 0, 120
+
+#Até quantas linhas os mapeamentos consultam o dicionário valor a valor
+LIMITE_CONSULTA_DIRETA = 64
+
+#Colunas na ordem correta que o pipeline espera
+ORDEM_COLUNAS = [
+    'genero', 'idade', 'historico_familiar',
+    'consumo_frequente_alimentos_caloricos', 'consumo_frequente_vegetais',
+    'numero_refeicoes_principais_dia', 'consumo_lanches_entre_refeicoes',
+    'habito_fumar', 'consumo_diario_agua', 'monitora_caloria_diaria',
+    'frequencia_semanal_atividade_fisica', 'tempo_uso_dispositivo',
+    'consumo_bebida_alcoolica', 'transporte_habitual', 'indice_estilo_vida',
+    'indice_risco_alimentar'
+]
+
+
+def gerar_formularios(n_linhas, semente=42):
+    """Respostas aleatórias do formulário (uma linha por paciente), para aquecimento e benchmarks."""
+    rng = np.random.default_rng(semente)
+    dados = {coluna: rng.choice(opcoes, n_linhas) for coluna, opcoes in OPCOES_FORMULARIO.items()}
+    dados["idade"] = rng.integers(IDADE_MIN, IDADE_MAX + 1, n_linhas)
+    return pd.DataFrame(dados)
+
+
+def preparar_dados_para_previsao(inputs_humanos):
+    """
+    Pega o dicionário de inputs do médico, replica a engenharia de features
+    e retorna um DataFrame de 1 linha pronto para o modelo.
+    """
+    #1. Traduzir as respostas do formulário para o formato da base
+    dados_para_modelo = {
+        'genero': MAP_GENERO[inputs_humanos['genero']],
+        'idade': inputs_humanos['idade'],
+        'historico_familiar': MAP_SIM_NAO[inputs_humanos['historico_familiar']],
+        'consumo_frequente_alimentos_caloricos': MAP_SIM_NAO[inputs_humanos['consumo_frequente_alimentos_caloricos']],
+        'consumo_frequente_vegetais': MAP_FCVC[inputs_humanos['consumo_frequente_vegetais']],
+        'numero_refeicoes_principais_dia': MAP_NCP[inputs_humanos['numero_refeicoes_principais_dia']],
+        'consumo_lanches_entre_refeicoes': MAP_RISCO_CAEC[inputs_humanos['consumo_lanches_entre_refeicoes']],
+        'habito_fumar': MAP_SIM_NAO[inputs_humanos['habito_fumar']],
+        'consumo_diario_agua': MAP_CH2O[inputs_humanos['consumo_diario_agua']],
+        'monitora_caloria_diaria': MAP_SIM_NAO[inputs_humanos['monitora_caloria_diaria']],
+        'frequencia_semanal_atividade_fisica': MAP_FAF[inputs_humanos['frequencia_semanal_atividade_fisica']],
+        'tempo_uso_dispositivo': MAP_TUE[inputs_humanos['tempo_uso_dispositivo']],
+        'consumo_bebida_alcoolica': MAP_RISCO_CALC[inputs_humanos['consumo_bebida_alcoolica']],
+        'transporte_habitual': MAP_TRANSPORTE[inputs_humanos['transporte_habitual']],
+    }
+
+    #2. Índices: a mesma implementação usada no lote e na camada Gold
+    indices = calcular_indices({coluna: np.array([valor]) for coluna, valor in dados_para_modelo.items()})
+    dados_para_modelo['indice_estilo_vida'] = indices['indice_estilo_vida'][0]
+    dados_para_modelo['indice_risco_alimentar'] = indices['indice_risco_alimentar'][0]
+
+    #Cria o DataFrame final com a ordem correta
+    df_predicao = pd.DataFrame([dados_para_modelo], columns=ORDEM_COLUNAS)
+
+    return df_predicao
+
+
+def _fatorar_coluna(valores, mapa, coluna):
+    """
+    Codifica a coluna em (códigos, valores distintos) e valida os valores
+    contra o mapeamento. O dicionário passa a ser consultado apenas uma vez
+    por valor distinto, e não uma vez por linha.
+    """
+    #Listas (ex: corpo JSON do serviço): o pd.factorize só aceita arrays
+    if not isinstance(valores, (pd.Series, pd.Index, np.ndarray)):
+        valores = np.asarray(valores, dtype=object)
+    try:
+        codigos, categorias = pd.factorize(valores)
+    except TypeError:
+        #Valores não hasheáveis (ex: lista ou objeto no lugar de uma opção)
+        raise ValueError(f"Valores inválidos na coluna '{coluna}': tipo não aceito") from None
+
+    invalidos = [c for c in categorias if c not in mapa]
+    if (codigos < 0).any():
+        invalidos.append(None)
+    if invalidos:
+        raise ValueError(f"Valores inválidos na coluna '{coluna}': {invalidos}")
+
+    return codigos, pd.Index(categorias)
+
+
+def _aplicar_mapa(codigos, categorias, mapa):
+    """Traduz os valores distintos e expande para todas as linhas (indexação NumPy)."""
+    return categorias.map(mapa).to_numpy()[codigos]
+
+
+def _mapear_coluna(valores, mapa, coluna):
+    """Aplica um mapeamento categórico sobre a coluna inteira."""
+    #Poucas linhas (ex: o formulário): consultar o dicionário direto é mais
+    #rápido que fatorar. Valores inválidos caem no caminho fatorado, que
+    #monta a mensagem de erro.
+    if len(valores) <= LIMITE_CONSULTA_DIRETA:
+        try:
+            mapeados = np.array([mapa[valor] for valor in valores])
+        except (KeyError, TypeError):
+            pass
+        else:
+            return mapeados.astype(object) if mapeados.dtype.kind == 'U' else mapeados
+
+    codigos, categorias = _fatorar_coluna(valores, mapa, coluna)
+    return _aplicar_mapa(codigos, categorias, mapa)
+
+
+def _validar_idade(valores):
+    """Idade numérica, finita e dentro dos limites do formulário (ValueError caso contrário)."""
+    idade = np.asarray(valores)
+    #Booleanos, textos ("30") e None (dtype object) não são aceitos como idade
+    if idade.dtype.kind not in 'iuf':
+        raise ValueError(f"Valores inválidos na coluna 'idade': esperado número, recebido {idade.dtype}")
+    invalidas = ~np.isfinite(idade) | (idade < IDADE_MIN) | (idade > IDADE_MAX)
+    if invalidas.any():
+        raise ValueError(f"Valores inválidos na coluna 'idade' (fora de {IDADE_MIN}-{IDADE_MAX}): "
+                         f"{np.unique(idade[invalidas])[:5].tolist()}")
+    return idade
+
+
+def validar_respostas(respostas):
+    """
+    Confere as respostas do formulário (dicionário campo -> lista/array, uma
+    posição por paciente) sem calcular as features: campos presentes
+    (KeyError), opções do formulário e idade (ValueError), com as mesmas
+    regras de preparar_colunas_para_previsao().
+    """
+    for campo, opcoes in OPCOES_FORMULARIO.items():
+        try:
+            invalidos = set(respostas[campo]).difference(opcoes)
+        except TypeError:
+            #Valores não hasheáveis (ex: lista ou objeto no lugar de uma opção)
+            raise ValueError(f"Valores inválidos na coluna '{campo}': tipo não aceito") from None
+        if invalidos:
+            raise ValueError(f"Valores inválidos na coluna '{campo}': {sorted(map(str, invalidos))}")
+    _validar_idade(respostas['idade'])
+
+
+def calcular_indices(colunas):
+    """
+    Índices do create_gold.ipynb a partir das colunas no formato da base
+    (DataFrame ou dicionário de arrays), para 1 ou N linhas de uma vez:
+    pontuações de risco, indice_estilo_vida e indice_risco_alimentar.
+    É a única implementação dos índices: camada Gold (notebook e
+    camadas.py), verificação do treino e app (formulário e lote).
+    Retorna um dicionário coluna -> array NumPy.
+    """
+    indices = {
+        destino: _mapear_coluna(np.asarray(colunas[origem]), MAP_RISCO_NUMERICO, origem)
+        for origem, destino in COLUNAS_RISCO.items()
+    }
+
+    #Índice de Estilo de Vida = (positivos) - (negativo)
+    indices['indice_estilo_vida'] = (
+        np.asarray(colunas['consumo_frequente_vegetais']) + np.asarray(colunas['consumo_diario_agua'])
+        + np.asarray(colunas['frequencia_semanal_atividade_fisica'])
+    ) - np.asarray(colunas['tempo_uso_dispositivo'])
+
+    #Índice de Risco Alimentar = soma das pontuações de risco
+    indices['indice_risco_alimentar'] = sum(indices[destino] for destino in COLUNAS_RISCO.values())
+    return indices
+
+
+def calcular_comportamento_saudavel(indice_estilo_vida, media_estilo_vida):
+    """1 se o índice de estilo de vida está acima da média da base, 0 caso contrário."""
+    return (np.asarray(indice_estilo_vida) > media_estilo_vida).astype(int)
+
+
+def preparar_colunas_para_previsao(inputs_humanos):
+    """
+    Versão vetorizada de preparar_dados_para_previsao(), sem montar DataFrame.
+    Recebe um DataFrame (ou dicionário de colunas/listas) com as respostas do
+    formulário, uma linha por paciente, e retorna o dicionário coluna -> array
+    com as 16 colunas do modelo (aceito direto pelo Pontuador, ver
+    src/utils/esquema_entrada.py).
+    """
+    #1. Mapeamentos categóricos (coluna inteira de uma vez)
+    val_fcvc = _mapear_coluna(inputs_humanos['consumo_frequente_vegetais'], MAP_FCVC, 'consumo_frequente_vegetais')
+    val_ch2o = _mapear_coluna(inputs_humanos['consumo_diario_agua'], MAP_CH2O, 'consumo_diario_agua')
+    val_faf = _mapear_coluna(inputs_humanos['frequencia_semanal_atividade_fisica'], MAP_FAF, 'frequencia_semanal_atividade_fisica')
+    val_tue = _mapear_coluna(inputs_humanos['tempo_uso_dispositivo'], MAP_TUE, 'tempo_uso_dispositivo')
+
+    val_favc_txt = _mapear_coluna(inputs_humanos['consumo_frequente_alimentos_caloricos'], MAP_SIM_NAO, 'consumo_frequente_alimentos_caloricos')
+    val_caec_txt = _mapear_coluna(inputs_humanos['consumo_lanches_entre_refeicoes'], MAP_RISCO_CAEC, 'consumo_lanches_entre_refeicoes')
+    val_calc_txt = _mapear_coluna(inputs_humanos['consumo_bebida_alcoolica'], MAP_RISCO_CALC, 'consumo_bebida_alcoolica')
+
+    #2. Monta as colunas no formato da base, com a ordem correta
+    dados_para_modelo = {
+        'genero': _mapear_coluna(inputs_humanos['genero'], MAP_GENERO, 'genero'),
+        'idade': _validar_idade(inputs_humanos['idade']),
+        'historico_familiar': _mapear_coluna(inputs_humanos['historico_familiar'], MAP_SIM_NAO, 'historico_familiar'),
+        'consumo_frequente_alimentos_caloricos': val_favc_txt,
+        'consumo_frequente_vegetais': val_fcvc,
+        'numero_refeicoes_principais_dia': _mapear_coluna(inputs_humanos['numero_refeicoes_principais_dia'], MAP_NCP, 'numero_refeicoes_principais_dia'),
+        'consumo_lanches_entre_refeicoes': val_caec_txt,
+        'habito_fumar': _mapear_coluna(inputs_humanos['habito_fumar'], MAP_SIM_NAO, 'habito_fumar'),
+        'consumo_diario_agua': val_ch2o,
+        'monitora_caloria_diaria': _mapear_coluna(inputs_humanos['monitora_caloria_diaria'], MAP_SIM_NAO, 'monitora_caloria_diaria'),
+        'frequencia_semanal_atividade_fisica': val_faf,
+        'tempo_uso_dispositivo': val_tue,
+        'consumo_bebida_alcoolica': val_calc_txt,
+        'transporte_habitual': _mapear_coluna(inputs_humanos['transporte_habitual'], MAP_TRANSPORTE, 'transporte_habitual'),
+    }
+
+    #3. Índices (mesma implementação do caminho de 1 linha e da camada Gold)
+    indices = calcular_indices(dados_para_modelo)
+    dados_para_modelo['indice_estilo_vida'] = indices['indice_estilo_vida']
+    dados_para_modelo['indice_risco_alimentar'] = indices['indice_risco_alimentar']
+    return dados_para_modelo
+
+
+def preparar_lote_para_previsao(inputs_humanos):
+    """
+    Recebe um DataFrame (ou dicionário de colunas) com as respostas do
+    formulário, uma linha por paciente, e retorna o DataFrame de 16 colunas
+    pronto para o modelo, preservando o índice da entrada.
+    """
+    if not isinstance(inputs_humanos, pd.DataFrame):
+        inputs_humanos = pd.DataFrame(inputs_humanos)
+
+    df_predicao = pd.DataFrame(preparar_colunas_para_previsao(inputs_humanos),
+                               columns=ORDEM_COLUNAS, index=inputs_humanos.index)
+
+    return df_predicao
+
+
+def classificar_imc_oms(imc):
+    """Classe OMS de cada IMC (vetorizado; mesmas faixas do create_gold.ipynb)."""
+    posicao = np.searchsorted(LIMITES_IMC_OMS, np.asarray(imc, dtype=float), side='right')
+    return np.asarray(CLASSES_OMS, dtype=object)[posicao]
+
+
+def construir_features_gold(df_silver, media_estilo_vida=None):
+    """
+    Camada Silver -> Gold (as colunas criadas no create_gold.ipynb), sobre o
+    DataFrame inteiro: IMC, índices de estilo de vida e de risco alimentar,
+    comportamento_saudavel e classe_peso_oms.
+
+    comportamento_saudavel compara o índice de estilo de vida com a média
+    GLOBAL da base. Ao processar a tabela em blocos, passe essa média em
+    `media_estilo_vida`; sem ela, usa a média do próprio DataFrame.
+    """
+    df_gold = df_silver.copy()
+    df_gold['IMC'] = df_gold['peso_kg'] / (df_gold['altura_m'] ** 2)
+
+    indices = calcular_indices(df_gold)
+    for coluna in COLUNAS_INDICES_GOLD:
+        df_gold[coluna] = indices[coluna]
+
+    if media_estilo_vida is None:
+        media_estilo_vida = df_gold['indice_estilo_vida'].mean()
+    df_gold['comportamento_saudavel'] = calcular_comportamento_saudavel(df_gold['indice_estilo_vida'], media_estilo_vida)
+
+    df_gold['classe_peso_oms'] = classificar_imc_oms(df_gold['IMC'])
+    return df_gold
+
+
+def verificar_features_gold(df_gold):
+    """
+    Confere se as colunas derivadas de uma base Gold já gravada batem com a
+    implementação atual (evita treinar com índices diferentes dos que o app
+    calcula). Levanta ValueError com as colunas divergentes.
+    """
+    esperado = calcular_indices(df_gold)
+    esperado['comportamento_saudavel'] = calcular_comportamento_saudavel(
+        esperado['indice_estilo_vida'], esperado['indice_estilo_vida'].mean())
+    esperado['classe_peso_oms'] = classificar_imc_oms(df_gold['IMC'])
+
+    divergentes = [
+        coluna for coluna, valores in esperado.items()
+        if coluna in df_gold.columns
+        and not np.array_equal(np.asarray(df_gold[coluna], dtype=object), np.asarray(valores, dtype=object))
+    ]
+    if divergentes:
+        raise ValueError(f"Colunas da base Gold diferentes da engenharia de features atual: {divergentes}")
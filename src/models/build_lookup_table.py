@@ -0,0 +1,138 @@
+# src/models/build_lookup_table.py
+"""
+Gera a tabela de consulta (grade completa de perfis -> classe prevista).
+
+Enumera todas as combinações de OPCOES_FORMULARIO x idades, em blocos,
+passa cada bloco pela engenharia de features e pelo pipeline treinado, e
+grava a classe prevista em um array uint8 memory-mapped (.npy). O índice de
+cada perfil é a sua codificação em base mista (ver src/utils/tabela_lookup.py).
+
+Uso:
+    python src/models/build_lookup_table.py --idade-min 14 --idade-max 61
+    python src/models/build_lookup_table.py --restringir genero=Feminino
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# --- Definição de Caminhos ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+MODELS_DIR = os.path.join(project_root, "models")
+TABELA_PATH = os.path.join(MODELS_DIR, "tabela_lookup.npy")
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.features.engenharia import OPCOES_FORMULARIO, IDADE_MIN, IDADE_MAX, preparar_lote_para_previsao
+from src.utils.cache_previsao import versao_artefato
+from src.utils.tabela_lookup import caminho_metadados
+from src.utils.registro_modelos import caminhos_modelo_atual
+
+#A tabela é gerada a partir da versão em produção do registro de modelos
+MODEL_PATH, LE_PATH = caminhos_modelo_atual()
+
+TAMANHO_BLOCO_PADRAO = 200_000
+
+
+def construir_tabela(caminho_saida=TABELA_PATH, caminho_modelo=MODEL_PATH, caminho_le=LE_PATH,
+                     idade_min=IDADE_MIN, idade_max=IDADE_MAX, opcoes=None,
+                     tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Enumera a grade de perfis pelo pipeline e grava a tabela + metadados."""
+    opcoes = opcoes or OPCOES_FORMULARIO
+    campos = list(opcoes)
+    bases = tuple(len(opcoes[campo]) for campo in campos) + (idade_max - idade_min + 1,)
+    total = int(np.prod(bases, dtype=np.int64))
+
+    print("--- [1/3] Carregando artefatos (modelo e encoder)... ---")
+    modelo_pipeline = joblib.load(caminho_modelo)
+    label_encoder = joblib.load(caminho_le)
+    classes = list(label_encoder.inverse_transform(modelo_pipeline.classes_))
+    if len(classes) > np.iinfo(np.uint8).max:
+        raise ValueError("A tabela usa uint8: no máximo 255 classes.")
+
+    print(f"--- [2/3] Enumerando {total:,} perfis ({' x '.join(map(str, bases))})... ---")
+    tabela = np.lib.format.open_memmap(caminho_saida, mode="w+", dtype=np.uint8, shape=(total,))
+    valores_campos = [np.asarray(opcoes[campo], dtype=object) for campo in campos]
+
+    inicio = time.perf_counter()
+    for inicio_bloco in range(0, total, tamanho_bloco):
+        fim_bloco = min(inicio_bloco + tamanho_bloco, total)
+
+        #Decodifica os índices do bloco em dígitos da base mista (idade por último)
+        digitos = np.unravel_index(np.arange(inicio_bloco, fim_bloco), bases)
+        df_bloco = pd.DataFrame({campo: valores[d] for campo, valores, d in zip(campos, valores_campos, digitos)})
+        df_bloco["idade"] = idade_min + digitos[-1]
+
+        df_features = preparar_lote_para_previsao(df_bloco)
+        probabilidades = modelo_pipeline.predict_proba(df_features)
+        tabela[inicio_bloco:fim_bloco] = np.argmax(probabilidades, axis=1)
+
+        decorrido = time.perf_counter() - inicio
+        print(f"{fim_bloco:,}/{total:,} perfis ({fim_bloco / max(decorrido, 1e-9):,.0f} perfis/s)")
+    tabela.flush()
+    del tabela
+
+    metadados = {
+        "campos": campos,
+        "opcoes": {campo: list(opcoes[campo]) for campo in campos},
+        "idade_min": idade_min,
+        "idade_max": idade_max,
+        "classes": classes,
+        "versao_modelo": versao_artefato(caminho_modelo),
+        "gerada_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    with open(caminho_metadados(caminho_saida), "w", encoding="utf-8") as arquivo:
+        json.dump(metadados, arquivo, ensure_ascii=False, indent=2)
+
+    print(f"--- [3/3] Tabela salva em: {caminho_saida} ({total / 1024 ** 2:.1f} MB) ---")
+    return caminho_saida
+
+
+def _ler_restricoes(restricoes):
+    """Converte ['campo=op1,op2', ...] em um dicionário de opções restritas."""
+    opcoes = {campo: list(valores) for campo, valores in OPCOES_FORMULARIO.items()}
+    for restricao in restricoes or []:
+        campo, _, valores = restricao.partition("=")
+        if campo not in opcoes:
+            raise ValueError(f"Campo desconhecido: '{campo}'")
+        selecionadas = [v.strip() for v in valores.split(",")]
+        invalidas = [v for v in selecionadas if v not in OPCOES_FORMULARIO[campo]]
+        if invalidas:
+            raise ValueError(f"Opções inválidas para '{campo}': {invalidas}")
+        opcoes[campo] = selecionadas
+    return opcoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera a tabela de consulta de perfis do formulário.")
+    parser.add_argument("--saida", default=TABELA_PATH, help="Arquivo .npy de saída.")
+    parser.add_argument("--modelo", default=MODEL_PATH, help="Caminho do pipeline treinado (.joblib).")
+    parser.add_argument("--label-encoder", default=LE_PATH, help="Caminho do label_encoder.joblib.")
+    parser.add_argument("--idade-min", type=int, default=IDADE_MIN)
+    parser.add_argument("--idade-max", type=int, default=IDADE_MAX)
+    parser.add_argument("--restringir", action="append", metavar="CAMPO=OP1,OP2",
+                        help="Limita um campo a um subconjunto de opções (pode repetir).")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO_PADRAO)
+    args = parser.parse_args(argv)
+
+    construir_tabela(
+        caminho_saida=args.saida,
+        caminho_modelo=args.modelo,
+        caminho_le=args.label_encoder,
+        idade_min=args.idade_min,
+        idade_max=args.idade_max,
+        opcoes=_ler_restricoes(args.restringir),
+        tamanho_bloco=args.tamanho_bloco,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# src/models/componentes.py
+"""
+Componentes compartilhados entre o treinamento (train_model.py) e a busca de
+hiperparâmetros (tune_model.py): definição do alvo e das features, o
+pré-processador, o pré-processamento por fold (com cache em disco) e a
+construção dos modelos candidatos.
+"""
+import os
+
+import numpy as np
+from joblib import Memory
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from xgboost import XGBClassifier
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+CACHE_DIR = os.path.join(project_root, ".cache", "joblib")
+
+TARGET = 'classe_peso_oms'
+
+#Definição das colunas que "vazam" a resposta
+FEATURES_DE_LEAKAGE = [
+    'classe_peso_corporal', #Alvo original falho
+    'IMC',
+    'peso_kg',
+    'altura_m',
+    'risco_alimentos_caloricos_num',
+    'risco_lanches_num',
+    'risco_alcool_num',
+    'comportamento_saudavel'
+]
+
+#Cache em disco dos pré-processadores ajustados por fold (joblib.Memory)
+memoria = Memory(CACHE_DIR, verbose=0)
+
+
+def separar_features(df):
+    """X de treinamento: a base Gold sem o alvo e sem as colunas de leakage."""
+    return df.drop(columns=[TARGET] + FEATURES_DE_LEAKAGE)
+
+
+def dividir_treino_teste(X, y):
+    """Divisão estratificada 80/20 usada no treino final e na busca de hiperparâmetros."""
+    return train_test_split(
+        X, y,
+        test_size=0.2,
+        random_state=42,
+        stratify=y
+    )
+
+
+def gerar_folds(X_train, y_train, n_splits=5):
+    """Mesmos folds que o cross_val_score(cv=5) usaria para um classificador."""
+    return list(StratifiedKFold(n_splits=n_splits).split(X_train, y_train))
+
+
+def criar_preprocessador(X):
+    """ColumnTransformer (StandardScaler nas numéricas, OneHotEncoder nas categóricas)."""
+    colunas_numericas = X.select_dtypes(include=np.number).columns
+    colunas_categoricas = X.select_dtypes(include=['object', 'category']).columns
+
+    numeric_transformer = Pipeline(steps=[
+        ('scaler', StandardScaler())
+    ])
+    categorical_transformer = Pipeline(steps=[
+        ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
+        # handle_unknown='ignore' evita erros se o modelo vir um valor novo
+    ])
+    return ColumnTransformer(
+        transformers=[
+            ('num', numeric_transformer, colunas_numericas),
+            ('cat', categorical_transformer, colunas_categoricas)
+        ],
+        remainder='passthrough'
+    )
+
+
+def _preprocessar_fold(preprocessor, X, idx_treino, idx_validacao):
+    """Ajusta o pré-processador no treino do fold e transforma treino e validação."""
+    preprocessor_fold = clone(preprocessor).fit(X.iloc[idx_treino])
+    return (preprocessor_fold.transform(X.iloc[idx_treino]),
+            preprocessor_fold.transform(X.iloc[idx_validacao]))
+
+
+#O ColumnTransformer é ajustado uma vez por fold e reaproveitado por todos os
+#modelos (e pelas próximas execuções, se os dados não mudarem).
+preprocessar_fold = memoria.cache(_preprocessar_fold)
+
+
+def criar_modelo(nome, **parametros):
+    """Instancia um candidato ('Random Forest' ou 'XGBoost') com os parâmetros dados."""
+    if nome == "Random Forest":
+        return RandomForestClassifier(random_state=42, **parametros)
+    if nome == "XGBoost":
+        return XGBClassifier(use_label_encoder=False,
+                             eval_metric='mlogloss',
+                             random_state=42,
+                             **parametros)
+    raise ValueError(f"Modelo desconhecido: '{nome}'")
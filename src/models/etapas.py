@@ -0,0 +1,105 @@
+# src/models/etapas.py
+"""
+Executor de etapas com impressão digital (fingerprint) para o treinamento.
+
+Cada etapa é uma função cujo resultado fica salvo em disco junto com a sua
+impressão digital: hash do código da etapa (e dos módulos de que ela
+depende), dos parâmetros e das impressões das etapas anteriores. Se nada
+disso mudou e os arquivos gerados pela etapa ainda existem, ela é pulada e o
+resultado salvo é reaproveitado (carregado só se alguma etapa seguinte
+precisar dele).
+"""
+import hashlib
+import inspect
+import json
+import os
+import time
+from datetime import datetime
+
+import joblib
+
+
+def _hash_texto(*partes):
+    digest = hashlib.sha256()
+    for parte in partes:
+        digest.update(parte.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultadoEtapa:
+    """Resultado de uma etapa: a impressão digital e o valor (carregado sob demanda)."""
+
+    def __init__(self, nome, impressao, caminho, valor=None, carregado=False):
+        self.nome = nome
+        self.impressao = impressao
+        self._caminho = caminho
+        self._valor = valor
+        self._carregado = carregado
+
+    @property
+    def valor(self):
+        if not self._carregado:
+            self._valor = joblib.load(self._caminho)
+            self._carregado = True
+        return self._valor
+
+
+class ExecutorEtapas:
+    """Roda as etapas em ordem, pulando as que já têm resultado válido em cache."""
+
+    def __init__(self, diretorio, forcar=False):
+        self.diretorio = diretorio
+        self.forcar = forcar
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminhos(self, nome):
+        base = os.path.join(self.diretorio, nome)
+        return f"{base}.joblib", f"{base}.json"
+
+    @staticmethod
+    def impressao(funcao, parametros=None, dependencias=None, codigo=()):
+        """Hash do código da etapa + módulos/funções usados + parâmetros + etapas anteriores."""
+        fontes = [inspect.getsource(funcao)] + [inspect.getsource(modulo) for modulo in codigo]
+        return _hash_texto(
+            *fontes,
+            json.dumps(parametros or {}, sort_keys=True, default=str),
+            *(f"{nome}={resultado.impressao}" for nome, resultado in sorted((dependencias or {}).items())),
+        )
+
+    def executar(self, nome, funcao, parametros=None, dependencias=None, arquivos=(), codigo=()):
+        """
+        Executa `funcao(**valores das dependências, **parametros)` se a etapa
+        mudou; senão reaproveita o resultado salvo. `arquivos` são as saídas
+        que a etapa grava (ex: PNGs) e precisam existir para o cache valer;
+        `codigo` lista módulos ou funções auxiliares cuja mudança invalida a etapa.
+        """
+        parametros = parametros or {}
+        dependencias = dependencias or {}
+        impressao = self.impressao(funcao, parametros, dependencias, codigo)
+        caminho_resultado, caminho_manifesto = self._caminhos(nome)
+
+        if not self.forcar and os.path.exists(caminho_manifesto) and os.path.exists(caminho_resultado):
+            with open(caminho_manifesto, encoding="utf-8") as arquivo:
+                manifesto = json.load(arquivo)
+            if manifesto["impressao"] == impressao and all(os.path.exists(a) for a in arquivos):
+                print(f"[cache] Etapa '{nome}' sem mudanças (de {manifesto['concluida_em']}), pulando.")
+                return ResultadoEtapa(nome, impressao, caminho_resultado)
+
+        inicio = time.perf_counter()
+        valor = funcao(**{chave: resultado.valor for chave, resultado in dependencias.items()}, **parametros)
+        duracao = time.perf_counter() - inicio
+
+        joblib.dump(valor, caminho_resultado)
+        #O manifesto é gravado por último: uma etapa interrompida não fica marcada como válida
+        manifesto = {
+            "etapa": nome,
+            "impressao": impressao,
+            "arquivos": list(arquivos),
+            "duracao_s": round(duracao, 3),
+            "concluida_em": datetime.now().isoformat(timespec="seconds"),
+        }
+        with open(caminho_manifesto, "w", encoding="utf-8") as arquivo:
+            json.dump(manifesto, arquivo, ensure_ascii=False, indent=2)
+        print(f"Etapa '{nome}' concluída em {duracao:.1f}s.")
+        return ResultadoEtapa(nome, impressao, caminho_resultado, valor, carregado=True)
@@ -0,0 +1,210 @@
+# src/models/export_model.py
+"""
+Exporta o pipeline treinado para o formato compacto (NumPy puro).
+
+Compila o pré-processador (médias/escalas do StandardScaler e categorias do
+OneHotEncoder) e o ensemble de árvores (Random Forest ou XGBoost) em arrays
+planos (feature, limiar, filhos, valores das folhas) e grava tudo em uma
+pasta lida por src/utils/modelo_compacto.py.
+
+Com --verificar, compara o predict_proba do modelo compacto com o do
+pipeline original em toda a base Gold e falha se a diferença passar da tolerância.
+
+Uso:
+    python src/models/export_model.py --verificar
+"""
+import argparse
+import json
+import os
+import sys
+
+import joblib
+import numpy as np
+
+# --- Definição de Caminhos ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+MODELS_DIR = os.path.join(project_root, "models")
+COMPACTO_DIR = os.path.join(MODELS_DIR, "compacto")
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.utils.modelo_compacto import ModeloCompacto, METADADOS_ARQUIVO
+from src.utils.esquema_entrada import compilar_preprocessador
+from src.utils.dados_gold import carregar_gold
+from src.utils.cache_previsao import versao_artefato
+from src.utils.registro_modelos import caminhos_modelo_atual
+
+#Por padrão, exporta a versão em produção no registro de modelos
+MODEL_PATH, LE_PATH = caminhos_modelo_atual()
+
+#Tolerância da verificação: o Random Forest é reproduzido bit a bit; no
+#XGBoost a exponencial do softmax (float32) pode variar no último dígito.
+TOLERANCIA = {"random_forest": 0.0, "xgboost": 1e-6}
+
+
+def _concatenar_arvores(arvores):
+    """
+    Junta as árvores em arrays únicos. Cada árvore é um dicionário com
+    feature/limiar/esquerda/direita/valor; os índices dos filhos passam a ser
+    globais e as folhas ficam com esquerda = direita = -1 e feature = 0.
+    """
+    raizes, deslocamento = [], 0
+    partes = {chave: [] for chave in arvores[0]}
+    for arvore in arvores:
+        raizes.append(deslocamento)
+        folha = arvore["esquerda"] < 0
+        for chave, valores in arvore.items():
+            valores = np.array(valores)
+            if chave in ("esquerda", "direita"):
+                valores = np.where(folha, -1, valores + deslocamento)
+            elif chave == "feature":
+                valores = np.where(folha, 0, valores)
+            partes[chave].append(valores)
+        deslocamento += len(arvore["esquerda"])
+
+    arrays = {chave: np.concatenate(valores) for chave, valores in partes.items()}
+    for chave in ("feature", "esquerda", "direita"):
+        arrays[chave] = arrays[chave].astype(np.int32)
+    arrays["raizes"] = np.asarray(raizes, dtype=np.int32)
+    return arrays
+
+
+def compilar_random_forest(modelo):
+    """Árvores do RandomForestClassifier com as probabilidades já normalizadas por folha."""
+    arvores = []
+    for estimador in modelo.estimators_:
+        arvore = estimador.tree_
+        valor = arvore.value[:, 0, :]
+        #Versões antigas do scikit-learn guardam contagens em tree_.value e o
+        #predict_proba normaliza; as atuais já guardam as frações (usadas como estão).
+        normalizador = valor.sum(axis=1)[:, np.newaxis]
+        if not np.allclose(normalizador, 1.0):
+            normalizador[normalizador == 0.0] = 1.0
+            valor = valor / normalizador
+        arvores.append({
+            "feature": arvore.feature,
+            "limiar": arvore.threshold.astype(np.float64),
+            "esquerda": arvore.children_left,
+            "direita": arvore.children_right,
+            "valor": valor,
+        })
+    return _concatenar_arvores(arvores)
+
+
+def compilar_xgboost(modelo):
+    """Árvores do booster (formato JSON do XGBoost) + intercepto por classe."""
+    conteudo = json.loads(modelo.get_booster().save_raw("json"))
+    learner = conteudo["learner"]
+    if learner["objective"]["name"] != "multi:softprob":
+        raise ValueError(f"Objetivo não suportado: {learner['objective']['name']}")
+    modelo_json = learner["gradient_booster"]["model"]
+
+    arvores = []
+    for arvore in modelo_json["trees"]:
+        esquerda = np.asarray(arvore["left_children"])
+        arvores.append({
+            "feature": np.asarray(arvore["split_indices"]),
+            #Em folhas, split_conditions guarda o valor da folha
+            "limiar": np.asarray(arvore["split_conditions"], dtype=np.float32),
+            "esquerda": esquerda,
+            "direita": np.asarray(arvore["right_children"]),
+            "valor": np.where(esquerda < 0, np.asarray(arvore["split_conditions"], dtype=np.float32), 0).astype(np.float32),
+            "default_esquerda": np.asarray(arvore["default_left"], dtype=bool),
+        })
+    arrays = _concatenar_arvores(arvores)
+    arrays["classe_arvore"] = np.asarray(modelo_json["tree_info"], dtype=np.int32)
+
+    #No multi:softprob o base_score (um valor ou um por classe) entra direto
+    #como margem inicial de cada classe, antes da soma das folhas.
+    n_classes = int(learner["learner_model_param"]["num_class"])
+    base_score = np.asarray(json.loads(learner["learner_model_param"]["base_score"]), dtype=np.float32).ravel()
+    arrays["intercepto"] = np.broadcast_to(base_score, (n_classes,)).astype(np.float32)
+    return arrays
+
+
+def exportar(modelo_pipeline, label_encoder, diretorio=COMPACTO_DIR, versao_modelo=None):
+    """
+    Compila o pipeline e grava metadados.json + arrays .npy em `diretorio`.
+    `versao_modelo` (hash do .joblib de origem) fica nos metadados, para saber
+    se o modelo compacto está desatualizado.
+    """
+    preprocessor = modelo_pipeline.named_steps["preprocessor"]
+    modelo = modelo_pipeline.named_steps["model"]
+
+    blocos, arrays, n_saida = compilar_preprocessador(preprocessor)
+
+    nome_modelo = type(modelo).__name__
+    if nome_modelo == "RandomForestClassifier":
+        tipo_modelo, arrays_modelo = "random_forest", compilar_random_forest(modelo)
+    elif nome_modelo == "XGBClassifier":
+        tipo_modelo, arrays_modelo = "xgboost", compilar_xgboost(modelo)
+    else:
+        raise ValueError(f"Modelo não suportado: {nome_modelo}")
+    arrays.update(arrays_modelo)
+
+    metadados = {
+        "tipo_modelo": tipo_modelo,
+        "colunas_entrada": [str(c) for c in preprocessor.feature_names_in_],
+        "blocos": blocos,
+        "n_saida": n_saida,
+        "classes": [str(c) for c in label_encoder.inverse_transform(modelo.classes_)],
+        "arrays": sorted(arrays),
+        "versao_modelo": versao_modelo,
+    }
+
+    os.makedirs(diretorio, exist_ok=True)
+    for nome, valores in arrays.items():
+        np.save(os.path.join(diretorio, f"{nome}.npy"), np.ascontiguousarray(valores))
+    with open(os.path.join(diretorio, METADADOS_ARQUIVO), "w", encoding="utf-8") as arquivo:
+        json.dump(metadados, arquivo, ensure_ascii=False, indent=2)
+
+    tamanho_mb = sum(valores.nbytes for valores in arrays.values()) / 1024 ** 2
+    print(f"Modelo compacto ({tipo_modelo}, {len(arrays_modelo['raizes'])} árvores, {tamanho_mb:.1f} MB) salvo em: {diretorio}")
+    return diretorio
+
+
+def verificar(modelo_pipeline, diretorio=COMPACTO_DIR):
+    """Compara predict_proba do pipeline e do modelo compacto na base Gold inteira."""
+    modelo_compacto = ModeloCompacto.carregar(diretorio)
+    X = carregar_gold(colunas=modelo_compacto.colunas_entrada)
+
+    esperado = modelo_pipeline.predict_proba(X)
+    obtido = modelo_compacto.predict_proba(X)
+
+    diferenca = float(np.abs(esperado - obtido).max())
+    mesmas_classes = bool((esperado.argmax(axis=1) == obtido.argmax(axis=1)).all())
+    tolerancia = TOLERANCIA[modelo_compacto.tipo_modelo]
+
+    print(f"Verificação em {len(X)} linhas: diferença máxima = {diferenca:.3g}, "
+          f"classes previstas idênticas = {mesmas_classes}")
+    if diferenca > tolerancia or not mesmas_classes:
+        print(f"[ERRO] Modelo compacto diverge do pipeline (tolerância: {tolerancia}).")
+        return False
+    print("[SUCESSO] Modelo compacto reproduz o predict_proba do pipeline.")
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta o pipeline treinado para o formato compacto (NumPy).")
+    parser.add_argument("--modelo", default=MODEL_PATH, help="Caminho do pipeline treinado (.joblib).")
+    parser.add_argument("--label-encoder", default=LE_PATH, help="Caminho do label_encoder.joblib.")
+    parser.add_argument("--saida", default=COMPACTO_DIR, help="Pasta de saída do modelo compacto.")
+    parser.add_argument("--verificar", action="store_true",
+                        help="Compara o predict_proba com o pipeline original na base Gold.")
+    args = parser.parse_args(argv)
+
+    print("--- [1/2] Carregando artefatos e exportando... ---")
+    modelo_pipeline = joblib.load(args.modelo)
+    label_encoder = joblib.load(args.label_encoder)
+    exportar(modelo_pipeline, label_encoder, args.saida, versao_modelo=versao_artefato(args.modelo))
+
+    if args.verificar:
+        print("--- [2/2] Verificando contra o pipeline original... ---")
+        if not verificar(modelo_pipeline, args.saida):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
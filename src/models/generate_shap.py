@@ -1,114 +1,221 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+import json
+import time
+import argparse
 import joblib
 import shap
 import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # --- 1. SETUP: CARREGAMENTO DOS MODELOS E CAMINHOS ---
-print("--- [1/6] Iniciando script de geração SHAP... ---")
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
-DATA_PATH = os.path.join(project_root, "data", "processed", "obesity_gold.csv")
 MODELS_DIR = os.path.join(project_root, "models")
 REPORTS_DIR = os.path.join(project_root, "reports", "figures")
+SHAP_DIR = os.path.join(project_root, "reports", "shap")
 
-MODEL_PATH = os.path.join(MODELS_DIR, "random_forest_pipeline.joblib")
-LE_PATH = os.path.join(MODELS_DIR, "label_encoder.joblib")
 SHAP_BAR_PATH = os.path.join(REPORTS_DIR, 'shap_summary_bar.png')
 
-# --- 2. CARREGAR MODELO E LABEL ENCODER ---
-print("--- [2/6] Carregando artefatos (modelo e encoder)... ---")
-try:
-    modelo_pipeline = joblib.load(MODEL_PATH)
-    label_encoder = joblib.load(LE_PATH)
-except FileNotFoundError:
-    print("ERRO: Modelo ou Label Encoder não encontrados. Rode train_model.py primeiro.")
-    exit()
-
-# --- 3. CARREGAR E PREPARAR OS DADOS ---
-print("--- [3/6] Carregando e preparando dados... ---")
-df = pd.read_csv(DATA_PATH)
-
-TARGET = 'classe_peso_oms'
-y_encoded = label_encoder.transform(df[TARGET])
-
-features_de_leakage_e_intermediarias = [
-    'classe_peso_corporal',
-    'risco_alimentos_caloricos_num', 'risco_lanches_num', 
-    'risco_alcool_num', 'comportamento_saudavel'
-]
-
-X = df.drop(columns=[TARGET] + features_de_leakage_e_intermediarias)
-
-#Recria EXATAMENTE os mesmos splits de treino/teste
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y_encoded, test_size=0.2, random_state=42, stratify=y_encoded
-)
-
-# --- 4. CRIAR O EXPLICADOR SHAP ---
-#O SHAP (especialmente para Random Forest) funciona com o modelo
-#e os dados de *treino* (para aprender a "linha de base").
-print("--- [4/6] Desmontando pipeline e pré-processando dados... ---")
-try:
-    #Extrai as duas etapas do pipeline
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.models.componentes import TARGET, dividir_treino_teste
+from src.utils.cache_previsao import versao_artefato
+from src.utils.dados_gold import caminho_gold, ler_gold
+from src.utils.registro_modelos import caminhos_modelo_atual
+
+#Explica a versão do modelo em produção (registro de modelos)
+MODEL_PATH, LE_PATH = caminhos_modelo_atual()
+
+#Linhas por tarefa enviada aos processos
+TAMANHO_BLOCO = 256
+
+#Arquivos gravados em SHAP_DIR/<conjunto>/
+VALORES_ARQUIVO = "valores_shap.npy"        #(linhas x features x classes), float32
+PROGRESSO_ARQUIVO = "progresso.json"        #Metadados + blocos já calculados
+LINHAS_ARQUIVO = "linhas.npy"               #Posição de cada linha explicada na base Gold
+
+
+# --- Processos de cálculo: cada um cria o TreeExplainer uma única vez ---
+_explainer = None
+_valores = None
+
+
+def _iniciar_worker(caminho_modelo, caminho_valores):
+    global _explainer, _valores
+    model = joblib.load(caminho_modelo).named_steps['model']
+    _explainer = shap.TreeExplainer(model)
+    _valores = np.load(caminho_valores, mmap_mode="r+")
+
+
+def _calcular_bloco(numero_bloco, inicio, X_bloco):
+    """Calcula o SHAP de um bloco de linhas e grava direto no arquivo memory-mapped."""
+    valores_bloco = np.asarray(_explainer.shap_values(X_bloco), dtype=np.float32)
+    #Versões antigas do SHAP devolvem uma lista (uma matriz por classe)
+    if valores_bloco.ndim == 3 and valores_bloco.shape[0] != len(X_bloco):
+        valores_bloco = np.moveaxis(valores_bloco, 0, -1)
+    _valores[inicio:inicio + len(X_bloco)] = valores_bloco
+    _valores.flush()
+    return numero_bloco
+
+
+def _salvar_progresso(caminho, progresso):
+    """Grava o índice de progresso de forma atômica (arquivo temporário + rename)."""
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(progresso, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def calcular_valores_shap(X_processado, caminho_modelo, diretorio, metadados,
+                          tamanho_bloco=TAMANHO_BLOCO, n_jobs=None):
+    """
+    Calcula o TreeSHAP de todas as linhas em blocos, em paralelo, gravando o
+    tensor (linhas x features x classes) em `diretorio/valores_shap.npy`.
+    Blocos já concluídos de uma execução anterior com os mesmos metadados
+    (modelo, dados, conjunto, tamanho do bloco) não são recalculados.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    caminho_valores = os.path.join(diretorio, VALORES_ARQUIVO)
+    caminho_progresso = os.path.join(diretorio, PROGRESSO_ARQUIVO)
+    n_linhas = X_processado.shape[0]
+    forma = (n_linhas, X_processado.shape[1], len(metadados["classes"]))
+    metadados = {**metadados, "forma": list(forma), "tamanho_bloco": tamanho_bloco}
+
+    progresso = None
+    if os.path.exists(caminho_progresso) and os.path.exists(caminho_valores):
+        with open(caminho_progresso, encoding="utf-8") as arquivo:
+            progresso = json.load(arquivo)
+        if progresso["metadados"] != metadados:
+            print("Modelo, dados ou parâmetros mudaram: recalculando do zero.")
+            progresso = None
+    if progresso is None:
+        np.lib.format.open_memmap(caminho_valores, mode="w+", dtype=np.float32, shape=forma).flush()
+        progresso = {"metadados": metadados, "blocos_concluidos": []}
+        _salvar_progresso(caminho_progresso, progresso)
+
+    n_blocos = -(-n_linhas // tamanho_bloco)
+    concluidos = set(progresso["blocos_concluidos"])
+    pendentes = [b for b in range(n_blocos) if b not in concluidos]
+    print(f"{n_blocos} blocos de até {tamanho_bloco} linhas ({len(concluidos)} já calculados).")
+    if not pendentes:
+        return caminho_valores
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_iniciar_worker,
+                             initargs=(caminho_modelo, caminho_valores)) as executor:
+        tarefas = [
+            executor.submit(_calcular_bloco, b, b * tamanho_bloco,
+                            X_processado[b * tamanho_bloco:(b + 1) * tamanho_bloco])
+            for b in pendentes
+        ]
+        for tarefa in as_completed(tarefas):
+            concluidos.add(tarefa.result())
+            progresso["blocos_concluidos"] = sorted(concluidos)
+            _salvar_progresso(caminho_progresso, progresso)
+
+            #Vazão só dos blocos calculados nesta execução
+            feitos_agora = len(concluidos) - (n_blocos - len(pendentes))
+            linhas_s = feitos_agora * tamanho_bloco / max(time.perf_counter() - inicio, 1e-9)
+            print(f"Bloco {len(concluidos)}/{n_blocos} concluído ({linhas_s:,.0f} linhas/s)")
+    return caminho_valores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calcula os valores SHAP do modelo e gera o gráfico global.")
+    parser.add_argument("--completo", action="store_true",
+                        help="Explica toda a base Gold (padrão: só o conjunto de teste).")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO)
+    parser.add_argument("--n-jobs", type=int, default=None, help="Processos (padrão: todos os núcleos).")
+    args = parser.parse_args(argv)
+
+    print("--- [1/7] Iniciando script de geração SHAP... ---")
+
+    # --- 2. CARREGAR MODELO E LABEL ENCODER ---
+    print("--- [2/7] Carregando artefatos (modelo e encoder)... ---")
+    try:
+        modelo_pipeline = joblib.load(MODEL_PATH)
+        label_encoder = joblib.load(LE_PATH)
+    except FileNotFoundError:
+        print("ERRO: Modelo ou Label Encoder não encontrados. Rode train_model.py primeiro.")
+        exit()
+
+    # --- 3. CARREGAR E PREPARAR OS DADOS ---
+    print("--- [3/7] Carregando e preparando dados... ---")
+    caminho_dados = caminho_gold()
+    df = ler_gold(caminho_dados)
+    y_encoded = label_encoder.transform(df[TARGET])
+
+    #Usa exatamente as colunas com que o pipeline foi treinado
     preprocessor = modelo_pipeline.named_steps['preprocessor']
-    model = modelo_pipeline.named_steps['model']
-    
-    #Transforma os dados brutos (com texto) em dados numéricos
-    X_train_processed = preprocessor.transform(X_train)
-    X_test_processed = preprocessor.transform(X_test)
-    
+    X = df[list(preprocessor.feature_names_in_)]
+
+    if args.completo:
+        conjunto, X_explicar = "completo", X
+    else:
+        #Recria EXATAMENTE os mesmos splits de treino/teste
+        _, X_test, _, _ = dividir_treino_teste(X, y_encoded)
+        conjunto, X_explicar = "teste", X_test
+
+    # --- 4. PRÉ-PROCESSAR OS DADOS ---
+    print(f"--- [4/7] Pré-processando {len(X_explicar)} linhas ({conjunto})... ---")
+    X_processado = np.ascontiguousarray(preprocessor.transform(X_explicar), dtype=np.float64)
+
     #Pega os nomes das features FINAIS (ex: 'cat__genero_Female')
     #Isso é crucial para o gráfico SHAP
     feature_names = preprocessor.get_feature_names_out()
-    
-    # Converte os arrays numéricos de volta para DataFrames com os nomes corretos
-    X_train_processed_df = pd.DataFrame(X_train_processed, columns=feature_names)
-    X_test_processed_df = pd.DataFrame(X_test_processed, columns=feature_names)
-    
-    print("Dados pré-processados com sucesso para o SHAP.")
-
-except Exception as e:
-    print(f"ERRO ao desmontar o pipeline: {e}")
-    print("Verifique se os passos do seu pipeline se chamam 'preprocessor' e 'model'.")
-    exit()
-
-# --- 5. CALCULAR OS VALORES SHAP ---
-#Agora calculamos as "explicações" para o conjunto de *teste*
-# --- 5. CALCULAR OS VALORES SHAP --- #Agora calculamos as "explicações" para o conjunto de *teste* 
-print("--- [5/6] Criando o explicador SHAP (TreeExplainer)... ---") 
-explainer = shap.TreeExplainer(model) 
-
-# --- 6. CALCULAR OS VALORES SHAP --- 
-#Calculamos os valores SHAP nos dados de teste PRÉ-PROCESSADOS 
-print("--- [6/6] Calculando valores SHAP (Isso pode ser demorado)... ---") 
-shap_values = explainer.shap_values(X_test_processed_df)
-
-# --- 7. GERAR E SALVAR O GRÁFICO DE BARRAS ---
-print(f"--- [7/7] Salvando gráfico de barras SHAP em {SHAP_BAR_PATH}... ---")
-
-plt.figure() 
-shap.summary_plot( 
-    shap_values, 
-    X_test_processed_df,
-    plot_type="bar", 
-    class_names=label_encoder.classes_, 
-    show=False )
-
-plt.title("Importância Global das Features (Impacto Médio no Modelo)")
-plt.xlabel("Contribuição Média (Valor SHAP)")
-
-plt.tight_layout() 
-
-
-#Adição de 'bbox_inches' e 'pad_inches'
-plt.savefig(
-    SHAP_BAR_PATH, 
-    bbox_inches='tight', #Garante que os labels (ex: num_idade) não sejam cortados
-    pad_inches=0.3       #Adiciona uma margem de 0.3 polegadas
-)
-
-plt.close()
-
-print("--- Script SHAP finalizado com sucesso! ---")
\ No newline at end of file
+
+    # --- 5. CALCULAR OS VALORES SHAP (EM BLOCOS, EM PARALELO) ---
+    print("--- [5/7] Calculando valores SHAP em blocos (TreeExplainer por processo)... ---")
+    diretorio = os.path.join(SHAP_DIR, conjunto)
+    metadados = {
+        "conjunto": conjunto,
+        "versao_modelo": versao_artefato(MODEL_PATH),
+        "versao_dados": versao_artefato(caminho_dados),
+        "features": [str(f) for f in feature_names],
+        "classes": [str(c) for c in label_encoder.inverse_transform(modelo_pipeline.classes_)],
+    }
+    caminho_valores = calcular_valores_shap(X_processado, MODEL_PATH, diretorio, metadados,
+                                            args.tamanho_bloco, args.n_jobs)
+    np.save(os.path.join(diretorio, LINHAS_ARQUIVO), X.index.get_indexer(X_explicar.index))
+    print(f"Valores SHAP salvos em: {caminho_valores}")
+
+    # --- 6. CARREGAR OS VALORES SALVOS ---
+    print("--- [6/7] Lendo os valores SHAP salvos (mmap)... ---")
+    valores = np.load(caminho_valores, mmap_mode="r")
+    X_processado_df = pd.DataFrame(X_processado, columns=feature_names)
+
+    # --- 7. GERAR E SALVAR O GRÁFICO DE BARRAS ---
+    print(f"--- [7/7] Salvando gráfico de barras SHAP em {SHAP_BAR_PATH}... ---")
+
+    plt.figure()
+    shap.summary_plot(
+        [np.asarray(valores[:, :, k]) for k in range(valores.shape[2])],
+        X_processado_df,
+        plot_type="bar",
+        class_names=metadados["classes"],
+        show=False )
+
+    plt.title("Importância Global das Features (Impacto Médio no Modelo)")
+    plt.xlabel("Contribuição Média (Valor SHAP)")
+
+    plt.tight_layout()
+
+
+    #Adição de 'bbox_inches' e 'pad_inches'
+    plt.savefig(
+        SHAP_BAR_PATH,
+        bbox_inches='tight', #Garante que os labels (ex: num_idade) não sejam cortados
+        pad_inches=0.3       #Adiciona uma margem de 0.3 polegadas
+    )
+
+    plt.close()
+
+    print("--- Script SHAP finalizado com sucesso! ---")
+
+
+if __name__ == "__main__":
+    main()
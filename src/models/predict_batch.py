@@ -0,0 +1,175 @@
+# src/models/predict_batch.py
+"""
+Previsão em lote (sem Streamlit) para listas de pacientes.
+
+Lê um arquivo CSV ou Parquet com as respostas do formulário (mesmas chaves
+usadas em sistema_preditivo.run(), uma linha por paciente) em blocos de
+tamanho fixo, aplica a engenharia de features e o modelo (classe prevista,
+nível de risco, top-k e probabilidades, ver src/utils/pontuacao.py) e grava
+o resultado bloco a bloco. A memória usada depende apenas do
+tamanho do bloco, não do tamanho do arquivo.
+
+Uso:
+    python src/models/predict_batch.py entrada.csv saida.csv
+    python src/models/predict_batch.py entrada.parquet saida.parquet --tamanho-bloco 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import pandas as pd
+
+# --- Definição de Caminhos ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+MODELS_DIR = os.path.join(project_root, "models")
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.features.engenharia import preparar_colunas_para_previsao
+from src.utils.pontuacao import Pontuador
+from src.utils.registro_modelos import caminhos_modelo_atual
+
+#Modelo padrão: versão ativa do registro (src/utils/registro_modelos.py)
+MODEL_PATH, LE_PATH = caminhos_modelo_atual()
+
+TAMANHO_BLOCO_PADRAO = 50_000
+
+
+def _formato(caminho):
+    """Identifica o formato do arquivo pela extensão ('csv' ou 'parquet')."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == ".csv":
+        return "csv"
+    if extensao in (".parquet", ".pq"):
+        return "parquet"
+    raise ValueError(f"Formato não suportado: '{extensao}'. Use .csv ou .parquet.")
+
+
+def ler_em_blocos(caminho, tamanho_bloco):
+    """Gera DataFrames de até `tamanho_bloco` linhas, sem carregar o arquivo inteiro."""
+    if _formato(caminho) == "csv":
+        yield from pd.read_csv(caminho, chunksize=tamanho_bloco)
+    else:
+        import pyarrow.parquet as pq
+
+        arquivo = pq.ParquetFile(caminho)
+        for lote in arquivo.iter_batches(batch_size=tamanho_bloco):
+            yield lote.to_pandas()
+
+
+class EscritorIncremental:
+    """Grava os blocos de resultado no arquivo de saída à medida que ficam prontos."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.formato = _formato(caminho)
+        self._escritor_parquet = None
+        self._schema = None
+        self._primeiro_bloco = True
+
+    def escrever(self, df):
+        if self.formato == "csv":
+            df.to_csv(
+                self.caminho,
+                mode="w" if self._primeiro_bloco else "a",
+                header=self._primeiro_bloco,
+                index=False,
+            )
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._escritor_parquet is None:
+                tabela = pa.Table.from_pandas(df, preserve_index=False)
+                self._schema = tabela.schema
+                self._escritor_parquet = pq.ParquetWriter(self.caminho, self._schema)
+            else:
+                #Mantém o schema do primeiro bloco (ex.: coluna toda vazia em um bloco)
+                tabela = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            self._escritor_parquet.write_table(tabela)
+        self._primeiro_bloco = False
+
+    def fechar(self):
+        if self._escritor_parquet is not None:
+            self._escritor_parquet.close()
+
+
+def prever_bloco(df_bloco, pontuador, incluir_probabilidades=True):
+    """
+    Executa engenharia de features + modelo em um bloco de pacientes.
+    O predict_proba é chamado uma única vez (src/utils/pontuacao.py); a classe
+    prevista é o argmax das probabilidades (mesmo resultado do predict), com
+    o nível de risco e as classes mais prováveis de cada paciente.
+    """
+    #Features como dicionário de arrays, direto para o esquema compilado do modelo
+    colunas_features = preparar_colunas_para_previsao(df_bloco)
+    pontuacao = pontuador.pontuar(colunas_features, indice=df_bloco.index)
+    return df_bloco.join(pontuacao.para_dataframe(incluir_probabilidades))
+
+
+def executar(caminho_entrada, caminho_saida, caminho_modelo=MODEL_PATH, caminho_le=LE_PATH,
+             tamanho_bloco=TAMANHO_BLOCO_PADRAO, incluir_probabilidades=True):
+    """Roda a previsão em lote e retorna (total de linhas, segundos)."""
+    print("--- [1/3] Carregando artefatos (modelo e encoder)... ---")
+    modelo_pipeline = joblib.load(caminho_modelo)
+    label_encoder = joblib.load(caminho_le)
+    pontuador = Pontuador.do_pipeline(modelo_pipeline, label_encoder)
+    print(f"Modelo carregado de: {caminho_modelo}")
+
+    print(f"--- [2/3] Processando {caminho_entrada} em blocos de {tamanho_bloco} linhas... ---")
+    escritor = EscritorIncremental(caminho_saida)
+    total_linhas = 0
+    inicio = time.perf_counter()
+    try:
+        for numero_bloco, df_bloco in enumerate(ler_em_blocos(caminho_entrada, tamanho_bloco), start=1):
+            inicio_bloco = time.perf_counter()
+            resultado = prever_bloco(df_bloco, pontuador, incluir_probabilidades)
+            escritor.escrever(resultado)
+
+            duracao_bloco = time.perf_counter() - inicio_bloco
+            total_linhas += len(df_bloco)
+            print(
+                f"Bloco {numero_bloco}: {len(df_bloco)} linhas em {duracao_bloco:.2f}s "
+                f"({len(df_bloco) / max(duracao_bloco, 1e-9):,.0f} linhas/s) "
+                f"- acumulado: {total_linhas} linhas"
+            )
+    finally:
+        escritor.fechar()
+    duracao = time.perf_counter() - inicio
+
+    print(f"--- [3/3] Resultado salvo em: {caminho_saida} ---")
+    print(
+        f"Total: {total_linhas} linhas em {duracao:.2f}s "
+        f"({total_linhas / max(duracao, 1e-9):,.0f} linhas/s)"
+    )
+    return total_linhas, duracao
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Previsão de nível de obesidade em lote (CSV/Parquet).")
+    parser.add_argument("entrada", help="Arquivo .csv ou .parquet com as respostas do formulário.")
+    parser.add_argument("saida", help="Arquivo .csv ou .parquet de saída.")
+    parser.add_argument("--modelo", default=MODEL_PATH, help="Caminho do pipeline treinado (.joblib).")
+    parser.add_argument("--label-encoder", default=LE_PATH, help="Caminho do label_encoder.joblib.")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO_PADRAO,
+                        help="Linhas por bloco (define o pico de memória).")
+    parser.add_argument("--sem-probabilidades", action="store_true",
+                        help="Grava apenas a classe prevista, o nível de risco e o top-k, sem as colunas prob_<classe>.")
+    args = parser.parse_args(argv)
+
+    executar(
+        args.entrada,
+        args.saida,
+        caminho_modelo=args.modelo,
+        caminho_le=args.label_encoder,
+        tamanho_bloco=args.tamanho_bloco,
+        incluir_probabilidades=not args.sem_probabilidades,
+    )
+
+
+if __name__ == "__main__":
+    main()
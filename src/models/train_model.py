@@ -2,291 +2,395 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+import time
+import argparse
 import joblib  #Para salvar o modelo final (ex: .joblib)
+from joblib import Parallel, delayed
 import matplotlib.pyplot as plt
 import seaborn as sns
 
 #Ferramentas de Pipeline e Pré-processamento
-from sklearn.preprocessing import StandardScaler, OneHotEncoder, LabelEncoder
-from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import LabelEncoder
 from sklearn.pipeline import Pipeline
+from sklearn.base import clone
 
 #Ferramentas de Modelagem e Avaliação
-from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
-#Modelos que Vamos Comparar
-from sklearn.ensemble import RandomForestClassifier
-from xgboost import XGBClassifier
-
-print("--- [1/9] Script de treinamento iniciado. ---")
-
 # --- Definição de Caminhos ---
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
-DATA_PATH = os.path.join(project_root, "data", "processed", "obesity_gold.csv")
 MODELS_DIR = os.path.join(project_root, "models")
 REPORTS_DIR = os.path.join(project_root, "reports", "figures")
+ETAPAS_DIR = os.path.join(project_root, ".cache", "treino")
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+#Alvo, features, pré-processador e modelos compartilhados com a busca de hiperparâmetros
+from src.models import componentes
+from src.models.componentes import (TARGET, separar_features, dividir_treino_teste, gerar_folds,
+                                    criar_preprocessador, preprocessar_fold, criar_modelo)
+from src.models.etapas import ExecutorEtapas
+from src.models.tune_model import configuracoes_ajustadas
+from src.utils.cache_previsao import versao_artefato
+from src.utils.dados_gold import caminho_gold, ler_gold
+from src.utils.registro_modelos import registrar
+from src.features import engenharia
+from src.features.engenharia import verificar_features_gold
+
+#Processos usados na validação cruzada (-1 = todos os núcleos)
+N_JOBS = int(os.getenv("N_JOBS", "-1"))
+
+plt.style.use('dark_background')
+cor_fundo = '#0E1117'
 
-#Garante que as pastas de saída existam
-os.makedirs(MODELS_DIR, exist_ok=True)
-os.makedirs(REPORTS_DIR, exist_ok=True)
 
 # --- Bloco 2: Carga e Definição de Features ---
-print(f"--- [2/9] Carregando dados de {DATA_PATH}... ---")
-try:
-    df = pd.read_csv(DATA_PATH)
-except FileNotFoundError:
-    print(f"ERRO CRÍTICO: Arquivo de dados não encontrado em {DATA_PATH}")
-    print("Por favor, execute o notebook create_gold.ipynb primeiro.")
-    exit()
-
-TARGET = 'classe_peso_oms'
-
-# --- Codificando o alvo (y) ---
-print(f"Codificando o alvo (y): {TARGET}...")
-
-#1. Preparar o LabelEncoder
-le = LabelEncoder()
-
-#2. Treinar o encoder no alvo (y) e transformá-lo em números
-y_encoded = le.fit_transform(df[TARGET])
-
-#3. Salvar o LabelEncoder (o "mapa de tradução") na pasta models/
-#Isso será útil para usar no Streamlit depois
-le_path = os.path.join(MODELS_DIR, "label_encoder.joblib")
-joblib.dump(le, le_path)
-print(f"LabelEncoder (mapa de tradução) salvo em: {le_path}")
-
-#Definição das colunas que "vazam" a resposta
-features_de_leakage = [
-    'classe_peso_corporal', #Alvo original falho
-    'IMC',
-    'peso_kg',
-    'altura_m',
-    'risco_alimentos_caloricos_num',
-    'risco_lanches_num',
-    'risco_alcool_num',
-    'comportamento_saudavel'
-]
-
-#X são as features
-X = df.drop(columns=[TARGET] + features_de_leakage)
-
-print(f"Alvo (y) definido como: {TARGET}")
-print(f"Features de treinamento (X): {list(X.columns)}")
+def etapa_dados(caminho_dados, versao_dados, caminho_le):
+    print(f"--- [2/9] Carregando dados de {caminho_dados}... ---")
+    df = ler_gold(caminho_dados)
+
+    #Os índices gravados na Gold precisam bater com os calculados pelo app
+    verificar_features_gold(df)
+
+    # --- Codificando o alvo (y) ---
+    print(f"Codificando o alvo (y): {TARGET}...")
+
+    #1. Preparar o LabelEncoder
+    le = LabelEncoder()
+
+    #2. Treinar o encoder no alvo (y) e transformá-lo em números
+    y_encoded = le.fit_transform(df[TARGET])
+
+    #3. Salvar o LabelEncoder (o "mapa de tradução") na pasta models/
+    #Isso será útil para usar no Streamlit depois
+    joblib.dump(le, caminho_le)
+    print(f"LabelEncoder (mapa de tradução) salvo em: {caminho_le}")
+
+    #X são as features (sem o alvo e sem as colunas que "vazam" a resposta)
+    X = separar_features(df)
+
+    print(f"Alvo (y) definido como: {TARGET}")
+    print(f"Features de treinamento (X): {list(X.columns)}")
+    return {"X": X, "y": y_encoded, "nomes_classes": le.classes_}
+
 
 # --- Bloco 3: Divisão Treino/Teste ---
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y_encoded, 
-    test_size=0.2,
-    random_state=42,
-    stratify=y_encoded
-)
-print(f"--- [3/9] Dados divididos: {len(y_train)} para treino/validação, {len(y_test)} para teste final. ---")
+def etapa_divisao(dados):
+    X_train, X_test, y_train, y_test = dividir_treino_teste(dados["X"], dados["y"])
+    print(f"--- [3/9] Dados divididos: {len(y_train)} para treino/validação, {len(y_test)} para teste final. ---")
+    return {"X_train": X_train, "X_test": X_test, "y_train": y_train, "y_test": y_test}
+
 
 # --- Bloco 4: Pipeline de Pré-processamento ---
-print("--- [4/9] Definindo o pipeline de pré-processamento... ---")
-
-#1. Identifica quais colunas são numéricas e quais são categóricas
-colunas_numericas = X_train.select_dtypes(include=np.number).columns
-colunas_categoricas = X_train.select_dtypes(include='object').columns
-
-print(f"Colunas numéricas: {list(colunas_numericas)}")
-print(f"Colunas categóricas: {list(colunas_categoricas)}")
-
-#2. Cria o transformador para colunas NUMÉRICAS
-numeric_transformer = Pipeline(steps=[
-    ('scaler', StandardScaler())
-])
-
-#3. Cria o transformador para colunas CATEGÓRICAS
-categorical_transformer = Pipeline(steps=[
-    ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
-    # handle_unknown='ignore' evita erros se o modelo vir um valor novo
-])
-
-#4. Cria o "Gerente" (ColumnTransformer)
-preprocessor = ColumnTransformer(
-    transformers=[
-        ('num', numeric_transformer, colunas_numericas),
-        ('cat', categorical_transformer, colunas_categoricas)
-    ],
-    remainder='passthrough' 
-)
+def etapa_preprocessador(divisao):
+    print("--- [4/9] Definindo o pipeline de pré-processamento... ---")
+
+    #Numéricas -> StandardScaler, categóricas -> OneHotEncoder (ver src/models/componentes.py)
+    preprocessor = criar_preprocessador(divisao["X_train"])
+
+    print(f"Colunas numéricas: {list(preprocessor.transformers[0][2])}")
+    print(f"Colunas categóricas: {list(preprocessor.transformers[1][2])}")
+    return preprocessor
+
 
 # --- Bloco 5: Validação Cruzada (Comparando Modelos) ---
-print("--- [5/9] Iniciando Validação Cruzada (K-Fold)... ---")
+def avaliar_fold(nome, modelo, numero_fold, X_tr, y_tr, X_val, y_val):
+    """Treina um modelo em um fold e devolve acurácia, tempo e o modelo ajustado."""
+    inicio = time.perf_counter()
+    modelo = clone(modelo)
+    #Cada processo usa 1 thread: o paralelismo já vem dos folds x modelos
+    if 'n_jobs' in modelo.get_params():
+        modelo.set_params(n_jobs=1)
+    modelo.fit(X_tr, y_tr)
+    acuracia = accuracy_score(y_val, modelo.predict(X_val))
+    return nome, numero_fold, acuracia, time.perf_counter() - inicio, modelo
+
+
+def etapa_validacao_cruzada(divisao, preprocessor, parametros_ajustados):
+    print("--- [5/9] Iniciando Validação Cruzada (K-Fold)... ---")
+    X_train, y_train = divisao["X_train"], divisao["y_train"]
+
+    #Modelos candidatos (o pipeline completo é montado só para o vencedor)
+    modelos = {}
+    for nome in ["Random Forest", "XGBoost"]:
+        modelos[nome] = criar_modelo(nome, **parametros_ajustados.get(nome, {}))
+        origem = f"ajustados {parametros_ajustados[nome]}" if nome in parametros_ajustados else "padrão"
+        print(f"{nome}: parâmetros {origem}")
+
+    #Mesmos 5 folds que o cross_val_score(cv=5) usaria para um classificador
+    folds = gerar_folds(X_train, y_train)
+
+    inicio_cv = time.perf_counter()
+
+    #1. Pré-processamento de cada fold (em paralelo, com cache)
+    dados_folds = Parallel(n_jobs=N_JOBS)(
+        delayed(preprocessar_fold)(preprocessor, X_train, idx_treino, idx_validacao)
+        for idx_treino, idx_validacao in folds
+    )
+
+    #2. Folds x modelos distribuídos em um pool de processos
+    execucoes = Parallel(n_jobs=N_JOBS)(
+        delayed(avaliar_fold)(nome, modelo, i, X_tr, y_train[idx_treino], X_val, y_train[idx_validacao])
+        for nome, modelo in modelos.items()
+        for i, ((idx_treino, idx_validacao), (X_tr, X_val)) in enumerate(zip(folds, dados_folds))
+    )
+    print(f"Validação cruzada concluída em {time.perf_counter() - inicio_cv:.1f}s (relógio).")
+
+    #Organiza os resultados por modelo
+    resultados = {}
+    tempos = {}
+    modelos_por_fold = {}
+    for nome, numero_fold, acuracia, duracao, modelo_fold in execucoes:
+        resultados.setdefault(nome, []).append(acuracia)
+        tempos.setdefault(nome, []).append(duracao)
+        modelos_por_fold.setdefault(nome, {})[numero_fold] = modelo_fold
+
+    print("\n--- Tempo por Fold (segundos) ---")
+    for nome in modelos:
+        tempos_fold = " | ".join(f"fold {i + 1}: {t:.2f}" for i, t in enumerate(tempos[nome]))
+        print(f"{nome}: {tempos_fold} | total: {sum(tempos[nome]):.2f}")
+
+    resultados = {nome: np.mean(scores) for nome, scores in resultados.items()}
+
+    print("\n--- Resultados da Validação Cruzada (Acurácia Média) ---")
+    for nome, media in resultados.items():
+        print(f"{nome}: {media * 100:.2f}%")
+
+    #Visualizando o modelo que retornou o melhor resultado
+    modelo_vencedor_nome = max(resultados, key=resultados.get)
+
+    print(f"\nModelo com melhor desempenho é: {modelo_vencedor_nome}")
+
+    #Reaproveita os modelos já ajustados nos folds do vencedor: previsões fora
+    #da amostra (out-of-fold) de todo o treino, sem treinar nada de novo
+    y_oof = np.empty_like(y_train)
+    for i, (idx_treino, idx_validacao) in enumerate(folds):
+        y_oof[idx_validacao] = modelos_por_fold[modelo_vencedor_nome][i].predict(dados_folds[i][1])
+    print(f"Acurácia out-of-fold do {modelo_vencedor_nome}: {accuracy_score(y_train, y_oof) * 100:.2f}%")
+
+    return {
+        "resultados": resultados,
+        "tempos": tempos,
+        "vencedor": modelo_vencedor_nome,
+        "modelo_vencedor": modelos[modelo_vencedor_nome],
+    }
 
-#Criação dos pipelines completos
-pipeline_rf = Pipeline(steps=[('preprocessor', preprocessor),
-                              ('model', RandomForestClassifier(random_state=42))])
 
-pipeline_xgb = Pipeline(steps=[('preprocessor', preprocessor),
-                               ('model', XGBClassifier(use_label_encoder=False, 
-                                                        eval_metric='mlogloss', 
-                                                        random_state=42))])
+# --- Bloco 6: Treinamento Final do Modelo escolhido ---
+def etapa_treino_final(divisao, preprocessor, validacao, caminho_modelo):
+    modelo_vencedor_nome = validacao["vencedor"]
+    print(f"\n--- [6/9] Treinando o modelo com melhor desempenho ({modelo_vencedor_nome}) nos 80% de dados... ---")
 
-#Dicionário de modelos para testar
-modelos = {
-    "Random Forest": pipeline_rf,
-    "XGBoost": pipeline_xgb
-}
+    modelo_vencedor_pipeline = Pipeline(steps=[('preprocessor', preprocessor),
+                                               ('model', validacao["modelo_vencedor"])])
+    modelo_vencedor_pipeline.fit(divisao["X_train"], divisao["y_train"])
 
-#Executação da validação cruzada
-resultados = {}
-for nome, modelo in modelos.items():
-    print(f"Validando {nome}...")
-    # cv=5 significa 5 Folds (5 "simulados")
-    scores = cross_val_score(modelo, X_train, y_train, cv=5, scoring='accuracy')
-    resultados[nome] = scores.mean()
+    print("Modelo final treinado com sucesso.")
 
-print("\n--- Resultados da Validação Cruzada (Acurácia Média) ---")
-for nome, media in resultados.items():
-    print(f"{nome}: {media * 100:.2f}%")
+    #Salvar o Modelo (Pipeline Completo)
+    joblib.dump(modelo_vencedor_pipeline, caminho_modelo)
+    print(f"Modelo (pipeline completo) salvo em: {caminho_modelo}")
+    print()
+    return modelo_vencedor_pipeline
 
-#Visualizando o modelo que retornou o melhor resultado
-modelo_vencedor_nome = max(resultados, key=resultados.get)
-modelo_vencedor_pipeline = modelos[modelo_vencedor_nome]
 
-print(f"\nModelo com melhor desempenho é: {modelo_vencedor_nome}")
+# --- Bloco 7: Avaliação Final ---
+def etapa_avaliacao(divisao, modelo_vencedor_pipeline):
+    print(f"--- [7/9] Avaliando o modelo final nos 20% de dados de teste... ---")
+    y_test = divisao["y_test"]
 
-# --- Bloco 6: Treinamento Final do Modelo escolhido ---
-print(f"\n--- [6/9] Treinando o modelo com melhor desempenho ({modelo_vencedor_nome}) nos 80% de dados... ---")
+    #Fazer previsões nos dados de teste
+    y_pred_final = modelo_vencedor_pipeline.predict(divisao["X_test"])
 
-#Nota: modelo_vencedor_pipeline já é o pipeline_rf, 
-modelo_vencedor_pipeline.fit(X_train, y_train)
+    #Gerando as métricas (Precision, Recall, F1-Score)
+    acuracia_final = accuracy_score(y_test, y_pred_final)
+    reporte_final = classification_report(y_test, y_pred_final)
 
-print("Modelo final treinado com sucesso.")
-print()
+    print("\n--- RESULTADO FINAL (NA BASE DE TESTE) ---")
+    print(f"Acurácia Final: {acuracia_final * 100:.2f}%")
+    print(f"\nRelatório de Classificação Final:\n{reporte_final}")
 
-# --- Bloco 7: Avaliação Final ---
-print(f"--- [7/9] Avaliando o modelo final nos 20% de dados de teste... ---")
+    #Verificar se atingiu o requisito
+    if acuracia_final >= 0.75:
+        print("STATUS: SUCESSO! A acurácia final atende aos requisitos do projeto (>= 75%).")
+    else:
+        print("STATUS: ATENÇÃO! A acurácia final ficou abaixo dos 75%.")
+    return {"y_test": y_test, "y_pred_final": y_pred_final, "acuracia_final": acuracia_final}
 
-#Fazer previsões nos dados de teste
-y_pred_final = modelo_vencedor_pipeline.predict(X_test)
 
-#Gerando as métricas (Precision, Recall, F1-Score)
-acuracia_final = accuracy_score(y_test, y_pred_final)
-reporte_final = classification_report(y_test, y_pred_final)
+# --- Bloco 8: Salvar Artefatos Finais (Matriz de Confusão) ---
+def etapa_matriz_confusao(avaliacao, dados, caminho_figura):
+    print(f"--- [8/9] Salvando artefatos... ---")
 
-print("\n--- RESULTADO FINAL (NA BASE DE TESTE) ---")
-print(f"Acurácia Final: {acuracia_final * 100:.2f}%")
-print(f"\nRelatório de Classificação Final:\n{reporte_final}")
+    print("Salvando gráfico da Matriz de Confusão...")
+    cm = confusion_matrix(avaliacao["y_test"], avaliacao["y_pred_final"])
 
-#Verificar se atingiu o requisito
-if acuracia_final >= 0.75:
-    print("STATUS: SUCESSO! A acurácia final atende aos requisitos do projeto (>= 75%).")
-else:
-    print("STATUS: ATENÇÃO! A acurácia final ficou abaixo dos 75%.")
+    #Mapeando os nomes das classes (ex: 'Sobrepeso') e não os números (ex: 5)
+    #Através do LabelEncoder
+    nomes_classes = dados["nomes_classes"]
 
-# --- Bloco 8: Salvar Artefatos Finais ---
-print(f"--- [8/9] Salvando artefatos... ---")
+    fig, ax = plt.subplots(figsize=(12, 8))
+    fig.patch.set_facecolor(cor_fundo)
+    ax.set_facecolor(cor_fundo)
 
-plt.style.use('dark_background')
-cor_fundo = '#0E1117'
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
+                xticklabels=nomes_classes,
+                yticklabels=nomes_classes,
+                linewidths=0.5, linecolor=cor_fundo)
+
+    plt.title('Matriz de Confusão - Desempenho no Teste Final', color='white', fontsize=14)
+    plt.ylabel('Classe Verdadeira', color='white')
+    plt.xlabel('Classe Prevista', color='white')
+    plt.xticks(color='white')
+    plt.yticks(color='white')
+    plt.tight_layout() #Ajusta o layout para não cortar os nomes
 
-#1. Salvando a Matriz de Confusão
-print("Salvando gráfico da Matriz de Confusão...")
-cm = confusion_matrix(y_test, y_pred_final)
+    plt.savefig(caminho_figura, dpi=300, facecolor=fig.get_facecolor())
+    plt.close()
+    print(f"Matriz de Confusão salva em: {caminho_figura}")
+
+
+# --- Bloco 9: Salvar o Relatório de Classificação como Imagem ---
+def etapa_relatorio(avaliacao, dados, caminho_figura):
+    print("--- [9/9] Salvando Relatório de Classificação como imagem... ---")
+
+    #1. Gera o relatório como um DICIONÁRIO
+    report_dict = classification_report(
+        avaliacao["y_test"],
+        avaliacao["y_pred_final"],
+        target_names=dados["nomes_classes"], #Para usar os nomes (ex: 'Sobrepeso')
+        output_dict=True
+    )
+
+    #2. Carrega o dicionário em um DataFrame do Pandas
+    report_df = pd.DataFrame(report_dict).transpose()
+
+    #3. Removendo as linhas de 'accuracy' e 'support' para focar apenas nas métricas por classe.
+    report_df_plot = report_df.drop(['accuracy']) #Remove a linha de acurácia total
+    report_df_plot = report_df_plot.drop(columns=['support']) #Remove a coluna de contagem
+
+    #4. Criar o Heatmap
+    fig, ax = plt.subplots(figsize=(12, 8))
+    fig.patch.set_facecolor(cor_fundo)
+    ax.set_facecolor(cor_fundo)
+
+    sns.heatmap(
+        report_df_plot,
+        annot=True,     #Escreve os números (ex: 0.77)
+        fmt='.2f',      #Formata com 2 casas decimais
+        cmap='Blues',   #Mesma paleta da Matriz de Confusão
+        cbar=False,     #Opcional: remove a barra de cor latera
+        linewidths=0.5,
+        linecolor=cor_fundo
+    )
+
+    plt.title('Relatório de Classificação Final (Heatmap)', color='white', fontsize=14)
+    plt.xlabel('Métricas', color='white')
+    plt.ylabel('Classes', color='white')
+    plt.xticks(color='white')
+    plt.yticks(color='white', rotation=0)
+    plt.tight_layout()
+
+    #5. Salvar a imagem
+    plt.savefig(caminho_figura, dpi=300, facecolor=fig.get_facecolor())
+    plt.close()#Fecha para limpar memória
+
+    print(f"Relatório de Classificação salvo em: {caminho_figura}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Treina e avalia o modelo de classificação de peso.")
+    parser.add_argument("--forcar", action="store_true",
+                        help="Ignora o cache de etapas e refaz todo o treinamento.")
+    parser.add_argument("--ativar", action="store_true",
+                        help="Coloca a versão registrada em produção (app e serviço trocam para ela).")
+    args = parser.parse_args(argv)
+
+    print("--- [1/9] Script de treinamento iniciado. ---")
+
+    #Garante que as pastas de saída existam
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+
+    #Base Gold em Parquet (tipada) ou, na falta dele, o CSV
+    DATA_PATH = caminho_gold()
+    if not os.path.exists(DATA_PATH):
+        print(f"ERRO CRÍTICO: Arquivo de dados não encontrado em {DATA_PATH}")
+        print("Por favor, execute o notebook create_gold.ipynb primeiro.")
+        exit()
+
+    #Cada etapa só roda de novo se o seu código, parâmetros ou entradas mudarem
+    #(impressão digital em .cache/treino; ver src/models/etapas.py)
+    inicio = time.perf_counter()
+    versao_dados = versao_artefato(DATA_PATH)
+    etapas = ExecutorEtapas(ETAPAS_DIR, forcar=args.forcar)
 
-#Mapeando os nomes das classes (ex: 'Sobrepeso') e não os números (ex: 5)
-#Através do LabelEncoder
-try:
     le_path = os.path.join(MODELS_DIR, "label_encoder.joblib")
+    dados = etapas.executar(
+        "dados", etapa_dados, codigo=[componentes, engenharia], arquivos=[le_path],
+        parametros={"caminho_dados": DATA_PATH, "versao_dados": versao_dados, "caminho_le": le_path},
+    )
+    divisao = etapas.executar("divisao", etapa_divisao, dependencias={"dados": dados}, codigo=[componentes])
+    preprocessor = etapas.executar("preprocessador", etapa_preprocessador,
+                                   dependencias={"divisao": divisao}, codigo=[componentes])
+
+    #Configurações escolhidas pela busca de hiperparâmetros (src/models/tune_model.py),
+    #se o leaderboard existir para esta versão dos dados; senão, parâmetros padrão
+    validacao = etapas.executar(
+        "validacao_cruzada", etapa_validacao_cruzada, codigo=[componentes, avaliar_fold],
+        dependencias={"divisao": divisao, "preprocessor": preprocessor},
+        parametros={"parametros_ajustados": configuracoes_ajustadas(versao_dados=versao_dados)},
+    )
+
+    modelo_vencedor_nome = validacao.valor["vencedor"]
+    modelo_final_path = os.path.join(MODELS_DIR, f"{modelo_vencedor_nome.lower().replace(' ', '_')}_pipeline.joblib")
+    modelo_final = etapas.executar(
+        "treino_final", etapa_treino_final, arquivos=[modelo_final_path],
+        dependencias={"divisao": divisao, "preprocessor": preprocessor, "validacao": validacao},
+        parametros={"caminho_modelo": modelo_final_path},
+    )
+    avaliacao = etapas.executar("avaliacao", etapa_avaliacao,
+                                dependencias={"divisao": divisao, "modelo_vencedor_pipeline": modelo_final})
+
+    cm_path = os.path.join(REPORTS_DIR, 'matriz_confusao_final.png')
+    etapas.executar("matriz_confusao", etapa_matriz_confusao, arquivos=[cm_path],
+                    dependencias={"avaliacao": avaliacao, "dados": dados},
+                    parametros={"caminho_figura": cm_path})
+
+    report_img_path = os.path.join(REPORTS_DIR, 'classification_report_final.png')
+    etapas.executar("relatorio", etapa_relatorio, arquivos=[report_img_path],
+                    dependencias={"avaliacao": avaliacao, "dados": dados},
+                    parametros={"caminho_figura": report_img_path})
+
+    #Nova versão no registro de modelos (models/registro/). Só entra em produção
+    #(app e serviço HTTP trocam para ela em segundo plano) com --ativar ou depois
+    #de conferir as métricas: python src/utils/registro_modelos.py ativar <versao>
+    print("--- Registrando o modelo vencedor... ---")
+    registrar(modelo_final_path, le_path,
+              metricas={"acuracia_teste": float(avaliacao.valor["acuracia_final"]),
+                        "acuracia_validacao_cruzada": float(validacao.valor["resultados"][modelo_vencedor_nome])},
+              informacoes={"modelo_vencedor": modelo_vencedor_nome, "versao_dados": versao_dados},
+              ativar_versao=args.ativar)
+
+    print(f"--- Script de treinamento finalizado com sucesso em {time.perf_counter() - inicio:.1f}s! ---")
+
+    # --- Debug - Verificando o Mapeamento de Classes ---
+    print("\n--- [Debug] Mapeamento de Classes (Tradução) ---")
+
+    # Carrega o "mapa" que salvamos
     le = joblib.load(le_path)
-    nomes_classes = le.classes_
-except FileNotFoundError:
-    print("Aviso: label_encoder.joblib não encontrado. Usando números nas classes.")
-    nomes_classes = modelo_vencedor_pipeline.classes_
-
-fig, ax = plt.subplots(figsize=(12, 8))
-fig.patch.set_facecolor(cor_fundo)
-ax.set_facecolor(cor_fundo)
-
-sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
-            xticklabels=nomes_classes, 
-            yticklabels=nomes_classes,
-            linewidths=0.5, linecolor=cor_fundo)
-
-plt.title('Matriz de Confusão - Desempenho no Teste Final', color='white', fontsize=14)
-plt.ylabel('Classe Verdadeira', color='white')
-plt.xlabel('Classe Prevista', color='white')
-plt.xticks(color='white')
-plt.yticks(color='white')
-plt.tight_layout() #Ajusta o layout para não cortar os nomes
-
-cm_path = os.path.join(REPORTS_DIR, 'matriz_confusao_final.png')
-plt.savefig(cm_path, dpi=300, facecolor=fig.get_facecolor())
-plt.close()
-print(f"Matriz de Confusão salva em: {cm_path}")
-
-#2. Salvar o Modelo (Pipeline Completo)
-modelo_final_path = os.path.join(MODELS_DIR, f"{modelo_vencedor_nome.lower().replace(' ', '_')}_pipeline.joblib")
-joblib.dump(modelo_vencedor_pipeline, modelo_final_path)
-print(f"Modelo (pipeline completo) salvo em: {modelo_final_path}")
-
-print("--- Script de treinamento finalizado com sucesso! ---")
-print()
 
-# --- Bloco 9: Salvar o Relatório de Classificação como Imagem ---
-print("--- [9/9] Salvando Relatório de Classificação como imagem... ---")
-
-#1. Gera o relatório como um DICIONÁRIO
-report_dict = classification_report(
-    y_test, 
-    y_pred_final, 
-    target_names=nomes_classes, #Para usar os nomes (ex: 'Sobrepeso')
-    output_dict=True
-)
-
-#2. Carrega o dicionário em um DataFrame do Pandas
-report_df = pd.DataFrame(report_dict).transpose()
-
-#3. Removendo as linhas de 'accuracy' e 'support' para focar apenas nas métricas por classe.
-report_df_plot = report_df.drop(['accuracy']) #Remove a linha de acurácia total
-report_df_plot = report_df_plot.drop(columns=['support']) #Remove a coluna de contagem
-
-#4. Criar o Heatmap
-fig, ax = plt.subplots(figsize=(12, 8))
-fig.patch.set_facecolor(cor_fundo)
-ax.set_facecolor(cor_fundo)
-
-sns.heatmap(
-    report_df_plot, 
-    annot=True,     #Escreve os números (ex: 0.77)
-    fmt='.2f',      #Formata com 2 casas decimais
-    cmap='Blues',   #Mesma paleta da Matriz de Confusão
-    cbar=False,     #Opcional: remove a barra de cor latera
-    linewidths=0.5,
-    linecolor=cor_fundo
-)
-
-plt.title('Relatório de Classificação Final (Heatmap)', color='white', fontsize=14)
-plt.xlabel('Métricas', color='white')
-plt.ylabel('Classes', color='white')
-plt.xticks(color='white')
-plt.yticks(color='white', rotation=0)
-plt.tight_layout()
-
-#5. Salvar a imagem
-report_img_path = os.path.join(REPORTS_DIR, 'classification_report_final.png')
-plt.savefig(report_img_path, dpi=300, facecolor=fig.get_facecolor())
-plt.close()#Fecha para limpar memória
-
-print(f"Relatório de Classificação salvo em: {report_img_path}")
-print("--- Script de treinamento finalizado com sucesso! ---")
-
-# --- Bloco 9: Debug - Verificando o Mapeamento de Classes ---
-print("\n--- [Debug] Mapeamento de Classes (Tradução) ---")
-
-# Carrega o "mapa" que salvamos
-le_path = os.path.join(MODELS_DIR, "label_encoder.joblib")
-le = joblib.load(le_path)
-
-# Pega os nomes das classes (ex: 'Sobrepeso') e os números (ex: 0, 1)
-# O .classes_ nos dá o "mapa" na ordem correta
-mapeamento_classes = dict(zip(le.transform(le.classes_), le.classes_))
-
-print("O modelo usa os seguintes números para cada classe:")
-for numero, nome in mapeamento_classes.items():
-    print(f"Classe {numero}: {nome}")
\ No newline at end of file
+    # Pega os nomes das classes (ex: 'Sobrepeso') e os números (ex: 0, 1)
+    # O .classes_ nos dá o "mapa" na ordem correta
+    mapeamento_classes = dict(zip(le.transform(le.classes_), le.classes_))
+
+    print("O modelo usa os seguintes números para cada classe:")
+    for numero, nome in mapeamento_classes.items():
+        print(f"Classe {numero}: {nome}")
+
+
+if __name__ == "__main__":
+    main()
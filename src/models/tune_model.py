@@ -0,0 +1,298 @@
+# src/models/tune_model.py
+"""
+Busca de hiperparâmetros (Random Forest e XGBoost) por successive halving.
+
+Cada modelo sorteia N configurações do seu espaço de busca e todas são
+avaliadas por validação cruzada com poucas árvores (n_estimators é o
+recurso). A cada rodada só o melhor 1/ETA segue, com ETA vezes mais árvores.
+Os folds x configurações de cada rodada rodam em paralelo em todos os núcleos.
+
+Cada trial (configuração + número de árvores) grava acurácia e latência de
+inferência (uma linha e lote) no leaderboard (JSONL). Uma busca interrompida
+é retomada do ponto onde parou: trials já registrados para a mesma versão
+dos dados não são refeitos.
+
+A configuração escolhida por modelo é a de menor latência entre as que ficam
+a até TOLERANCIA_ACURACIA da melhor acurácia; train_model.py a usa no lugar
+dos parâmetros padrão.
+
+Uso:
+    python src/models/tune_model.py
+    python src/models/tune_model.py --modelos XGBoost --n-configuracoes 81
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterSampler
+from sklearn.preprocessing import LabelEncoder
+
+# --- Definição de Caminhos ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+LEADERBOARD_PATH = os.path.join(project_root, "models", "tuning", "leaderboard.jsonl")
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.models.componentes import (TARGET, separar_features, dividir_treino_teste, gerar_folds,
+                                    criar_preprocessador, preprocessar_fold, criar_modelo)
+from src.utils.cache_previsao import versao_artefato
+from src.utils.dados_gold import caminho_gold, ler_gold
+
+#Espaços de busca (n_estimators fica de fora: é o recurso do successive halving)
+ESPACOS_BUSCA = {
+    "Random Forest": {
+        "max_depth": [None, 6, 10, 14, 20],
+        "min_samples_leaf": [1, 2, 4, 8],
+        "max_features": ["sqrt", "log2", 0.5],
+    },
+    "XGBoost": {
+        "max_depth": [2, 3, 4, 6, 8],
+        "learning_rate": [0.03, 0.1, 0.2, 0.3],
+        "subsample": [0.7, 0.85, 1.0],
+        "colsample_bytree": [0.6, 0.8, 1.0],
+        "min_child_weight": [1, 3, 5],
+    },
+}
+
+N_CONFIGURACOES = 27
+RECURSO_MIN = 25   #n_estimators da primeira rodada
+RECURSO_MAX = 225  #n_estimators da última rodada
+ETA = 3            #Fator de eliminação (e de aumento do recurso) por rodada
+
+#Diferença de acurácia aceita para trocar por uma configuração mais rápida
+TOLERANCIA_ACURACIA = 0.005
+
+#Repetições da medição de latência de uma linha (usa a mediana)
+REPETICOES_LATENCIA = 25
+
+#Processos usados na busca (-1 = todos os núcleos)
+N_JOBS = int(os.getenv("N_JOBS", "-1"))
+
+
+def chave_trial(modelo, parametros, recurso):
+    """Identifica um trial no leaderboard (parâmetros serializados de forma estável)."""
+    return modelo, json.dumps(parametros, sort_keys=True), recurso
+
+
+def carregar_leaderboard(caminho=LEADERBOARD_PATH, versao_dados=None):
+    """Lê os trials já registrados (opcionalmente só os da versão de dados informada)."""
+    if not os.path.exists(caminho):
+        return []
+    registros = []
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            linha = linha.strip()
+            if not linha:
+                continue
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError:
+                #Última linha truncada por uma interrupção no meio da escrita
+                continue
+            if versao_dados is None or registro["versao_dados"] == versao_dados:
+                registros.append(registro)
+    return registros
+
+
+def melhor_configuracao(registros, tolerancia=TOLERANCIA_ACURACIA):
+    """Entre os trials a até `tolerancia` da melhor acurácia, o de menor latência."""
+    if not registros:
+        return None
+    melhor_acuracia = max(r["acuracia_media"] for r in registros)
+    candidatos = [r for r in registros if r["acuracia_media"] >= melhor_acuracia - tolerancia]
+    return min(candidatos, key=lambda r: (r["latencia_ms"], -r["acuracia_media"]))
+
+
+def fronteira_pareto(registros):
+    """Trials não dominados em (maior acurácia, menor latência), do mais rápido ao mais lento."""
+    fronteira = []
+    for registro in sorted(registros, key=lambda r: (r["latencia_ms"], -r["acuracia_media"])):
+        if not fronteira or registro["acuracia_media"] > fronteira[-1]["acuracia_media"]:
+            fronteira.append(registro)
+    return fronteira
+
+
+def configuracoes_ajustadas(caminho=LEADERBOARD_PATH, versao_dados=None, tolerancia=TOLERANCIA_ACURACIA):
+    """Parâmetros escolhidos por modelo ({nome: parâmetros com n_estimators})."""
+    registros = carregar_leaderboard(caminho, versao_dados)
+    escolhidos = {}
+    for nome in sorted({r["modelo"] for r in registros}):
+        melhor = melhor_configuracao([r for r in registros if r["modelo"] == nome], tolerancia)
+        escolhidos[nome] = {**melhor["parametros"], "n_estimators": melhor["recurso"]}
+    return escolhidos
+
+
+def avaliar_trial_fold(nome, parametros, recurso, numero_fold, X_tr, y_tr, X_val, y_val):
+    """Treina uma configuração em um fold e mede acurácia e latência de inferência."""
+    modelo = criar_modelo(nome, n_estimators=recurso, n_jobs=1, **parametros)
+
+    inicio = time.perf_counter()
+    modelo.fit(X_tr, y_tr)
+    tempo_treino = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    probabilidades = modelo.predict_proba(X_val)
+    latencia_lote_us = (time.perf_counter() - inicio) / len(X_val) * 1e6
+    acuracia = accuracy_score(y_val, modelo.classes_[np.argmax(probabilidades, axis=1)])
+
+    #Latência de uma linha (caso interativo do app)
+    linha = X_val[:1]
+    modelo.predict_proba(linha)
+    tempos = []
+    for _ in range(REPETICOES_LATENCIA):
+        inicio = time.perf_counter()
+        modelo.predict_proba(linha)
+        tempos.append(time.perf_counter() - inicio)
+
+    return {
+        "chave": chave_trial(nome, parametros, recurso),
+        "fold": numero_fold,
+        "acuracia": acuracia,
+        "latencia_ms": float(np.median(tempos)) * 1000,
+        "latencia_lote_us": latencia_lote_us,
+        "tempo_treino_s": tempo_treino,
+    }
+
+
+def _registrar_trial(arquivo, chave, rodada, resultados_folds, versao_dados):
+    """Consolida os folds de um trial e acrescenta a linha no leaderboard."""
+    nome, parametros_json, recurso = chave
+    acuracias = [r["acuracia"] for r in resultados_folds]
+    registro = {
+        "modelo": nome,
+        "parametros": json.loads(parametros_json),
+        "recurso": recurso,
+        "rodada": rodada,
+        "acuracia_media": float(np.mean(acuracias)),
+        "acuracia_desvio": float(np.std(acuracias)),
+        "latencia_ms": float(np.median([r["latencia_ms"] for r in resultados_folds])),
+        "latencia_lote_us": float(np.median([r["latencia_lote_us"] for r in resultados_folds])),
+        "tempo_treino_s": float(np.sum([r["tempo_treino_s"] for r in resultados_folds])),
+        "versao_dados": versao_dados,
+        "registrado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    arquivo.flush()
+    return registro
+
+
+def successive_halving(nome, configuracoes, folds, dados_folds, y_train, versao_dados,
+                       caminho_leaderboard=LEADERBOARD_PATH, recurso_min=RECURSO_MIN,
+                       recurso_max=RECURSO_MAX, eta=ETA, n_jobs=N_JOBS):
+    """Roda as rodadas de eliminação de um modelo e retorna todos os seus trials."""
+    concluidos = {
+        chave_trial(r["modelo"], r["parametros"], r["recurso"]): r
+        for r in carregar_leaderboard(caminho_leaderboard, versao_dados)
+    }
+    n_rodadas = int(math.floor(math.log(recurso_max / recurso_min, eta))) + 1
+    sobreviventes = list(configuracoes)
+    trials = []
+
+    os.makedirs(os.path.dirname(caminho_leaderboard), exist_ok=True)
+    with open(caminho_leaderboard, "a", encoding="utf-8") as arquivo:
+        for rodada in range(n_rodadas):
+            recurso = recurso_min * eta ** rodada
+            chaves = [chave_trial(nome, parametros, recurso) for parametros in sobreviventes]
+            pendentes = [(chave, parametros) for chave, parametros in zip(chaves, sobreviventes)
+                         if chave not in concluidos]
+            print(f"\n{nome} | rodada {rodada + 1}/{n_rodadas}: {len(sobreviventes)} configurações "
+                  f"com {recurso} árvores ({len(sobreviventes) - len(pendentes)} já no leaderboard)")
+
+            inicio = time.perf_counter()
+            resultados = {}
+            execucoes = Parallel(n_jobs=n_jobs, return_as="generator_unordered")(
+                delayed(avaliar_trial_fold)(nome, parametros, recurso, i, X_tr, y_train[idx_treino],
+                                            X_val, y_train[idx_validacao])
+                for _, parametros in pendentes
+                for i, ((idx_treino, idx_validacao), (X_tr, X_val)) in enumerate(zip(folds, dados_folds))
+            )
+            #Cada trial vai para o leaderboard assim que todos os seus folds terminam
+            for resultado in execucoes:
+                resultados_folds = resultados.setdefault(resultado["chave"], [])
+                resultados_folds.append(resultado)
+                if len(resultados_folds) == len(folds):
+                    registro = _registrar_trial(arquivo, resultado["chave"], rodada, resultados_folds, versao_dados)
+                    concluidos[resultado["chave"]] = registro
+            print(f"Rodada concluída em {time.perf_counter() - inicio:.1f}s (relógio).")
+
+            registros_rodada = [concluidos[chave] for chave in chaves]
+            trials.extend(registros_rodada)
+
+            #Mantém o melhor 1/ETA (por acurácia; na última rodada não há mais cortes)
+            n_mantidas = max(1, len(sobreviventes) // eta)
+            ordem = sorted(range(len(sobreviventes)), key=lambda i: -registros_rodada[i]["acuracia_media"])
+            sobreviventes = [sobreviventes[i] for i in ordem[:n_mantidas]]
+    return trials
+
+
+def exibir_resultados(trials):
+    """Imprime a fronteira acurácia x latência e a configuração escolhida."""
+    tabela = pd.DataFrame([{
+        "recurso": r["recurso"],
+        "acurácia (%)": round(r["acuracia_media"] * 100, 2),
+        "latência (ms)": round(r["latencia_ms"], 2),
+        "lote (µs/linha)": round(r["latencia_lote_us"], 1),
+        "parâmetros": json.dumps(r["parametros"], sort_keys=True),
+    } for r in fronteira_pareto(trials)])
+    print("Fronteira acurácia x latência:")
+    print(tabela.to_string(index=False))
+
+    melhor = melhor_configuracao(trials)
+    print(f"Escolhida: {melhor['recurso']} árvores, {melhor['parametros']} "
+          f"({melhor['acuracia_media'] * 100:.2f}%, {melhor['latencia_ms']:.2f} ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Busca de hiperparâmetros por successive halving.")
+    parser.add_argument("--modelos", nargs="+", default=list(ESPACOS_BUSCA), choices=list(ESPACOS_BUSCA))
+    parser.add_argument("--n-configuracoes", type=int, default=N_CONFIGURACOES,
+                        help="Configurações sorteadas por modelo na primeira rodada.")
+    parser.add_argument("--recurso-min", type=int, default=RECURSO_MIN)
+    parser.add_argument("--recurso-max", type=int, default=RECURSO_MAX)
+    parser.add_argument("--eta", type=int, default=ETA)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--leaderboard", default=LEADERBOARD_PATH, help="Arquivo JSONL do leaderboard.")
+    args = parser.parse_args(argv)
+
+    caminho_dados = caminho_gold()
+    print(f"--- [1/3] Carregando dados de {caminho_dados}... ---")
+    df = ler_gold(caminho_dados)
+    versao_dados = versao_artefato(caminho_dados)
+    y_encoded = LabelEncoder().fit_transform(df[TARGET])
+    X = separar_features(df)
+    X_train, _, y_train, _ = dividir_treino_teste(X, y_encoded)
+
+    print("--- [2/3] Pré-processando os folds... ---")
+    folds = gerar_folds(X_train, y_train)
+    preprocessor = criar_preprocessador(X_train)
+    dados_folds = Parallel(n_jobs=N_JOBS)(
+        delayed(preprocessar_fold)(preprocessor, X_train, idx_treino, idx_validacao)
+        for idx_treino, idx_validacao in folds
+    )
+
+    print("--- [3/3] Successive halving... ---")
+    for nome in args.modelos:
+        #Sorteio determinístico: a mesma semente gera as mesmas configurações ao retomar
+        configuracoes = list(ParameterSampler(ESPACOS_BUSCA[nome], n_iter=args.n_configuracoes,
+                                              random_state=args.semente))
+        trials = successive_halving(nome, configuracoes, folds, dados_folds, y_train, versao_dados,
+                                    caminho_leaderboard=args.leaderboard, recurso_min=args.recurso_min,
+                                    recurso_max=args.recurso_max, eta=args.eta)
+        print(f"\n--- Resultado: {nome} ---")
+        exibir_resultados(trials)
+
+    print(f"\nLeaderboard salvo em: {args.leaderboard}")
+
+
+if __name__ == "__main__":
+    main()
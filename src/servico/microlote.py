@@ -0,0 +1,111 @@
+# src/servico/microlote.py
+"""
+Microlotes (micro-batching) para o serviço de previsão.
+
+Requisições que chegam juntas são agrupadas em uma única chamada do modelo:
+o primeiro pedido da fila arma um temporizador de `espera_ms`; quando ele
+dispara (ou a fila atinge `tamanho_max` linhas), todos os pedidos pendentes
+viram um lote só, processado em um pool de threads para não bloquear o event
+loop. Cada pedido recebe de volta apenas as suas linhas.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ServicoSobrecarregado(RuntimeError):
+    """A fila de linhas pendentes atingiu o limite (o cliente deve tentar de novo)."""
+
+
+class FalhaMicrolote(RuntimeError):
+    """O processamento de um lote falhou: todos os pedidos do lote recebem este erro (erro do servidor)."""
+
+
+class AgrupadorMicrolote:
+    """
+    Junta pedidos concorrentes em lotes e chama `processar(itens) -> resultados`
+    (uma lista de itens -> uma lista de resultados do mesmo tamanho e ordem)
+    em um pool de `trabalhadores` threads. Os itens devem ser validados antes
+    de `enviar`: se `processar` falhar, todos os pedidos do lote recebem
+    FalhaMicrolote.
+    """
+
+    def __init__(self, processar, espera_ms=2.0, tamanho_max=512, trabalhadores=2,
+                 fila_max=20_000, monitor=None):
+        self.processar = processar
+        self.espera = espera_ms / 1000
+        self.tamanho_max = tamanho_max
+        self.fila_max = fila_max
+        self.monitor = monitor
+        self.executor = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="microlote")
+        self._fila = []
+        self._linhas_fila = 0
+        #Linhas na fila + linhas em processamento (limite de fila_max)
+        self._linhas_pendentes = 0
+        self._temporizador = None
+        self._tarefas = set()
+
+    async def enviar(self, itens):
+        """Enfileira os itens de um pedido e espera os resultados do lote em que eles entrarem."""
+        if self._linhas_pendentes + len(itens) > self.fila_max:
+            raise ServicoSobrecarregado(f"Fila cheia ({self._linhas_pendentes:,} linhas pendentes).")
+
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        self._fila.append((itens, futuro))
+        self._linhas_fila += len(itens)
+        self._linhas_pendentes += len(itens)
+
+        if self._linhas_fila >= self.tamanho_max:
+            self._despachar()
+        elif self._temporizador is None:
+            self._temporizador = loop.call_later(self.espera, self._despachar)
+        return await futuro
+
+    def _despachar(self):
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        if not self._fila:
+            return
+        pedidos, self._fila, self._linhas_fila = self._fila, [], 0
+        tarefa = asyncio.get_running_loop().create_task(self._executar(pedidos))
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+
+    async def _executar(self, pedidos):
+        loop = asyncio.get_running_loop()
+        itens = [item for itens_pedido, _ in pedidos for item in itens_pedido]
+        inicio = time.perf_counter()
+        try:
+            resultados = await loop.run_in_executor(self.executor, self.processar, itens)
+        except Exception as erro:
+            #Os itens são validados antes de entrar na fila: uma falha aqui é do
+            #servidor, e refazer pedido a pedido só atrasaria todos os outros
+            falha = FalhaMicrolote(f"Falha ao processar o lote de {len(pedidos)} pedido(s): "
+                                   f"{type(erro).__name__}: {erro}")
+            falha.__cause__ = erro
+            for _, futuro in pedidos:
+                if not futuro.done():
+                    futuro.set_exception(falha)
+            return
+        finally:
+            self._linhas_pendentes -= len(itens)
+
+        if self.monitor is not None:
+            self.monitor.registrar("inferencia_lote", (time.perf_counter() - inicio) * 1000)
+            self.monitor.registrar("linhas_por_lote", len(itens))
+            self.monitor.registrar("pedidos_por_lote", len(pedidos))
+
+        posicao = 0
+        for itens_pedido, futuro in pedidos:
+            if not futuro.done():
+                futuro.set_result(resultados[posicao:posicao + len(itens_pedido)])
+            posicao += len(itens_pedido)
+
+    async def fechar(self):
+        """Processa o que ainda está na fila, espera os lotes em andamento e encerra o pool de threads."""
+        self._despachar()
+        if self._tarefas:
+            await asyncio.gather(*self._tarefas)
+        self.executor.shutdown(wait=True)
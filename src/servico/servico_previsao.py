@@ -0,0 +1,247 @@
+# src/servico/servico_previsao.py
+"""
+Serviço HTTP de previsão (asyncio, Starlette + Uvicorn), sem Streamlit.
+
+O pipeline e o LabelEncoder da versão em produção no registro de modelos
+(src/utils/registro_modelos.py) são carregados na subida do serviço. Uma
+nova versão ativada no registro é carregada e aquecida em segundo plano e só
+então substitui a anterior (src/utils/recarregador_modelo.py), sem pausar
+as requisições. Pedidos concorrentes são agrupados em microlotes (ver microlote.py):
+uma chamada de engenharia de features + predict_proba atende todos os
+pedidos que chegaram dentro de alguns milissegundos, em um pool de threads,
+sem bloquear o event loop.
+
+Endpoints (JSON com as mesmas chaves do formulário do app, ver
+engenharia.OPCOES_FORMULARIO, mais `idade`):
+    GET  /saude         status, versão do modelo (e última troca) e configuração dos microlotes
+    POST /prever        um paciente -> classe, nível de risco, top-k e probabilidades
+    POST /prever/lote   {"pacientes": [...]} (ou a lista direto) -> {"resultados": [...]}
+    GET  /metricas      p50/p95/p99 das requisições e dos lotes, tamanho dos lotes e memória do processo
+
+Uso:
+    python src/servico/servico_previsao.py [--porta 8000] [--modelo models/xgboost_pipeline.joblib]
+    python benchmarks/carga_servico.py --url http://127.0.0.1:8000
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+
+import joblib
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.features.engenharia import OPCOES_FORMULARIO, preparar_colunas_para_previsao, validar_respostas
+from src.servico.microlote import AgrupadorMicrolote, FalhaMicrolote, ServicoSobrecarregado
+from src.utils.cache_previsao import versao_artefato
+from src.utils.latencia import MonitorLatencia
+from src.utils.memoria_processo import memoria_processo
+from src.utils.modelo_compacto import ModeloCompacto
+from src.utils.pontuacao import Pontuador
+from src.utils.recarregador_modelo import INTERVALO_S, RecarregadorModelo, aquecer_pontuador
+from src.utils.registro_modelos import LE_LEGADO, resolver_versao
+
+#Microlotes: espera máxima para juntar pedidos, linhas por lote, threads de inferência e limite da fila
+ESPERA_MS = float(os.getenv("SERVICO_MICROLOTE_ESPERA_MS", "2"))
+TAMANHO_MAX = int(os.getenv("SERVICO_MICROLOTE_MAX", "512"))
+TRABALHADORES = int(os.getenv("SERVICO_TRABALHADORES", "2"))
+FILA_MAX = int(os.getenv("SERVICO_FILA_MAX", "20000"))
+
+#Campos de cada paciente no corpo do pedido
+CAMPOS_FORMULARIO = [*OPCOES_FORMULARIO, "idade"]
+
+
+def colunas_formulario(pacientes):
+    """Respostas dos pacientes (lista de dicionários) como colunas: campo -> lista (KeyError se faltar um campo)."""
+    return {campo: [paciente[campo] for paciente in pacientes] for campo in CAMPOS_FORMULARIO}
+
+
+def criar_processador(recarregador):
+    """
+    Respostas do formulário (lista de dicionários) -> lista de resultados (roda
+    no pool de threads). Cada lote usa o pontuador da versão em produção no
+    momento em que começa. As respostas viram colunas (listas) e as features
+    um dicionário de arrays: nenhum DataFrame é montado no caminho do pedido.
+    """
+    def processar(pacientes):
+        _, pontuador = recarregador.atual()
+        return pontuador.pontuar(preparar_colunas_para_previsao(colunas_formulario(pacientes))).para_registros()
+    return processar
+
+
+def carregar_pontuador_pipeline(versao):
+    """Pontuador do pipeline .joblib de uma versão (dicionário de registro_modelos.resolver_versao)."""
+    return Pontuador.do_pipeline(joblib.load(versao["modelo"]), joblib.load(versao["label_encoder"]))
+
+
+def resolver_arquivos(caminho_modelo, caminho_le):
+    """Resolvedor de versão fixo (--modelo): a versão é o hash do .joblib."""
+    def resolver():
+        return {"versao": versao_artefato(caminho_modelo), "modelo": caminho_modelo,
+                "label_encoder": caminho_le, "diretorio": None}
+    return resolver
+
+
+def carregar_pontuador_compacto(diretorio):
+    """
+    Pontuador do modelo compacto (src/models/export_model.py) com os arrays
+    abertos em mmap: as páginas do modelo ficam no page cache e são
+    compartilhadas por todos os processos que abrem (ou herdam) os arquivos.
+    """
+    modelo = ModeloCompacto.carregar(diretorio, mmap=True)
+    return Pontuador(modelo, modelo.classes)
+
+
+class ServicoPrevisao:
+    """
+    Estado do serviço: recarregador do modelo, agrupador de microlotes e latências.
+    Sem `recarregador`, usa o pipeline .joblib da versão em produção no
+    registro (ou, com `caminho_modelo`, sempre o mesmo arquivo).
+    """
+
+    def __init__(self, caminho_modelo=None, caminho_le=None, espera_ms=ESPERA_MS,
+                 tamanho_max=TAMANHO_MAX, trabalhadores=TRABALHADORES, fila_max=FILA_MAX,
+                 recarregador=None, intervalo_s=INTERVALO_S):
+        self.configuracao = {"espera_ms": espera_ms, "tamanho_max": tamanho_max,
+                             "trabalhadores": trabalhadores, "fila_max": fila_max}
+        self.monitor = MonitorLatencia()
+        if recarregador is None:
+            resolver = resolver_arquivos(caminho_modelo, caminho_le) if caminho_modelo else resolver_versao
+            recarregador = RecarregadorModelo(carregar_pontuador_pipeline, aquecer_pontuador,
+                                              resolver=resolver, intervalo_s=intervalo_s)
+        self.recarregador = recarregador
+        self.agrupador = None
+
+    def carregar(self):
+        """Carrega a versão atual (se ainda não carregada), inicia a troca em segundo plano e cria o agrupador."""
+        self.recarregador.iniciar()
+        self.agrupador = AgrupadorMicrolote(criar_processador(self.recarregador), monitor=self.monitor,
+                                            **self.configuracao)
+
+    async def prever(self, pacientes):
+        """
+        Resultados dos pacientes (lista de dicionários), passando pelo microlote.
+        As respostas são conferidas antes de entrar na fila: um pedido inválido
+        recebe o erro sozinho (KeyError/ValueError) e não chega ao lote dos outros.
+        """
+        with self.monitor.medir("requisicao"):
+            validar_respostas(colunas_formulario(pacientes))
+            return await self.agrupador.enviar(pacientes)
+
+
+def _erro(mensagem, status):
+    return JSONResponse({"erro": mensagem}, status_code=status)
+
+
+async def _ler_json(requisicao):
+    try:
+        return await requisicao.json()
+    except ValueError:
+        return None
+
+
+async def _responder(servico, pacientes):
+    """Roda a previsão e traduz as falhas em códigos HTTP."""
+    if not pacientes or not all(isinstance(paciente, dict) for paciente in pacientes):
+        return None, _erro("Envie um paciente (objeto JSON) ou uma lista não vazia de pacientes.", 400)
+    try:
+        return await servico.prever(pacientes), None
+    except ServicoSobrecarregado as erro:
+        return None, _erro(str(erro), 503)
+    except FalhaMicrolote as erro:
+        #Pedidos já validados: a falha é do servidor (ex: modelo), não dos dados
+        print(f"[ERRO] {erro}")
+        return None, _erro(str(erro), 500)
+    except KeyError as erro:
+        return None, _erro(f"Campo ausente: {erro}", 422)
+    except ValueError as erro:
+        #Opção fora das do formulário
+        return None, _erro(f"Dados inválidos: {erro}", 422)
+
+
+def criar_app(servico=None):
+    """Aplicação Starlette do serviço (o modelo é carregado na subida, fora do event loop)."""
+    servico = servico or ServicoPrevisao()
+
+    @contextlib.asynccontextmanager
+    async def ciclo_de_vida(app):
+        await asyncio.get_running_loop().run_in_executor(None, servico.carregar)
+        yield
+        await servico.agrupador.fechar()
+        servico.recarregador.parar()
+
+    async def saude(requisicao):
+        return JSONResponse({
+            "status": "ok",
+            "modelo": servico.recarregador.estado(),
+            "microlote": servico.configuracao,
+        })
+
+    async def prever(requisicao):
+        paciente = await _ler_json(requisicao)
+        resultados, erro = await _responder(servico, [paciente] if isinstance(paciente, dict) else None)
+        return erro or JSONResponse(resultados[0])
+
+    async def prever_lote(requisicao):
+        corpo = await _ler_json(requisicao)
+        pacientes = corpo.get("pacientes") if isinstance(corpo, dict) else corpo
+        resultados, erro = await _responder(servico, pacientes if isinstance(pacientes, list) else None)
+        return erro or JSONResponse({"resultados": resultados})
+
+    async def metricas(requisicao):
+        try:
+            memoria = memoria_processo()
+        except OSError:
+            #Sem /proc (fora do Linux)
+            memoria = None
+        return JSONResponse({**servico.monitor.resumo(), "memoria_mb": memoria, "pid": os.getpid()})
+
+    app = Starlette(
+        routes=[
+            Route("/saude", saude, methods=["GET"]),
+            Route("/prever", prever, methods=["POST"]),
+            Route("/prever/lote", prever_lote, methods=["POST"]),
+            Route("/metricas", metricas, methods=["GET"]),
+        ],
+        lifespan=ciclo_de_vida,
+    )
+    app.state.servico = servico
+    return app
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serviço HTTP de previsão com microlotes.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--modelo", default=None,
+                        help="Pipeline treinado (.joblib) fixo; sem isso, segue a versão em produção no registro.")
+    parser.add_argument("--label-encoder", default=LE_LEGADO, help="Caminho do label_encoder.joblib (com --modelo).")
+    parser.add_argument("--intervalo-registro", type=float, default=INTERVALO_S,
+                        help="Segundos entre as conferências do registro de modelos (0 desliga a troca).")
+    parser.add_argument("--espera-ms", type=float, default=ESPERA_MS,
+                        help="Tempo máximo para juntar pedidos em um lote (0 desliga a espera).")
+    parser.add_argument("--tamanho-max", type=int, default=TAMANHO_MAX,
+                        help="Linhas por lote (1 desliga os microlotes).")
+    parser.add_argument("--trabalhadores", type=int, default=TRABALHADORES, help="Threads de inferência.")
+    args = parser.parse_args(argv)
+
+    servico = ServicoPrevisao(args.modelo, args.label_encoder, espera_ms=args.espera_ms,
+                              tamanho_max=args.tamanho_max, trabalhadores=args.trabalhadores,
+                              intervalo_s=args.intervalo_registro)
+    print(f"--- Serviço de previsão em http://{args.host}:{args.porta} "
+          f"(microlotes de até {args.tamanho_max} linhas, espera de {args.espera_ms} ms) ---")
+    uvicorn.run(criar_app(servico), host=args.host, port=args.porta, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
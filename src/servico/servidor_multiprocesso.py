@@ -0,0 +1,208 @@
+# src/servico/servidor_multiprocesso.py
+"""
+Serviço de previsão em vários processos, com o modelo carregado uma vez só.
+
+O processo pai:
+1. pega o modelo compacto (src/models/export_model.py) da versão em produção
+   no registro (src/utils/registro_modelos.py exporta cada versão ao
+   registrá-la). Sem registro, garante que models/compacto corresponde ao
+   .joblib atual, exportando de novo em um subprocesso se ele mudou (o pai
+   não importa scikit-learn);
+2. abre os arrays do modelo com mmap (ModeloCompacto.carregar(mmap=True));
+3. abre o socket e faz fork de `--processos` trabalhadores, que herdam o
+   modelo e atendem no mesmo socket (servico_previsao.criar_app).
+
+As árvores ficam no page cache, compartilhadas entre os trabalhadores: a
+memória do modelo não se multiplica pelo número de processos. O pai reinicia
+trabalhadores que caírem e mostra a memória (RSS/PSS) de cada um.
+
+Cada trabalhador confere o registro em segundo plano: quando outra versão é
+ativada, abre o compacto dela (mmap dos mesmos arquivos, de novo
+compartilhado), aquece e troca (src/utils/recarregador_modelo.py). Versões
+sem modelo compacto no registro não são trocadas nos trabalhadores (o erro
+aparece em /saude); reinicie o servidor para exportá-las.
+
+Com `--modo pipeline`, cada trabalhador faz o próprio joblib.load do .joblib
+(como o app faz em carregar_versao()), para comparação.
+
+Uso (só Linux/macOS, usa fork):
+    python src/servico/servidor_multiprocesso.py --processos 4 [--porta 8000]
+    python benchmarks/memoria_servidor.py --processos 4
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.servico.servico_previsao import (
+    ESPERA_MS, TAMANHO_MAX, TRABALHADORES,
+    ServicoPrevisao, carregar_pontuador_compacto, carregar_pontuador_pipeline, criar_app, resolver_arquivos,
+)
+from src.utils.cache_previsao import versao_artefato
+from src.utils.memoria_processo import relatorio_memoria_processos
+from src.utils.modelo_compacto import METADADOS_ARQUIVO
+from src.utils.recarregador_modelo import INTERVALO_S, RecarregadorModelo, aquecer_pontuador
+from src.utils.registro_modelos import COMPACTO_SUBDIR, LE_LEGADO, resolver_versao
+
+COMPACTO_DIR = os.path.join(project_root, "models", "compacto")
+EXPORT_PATH = os.path.join(project_root, "src", "models", "export_model.py")
+
+#Intervalo (s) entre os relatórios de memória dos trabalhadores (0 desliga)
+INTERVALO_RELATORIO = float(os.getenv("SERVICO_RELATORIO_MEMORIA_S", "60"))
+
+
+def garantir_modelo_compacto(caminho_modelo, caminho_le=LE_LEGADO, diretorio=COMPACTO_DIR):
+    """Exporta o modelo compacto se ele não existe ou veio de outra versão do .joblib."""
+    versao = versao_artefato(caminho_modelo)
+    try:
+        with open(os.path.join(diretorio, METADADOS_ARQUIVO), encoding="utf-8") as arquivo:
+            atualizado = json.load(arquivo).get("versao_modelo") == versao
+    except FileNotFoundError:
+        atualizado = False
+
+    if not atualizado:
+        print(f"Modelo compacto ausente ou desatualizado: exportando {os.path.basename(caminho_modelo)}...")
+        subprocess.run([sys.executable, EXPORT_PATH, "--modelo", caminho_modelo,
+                        "--label-encoder", caminho_le, "--saida", diretorio], check=True)
+    return diretorio
+
+
+def criar_carregador_compacto(diretorio_compacto=COMPACTO_DIR):
+    """
+    carregar(versao) do recarregador no modo compacto: usa o compacto da
+    versão no registro; só o processo pai exporta (versões fora do registro).
+    """
+    pid_pai = os.getpid()
+
+    def carregar(versao):
+        if versao["diretorio"] and os.path.isdir(os.path.join(versao["diretorio"], COMPACTO_SUBDIR)):
+            return carregar_pontuador_compacto(os.path.join(versao["diretorio"], COMPACTO_SUBDIR))
+        if os.getpid() != pid_pai:
+            raise RuntimeError("Versão sem modelo compacto no registro; reinicie o servidor para exportá-la.")
+        return carregar_pontuador_compacto(
+            garantir_modelo_compacto(versao["modelo"], versao["label_encoder"], diretorio_compacto))
+    return carregar
+
+
+def abrir_socket(host, porta):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, porta))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def iniciar_trabalhador(sock, servico):
+    """Fork de um trabalhador que roda o serviço no socket compartilhado. Retorna o pid (no pai)."""
+    pid = os.fork()
+    if pid:
+        return pid
+
+    #Processo filho: sinais padrão (o uvicorn instala os seus) e servidor no socket herdado
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    import uvicorn
+    codigo = 0
+    try:
+        uvicorn.Server(uvicorn.Config(criar_app(servico), log_level="warning")).run(sockets=[sock])
+    except BaseException:
+        codigo = 1
+    finally:
+        os._exit(codigo)
+
+
+def exibir_memoria(pids):
+    """RSS/PSS (MB) de cada trabalhador e o total."""
+    print(relatorio_memoria_processos(pids).to_string())
+
+
+class Supervisor:
+    """Mantém `processos` trabalhadores vivos até receber SIGINT/SIGTERM."""
+
+    def __init__(self, sock, servico, processos, intervalo_relatorio=INTERVALO_RELATORIO):
+        self.sock = sock
+        self.servico = servico
+        self.processos = processos
+        self.intervalo_relatorio = intervalo_relatorio
+        self.pids = set()
+        self._encerrar = False
+
+    def _parar(self, *_):
+        self._encerrar = True
+
+    def executar(self):
+        signal.signal(signal.SIGTERM, self._parar)
+        signal.signal(signal.SIGINT, self._parar)
+        for _ in range(self.processos):
+            self.pids.add(iniciar_trabalhador(self.sock, self.servico))
+
+        proximo_relatorio = time.monotonic() + min(self.intervalo_relatorio, 5) if self.intervalo_relatorio else None
+        while not self._encerrar:
+            time.sleep(0.5)
+            for pid in list(self.pids):
+                terminado, status = os.waitpid(pid, os.WNOHANG)
+                if terminado and not self._encerrar:
+                    print(f"Trabalhador {pid} terminou (status {status}); iniciando outro.")
+                    self.pids.discard(pid)
+                    self.pids.add(iniciar_trabalhador(self.sock, self.servico))
+            if proximo_relatorio is not None and time.monotonic() >= proximo_relatorio:
+                exibir_memoria(sorted(self.pids))
+                proximo_relatorio = time.monotonic() + self.intervalo_relatorio
+
+        for pid in self.pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                continue
+        print("Trabalhadores encerrados.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço de previsão em vários processos (modelo compartilhado).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1, help="Processos trabalhadores.")
+    parser.add_argument("--modo", choices=["compacto", "pipeline"], default="compacto",
+                        help="compacto: modelo mmap compartilhado; pipeline: um joblib.load por trabalhador.")
+    parser.add_argument("--modelo", default=None,
+                        help="Pipeline treinado (.joblib) fixo; sem isso, segue a versão em produção no registro.")
+    parser.add_argument("--label-encoder", default=LE_LEGADO, help="Caminho do label_encoder.joblib (com --modelo).")
+    parser.add_argument("--diretorio-compacto", default=COMPACTO_DIR,
+                        help="Pasta do modelo compacto exportado para versões fora do registro.")
+    parser.add_argument("--intervalo-registro", type=float, default=INTERVALO_S,
+                        help="Segundos entre as conferências do registro de modelos (0 desliga a troca).")
+    parser.add_argument("--espera-ms", type=float, default=ESPERA_MS)
+    parser.add_argument("--tamanho-max", type=int, default=TAMANHO_MAX)
+    parser.add_argument("--trabalhadores", type=int, default=TRABALHADORES, help="Threads de inferência por processo.")
+    parser.add_argument("--intervalo-relatorio", type=float, default=INTERVALO_RELATORIO,
+                        help="Segundos entre os relatórios de memória (0 desliga).")
+    args = parser.parse_args(argv)
+
+    resolver = resolver_arquivos(args.modelo, args.label_encoder) if args.modelo else resolver_versao
+    carregar = criar_carregador_compacto(args.diretorio_compacto) if args.modo == "compacto" else carregar_pontuador_pipeline
+    recarregador = RecarregadorModelo(carregar, aquecer_pontuador, resolver=resolver, intervalo_s=args.intervalo_registro)
+    if args.modo == "compacto":
+        print("--- [1/2] Abrindo o modelo compacto (mmap) no processo pai... ---")
+        recarregador.carregar_inicial()
+
+    servico = ServicoPrevisao(espera_ms=args.espera_ms, tamanho_max=args.tamanho_max,
+                              trabalhadores=args.trabalhadores, recarregador=recarregador)
+    sock = abrir_socket(args.host, args.porta)
+    print(f"--- [2/2] {args.processos} trabalhadores ({args.modo}) em http://{args.host}:{args.porta} ---")
+    Supervisor(sock, servico, args.processos, args.intervalo_relatorio).executar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# src/utils/cache_previsao.py
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachePrevisao:
+    """
+    Cache LRU com expiração (TTL) para resultados do modelo.
+
+    A chave é a tupla de features já processadas (saída da engenharia de
+    features), então perfis repetidos não passam pelo pipeline de novo.
+    Cada instância pertence a uma versão do modelo (hash do artefato):
+    quando o artefato muda, uma nova instância vazia é criada.
+    """
+
+    def __init__(self, capacidade=10_000, ttl_segundos=6 * 60 * 60, versao_modelo=None):
+        self.capacidade = capacidade
+        self.ttl_segundos = ttl_segundos
+        self.versao_modelo = versao_modelo
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    @staticmethod
+    def chave(df_features):
+        """Tupla canônica (tipos nativos do Python) da primeira linha do DataFrame."""
+        return tuple(df_features.iloc[0].tolist())
+
+    def obter(self, chave):
+        """Retorna o valor guardado ou None (ausente ou expirado)."""
+        agora = time.monotonic()
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None or agora - item[0] > self.ttl_segundos:
+                if item is not None:
+                    del self._itens[chave]
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return item[1]
+
+    def guardar(self, chave, valor):
+        with self._lock:
+            self._itens[chave] = (time.monotonic(), valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self.acertos = 0
+            self.falhas = 0
+
+    def estatisticas(self):
+        """Contadores de acerto/falha e ocupação do cache."""
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                "versao_modelo": self.versao_modelo,
+                "itens": len(self._itens),
+                "capacidade": self.capacidade,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": self.acertos / total if total else 0.0,
+            }
+
+
+def versao_artefato(caminho):
+    """
+    Hash SHA-256 do arquivo do modelo. O hash só é recalculado quando a data
+    de modificação ou o tamanho do arquivo mudam (os.stat é barato).
+    """
+    info = os.stat(caminho)
+    return _hash_arquivo(caminho, info.st_mtime_ns, info.st_size)
+
+
+@functools.lru_cache(maxsize=16)
+def _hash_arquivo(caminho, mtime_ns, tamanho):
+    sha256 = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1024 * 1024), b""):
+            sha256.update(bloco)
+    return sha256.hexdigest()
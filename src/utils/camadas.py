@@ -0,0 +1,469 @@
+# src/utils/camadas.py
+"""
+Movimentação em massa entre as camadas Bronze -> Silver -> Gold.
+
+mover_camada() lê a origem em blocos (cursor do lado do servidor, ver
+db_connection.ler_em_blocos), aplica uma transformação em cada bloco e envia
+o resultado a um ou mais gravadores:
+
+- GravadorParquet: um único arquivo Parquet, um row group por bloco.
+- GravadorParticionado: dataset Parquet particionado (pastas coluna=valor).
+- GravadorTabela: tabela no banco, com COPY no PostgreSQL e executemany nos
+  demais bancos (ex: SQLite local).
+
+Só um bloco fica em memória por vez. Ao final, cada etapa (leitura,
+transformação, gravação) informa linhas, tempo e vazão. Os destinos só são
+substituídos se a carga inteira der certo.
+
+construir_gold_incremental() processa só as linhas da Silver que chegaram
+depois da última carga (marca d'água em uma coluna de id/timestamp de
+ingestão) e mantém as estatísticas acumuladas para a média global.
+
+Uso (reconstrói a Gold a partir da tabela obesity_silver):
+    python src/utils/camadas.py gold [--tabela obesity_gold] [--tamanho-bloco 50000]
+    python src/utils/camadas.py gold --incremental id_ingestao [--tabela obesity_gold]
+"""
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import shutil
+import sys
+import time
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import text
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.utils.db_connection import TAMANHO_BLOCO, get_data, ler_em_blocos, obter_engine
+from src.utils.cache_previsao import versao_artefato
+from src.utils.dados_gold import GOLD_PARQUET_PATH, aplicar_esquema
+
+GOLD_PARTICIONADA_DIR = os.path.join(project_root, "data", "processed", "obesity_gold_particionada")
+TABELA_SILVER = "obesity_silver"
+
+#indice_estilo_vida em SQL (mesma conta de engenharia.calcular_indices)
+EXPRESSAO_ESTILO_VIDA = ("consumo_frequente_vegetais + consumo_diario_agua"
+                         " + frequencia_semanal_atividade_fisica - tempo_uso_dispositivo")
+#Chave dos metadados do Parquet Gold com o estado da carga incremental
+CHAVE_ESTADO_INCREMENTAL = b"gold_incremental"
+
+
+class GravadorParquet:
+    """
+    Grava os blocos em um único arquivo Parquet (um row group por bloco).
+
+    Com `anexar=True`, as linhas que já estão no arquivo são copiadas antes dos
+    blocos novos (row group por row group, sem recalcular features), passando
+    por `ajustar_existentes` (pa.Table -> pa.Table), se informado. `metadados`
+    (dicionário) é gravado no esquema do arquivo, junto com os dados.
+    """
+
+    nome = "parquet"
+
+    def __init__(self, caminho, anexar=False, ajustar_existentes=None, metadados=None):
+        self.caminho = caminho
+        self.anexar = anexar and os.path.exists(caminho)
+        self.ajustar_existentes = ajustar_existentes
+        self.metadados = metadados or {}
+        self._temporario = f"{caminho}.{os.getpid()}.tmp"
+        self._escritor = None
+
+    def _abrir(self, esquema):
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        existente = pq.ParquetFile(self.caminho) if self.anexar else None
+        if existente is not None:
+            esquema = existente.schema_arrow
+        esquema = esquema.with_metadata({**(esquema.metadata or {}), **self.metadados})
+        self._escritor = pq.ParquetWriter(self._temporario, esquema)
+
+        if existente is not None:
+            for grupo in range(existente.num_row_groups):
+                tabela = existente.read_row_group(grupo)
+                if self.ajustar_existentes is not None:
+                    tabela = self.ajustar_existentes(tabela)
+                self._escritor.write_table(tabela.cast(self._escritor.schema))
+            existente.close()
+
+    def gravar(self, bloco):
+        tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+        if self._escritor is None:
+            self._abrir(tabela.schema)
+        #Todos os blocos com o esquema do primeiro (ou do arquivo existente)
+        self._escritor.write_table(tabela.cast(self._escritor.schema))
+
+    def finalizar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+            os.replace(self._temporario, self.caminho)
+
+    def abortar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+            os.remove(self._temporario)
+
+
+def _arquivos_parquet(diretorio):
+    return sorted(os.path.join(pasta, nome) for pasta, _, nomes in os.walk(diretorio)
+                  for nome in nomes if nome.endswith(".parquet"))
+
+
+class GravadorParticionado:
+    """
+    Grava os blocos em um dataset Parquet particionado por `colunas` (coluna=valor/).
+
+    Com `anexar=True`, os arquivos novos entram ao lado dos que já existem e só
+    os arquivos existentes alterados por `ajustar_existentes` são regravados.
+    """
+
+    nome = "particionado"
+
+    def __init__(self, diretorio, colunas, anexar=False, ajustar_existentes=None):
+        self.diretorio = diretorio
+        self.colunas = list(colunas)
+        self.anexar = anexar and os.path.exists(diretorio)
+        self.ajustar_existentes = ajustar_existentes
+        self._temporario = f"{diretorio}.{os.getpid()}.tmp"
+        #Nomes únicos por carga, para não sobrescrever os arquivos de cargas anteriores
+        self._prefixo = f"incremento-{time.time_ns()}-bloco" if self.anexar else "bloco"
+        self._blocos = 0
+
+    def gravar(self, bloco):
+        pq.write_to_dataset(
+            pa.Table.from_pandas(bloco, preserve_index=False),
+            self._temporario,
+            partition_cols=self.colunas,
+            basename_template=f"{self._prefixo}-{self._blocos:05d}-{{i}}.parquet",
+        )
+        self._blocos += 1
+
+    def _ajustar_arquivo(self, arquivo):
+        tabela = pq.read_table(arquivo)
+        ajustada = self.ajustar_existentes(tabela)
+        if ajustada.equals(tabela):
+            return
+        temporario = f"{arquivo}.{os.getpid()}.tmp"
+        pq.write_table(ajustada, temporario)
+        os.replace(temporario, arquivo)
+
+    def finalizar(self):
+        if self._blocos == 0:
+            return
+        if not self.anexar:
+            if os.path.exists(self.diretorio):
+                shutil.rmtree(self.diretorio)
+            os.replace(self._temporario, self.diretorio)
+            return
+
+        if self.ajustar_existentes is not None:
+            for arquivo in _arquivos_parquet(self.diretorio):
+                self._ajustar_arquivo(arquivo)
+        for arquivo in _arquivos_parquet(self._temporario):
+            destino = os.path.join(self.diretorio, os.path.relpath(arquivo, self._temporario))
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            os.replace(arquivo, destino)
+        shutil.rmtree(self._temporario)
+
+    def abortar(self):
+        shutil.rmtree(self._temporario, ignore_errors=True)
+
+
+class GravadorTabela:
+    """
+    Grava os blocos em uma tabela do banco, substituindo-a (ou, com
+    `substituir=False`, acrescentando as linhas), em uma única transação.
+    PostgreSQL: COPY FROM STDIN (CSV em memória); outros bancos: INSERT com
+    executemany. `comandos_finais` ([(sql, params)]) rodam na mesma transação,
+    depois da carga. No SQLite, a tabela de destino precisa estar em outro
+    arquivo que não o da origem (o cursor de leitura bloqueia o arquivo).
+    """
+
+    nome = "tabela"
+
+    def __init__(self, tabela, engine=None, substituir=True, comandos_finais=()):
+        self.tabela = tabela
+        self.engine = engine or obter_engine()
+        self.substituir = substituir
+        self.comandos_finais = list(comandos_finais)
+        self._conexao = None
+        self._transacao = None
+
+    def gravar(self, bloco):
+        if self._conexao is None:
+            self._conexao = self.engine.connect()
+            self._transacao = self._conexao.begin()
+            #Cria (ou recria) a tabela vazia com as colunas do primeiro bloco
+            bloco.head(0).to_sql(self.tabela, self._conexao,
+                                 if_exists="replace" if self.substituir else "append", index=False)
+
+        if self.engine.dialect.name == "postgresql":
+            self._copiar(bloco)
+        else:
+            bloco.to_sql(self.tabela, self._conexao, if_exists="append", index=False)
+
+    def _copiar(self, bloco):
+        buffer = io.StringIO()
+        bloco.to_csv(buffer, index=False, header=False, quoting=csv.QUOTE_MINIMAL)
+        buffer.seek(0)
+        colunas = ", ".join(f'"{coluna}"' for coluna in bloco.columns)
+        cursor = self._conexao.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(f'COPY "{self.tabela}" ({colunas}) FROM STDIN WITH (FORMAT csv)', buffer)
+        finally:
+            cursor.close()
+
+    def finalizar(self):
+        if self._conexao is not None:
+            for comando, params in self.comandos_finais:
+                self._conexao.execute(text(comando), params)
+            self._transacao.commit()
+            self._conexao.close()
+
+    def abortar(self):
+        if self._conexao is not None:
+            self._transacao.rollback()
+            self._conexao.close()
+
+
+def _registrar(estatisticas, etapa, linhas, segundos):
+    linhas_total, segundos_total = estatisticas.get(etapa, (0, 0.0))
+    estatisticas[etapa] = (linhas_total + linhas, segundos_total + segundos)
+
+
+def exibir_estatisticas(estatisticas):
+    """Linhas, tempo e vazão de cada etapa da movimentação."""
+    for etapa, (linhas, segundos) in estatisticas.items():
+        print(f"  {etapa:<22} {linhas:>10,} linhas em {segundos:7.2f} s ({linhas / max(segundos, 1e-9):>12,.0f} linhas/s)")
+
+
+def mover_camada(consulta, gravadores, transformar=None, tamanho_bloco=TAMANHO_BLOCO, params=None):
+    """
+    Executa `consulta` em blocos, aplica `transformar` (bloco -> bloco) e envia
+    cada bloco a todos os `gravadores`. Retorna {etapa: (linhas, segundos)}.
+    Em caso de erro, nenhum destino é alterado.
+    """
+    estatisticas = {}
+    blocos = ler_em_blocos(consulta, tamanho_bloco, params=params)
+    try:
+        numero = 0
+        while True:
+            inicio = time.perf_counter()
+            bloco = next(blocos, None)
+            if bloco is None:
+                break
+            _registrar(estatisticas, "leitura", len(bloco), time.perf_counter() - inicio)
+
+            if transformar is not None:
+                inicio = time.perf_counter()
+                bloco = transformar(bloco)
+                _registrar(estatisticas, "transformacao", len(bloco), time.perf_counter() - inicio)
+
+            for gravador in gravadores:
+                inicio = time.perf_counter()
+                gravador.gravar(bloco)
+                _registrar(estatisticas, f"gravacao_{gravador.nome}", len(bloco), time.perf_counter() - inicio)
+
+            numero += 1
+            print(f"Bloco {numero}: {estatisticas['leitura'][0]:,} linhas lidas")
+    except BaseException:
+        blocos.close()
+        for gravador in gravadores:
+            gravador.abortar()
+        raise
+
+    for gravador in gravadores:
+        inicio = time.perf_counter()
+        gravador.finalizar()
+        _registrar(estatisticas, f"gravacao_{gravador.nome}", 0, time.perf_counter() - inicio)
+    return estatisticas
+
+
+def media_estilo_vida_silver(tabela=TABELA_SILVER):
+    """Média global do índice de estilo de vida, calculada pelo próprio banco (sem trazer as linhas)."""
+    consulta = f"SELECT AVG(CAST({EXPRESSAO_ESTILO_VIDA} AS FLOAT)) AS media FROM {tabela}"
+    return float(get_data(consulta)["media"].iloc[0])
+
+
+def construir_gold(tabela_silver=TABELA_SILVER, caminho_parquet=GOLD_PARQUET_PATH,
+                   diretorio_particionado=GOLD_PARTICIONADA_DIR, tabela_gold=None,
+                   tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Reconstrói a Gold a partir da Silver em blocos: o Parquet lido pelo
+    treino/app, o dataset particionado por classe OMS e, opcionalmente,
+    a tabela `tabela_gold` no banco.
+    """
+    from src.features.engenharia import construir_features_gold
+
+    print("--- [1/2] Calculando a média global do índice de estilo de vida (no banco)... ---")
+    media = media_estilo_vida_silver(tabela_silver)
+    print(f"Média do índice de estilo de vida: {media:.4f}")
+
+    print(f"--- [2/2] Movendo {tabela_silver} -> Gold em blocos de {tamanho_bloco:,} linhas... ---")
+    gravadores = [
+        GravadorParquet(caminho_parquet),
+        GravadorParticionado(diretorio_particionado, ["classe_peso_oms"]),
+    ]
+    if tabela_gold:
+        gravadores.append(GravadorTabela(tabela_gold))
+
+    estatisticas = mover_camada(
+        f"SELECT * FROM {tabela_silver}",
+        gravadores,
+        transformar=lambda bloco: aplicar_esquema(construir_features_gold(bloco, media)),
+        tamanho_bloco=tamanho_bloco,
+    )
+    exibir_estatisticas(estatisticas)
+    return estatisticas
+
+
+def versao_engenharia():
+    """Hash do módulo de features: se ele mudar, a Gold precisa ser refeita do zero."""
+    from src.features import engenharia
+    return versao_artefato(engenharia.__file__)[:16]
+
+
+def carregar_estado_incremental(caminho_parquet=GOLD_PARQUET_PATH):
+    """
+    Estado da última carga incremental, gravado nos metadados do próprio
+    Parquet Gold (é substituído junto com os dados, nunca fica defasado):
+    coluna_marca, marca (maior valor já processado), linhas e
+    soma_estilo_vida. None se o arquivo não existe ou não veio de uma carga
+    incremental.
+    """
+    if not os.path.exists(caminho_parquet):
+        return None
+    metadados = pq.read_schema(caminho_parquet).metadata or {}
+    if CHAVE_ESTADO_INCREMENTAL not in metadados:
+        return None
+    return json.loads(metadados[CHAVE_ESTADO_INCREMENTAL])
+
+
+def resumo_novas_linhas(tabela, coluna_marca, marca=None):
+    """
+    Linhas da Silver depois de `marca` (todas, se None), agregadas pelo banco:
+    quantidade, soma do índice de estilo de vida e a nova marca (MAX).
+    """
+    filtro = f" WHERE {coluna_marca} > :marca" if marca is not None else ""
+    consulta = (f"SELECT COUNT(*) AS linhas, SUM({EXPRESSAO_ESTILO_VIDA}) AS soma, MAX({coluna_marca}) AS marca"
+                f" FROM {tabela}{filtro}")
+    resumo = get_data(consulta, params={"marca": marca} if marca is not None else None).iloc[0]
+    linhas = int(resumo["linhas"])
+    if linhas == 0:
+        return 0, 0, marca
+    nova_marca = resumo["marca"]
+    #Tipos NumPy/pandas -> tipos do Python (vão para o JSON do estado e para os parâmetros SQL)
+    nova_marca = nova_marca.item() if hasattr(nova_marca, "item") else nova_marca
+    return linhas, int(resumo["soma"]), nova_marca
+
+
+def ajuste_comportamento_saudavel(media_estilo_vida):
+    """Recalcula comportamento_saudavel de uma pa.Table já gravada com a nova média global."""
+    def ajustar(tabela):
+        posicao = tabela.schema.get_field_index("comportamento_saudavel")
+        campo = tabela.schema.field(posicao)
+        novo = pc.greater(tabela["indice_estilo_vida"], media_estilo_vida).cast(campo.type)
+        return tabela.set_column(posicao, campo, novo)
+    return ajustar
+
+
+def construir_gold_incremental(coluna_marca, tabela_silver=TABELA_SILVER, caminho_parquet=GOLD_PARQUET_PATH,
+                               diretorio_particionado=GOLD_PARTICIONADA_DIR, tabela_gold=None,
+                               tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Atualiza a Gold só com as linhas da Silver que chegaram depois da última
+    carga. `coluna_marca` é uma coluna crescente da Silver (id de ingestão ou
+    timestamp); o maior valor já processado (marca d'água), a quantidade de
+    linhas e a soma do índice de estilo de vida ficam nos metadados do Parquet.
+
+    - As features são calculadas só para as linhas novas.
+    - A média global de indice_estilo_vida vem das estatísticas acumuladas
+      (soma / linhas), sem reler a Silver.
+    - comportamento_saudavel das linhas antigas (índice > média) só muda se a
+      parte inteira da média mudar, porque o índice é inteiro. Nesse caso a
+      coluna é recalculada a partir do indice_estilo_vida já gravado.
+
+    Sem estado (primeira carga, ou a engenharia de features mudou), faz a
+    carga completa. Linhas com `coluna_marca` nula não são processadas.
+    """
+    from src.features.engenharia import construir_features_gold
+
+    versao = versao_engenharia()
+    estado = carregar_estado_incremental(caminho_parquet)
+    if estado is not None and (estado["coluna_marca"] != coluna_marca or estado["versao_engenharia"] != versao):
+        print("Estado incremental de outra coluna de marca ou de outra engenharia de features: refazendo a Gold.")
+        estado = None
+    if estado is None:
+        estado = {"coluna_marca": coluna_marca, "versao_engenharia": versao,
+                  "marca": None, "linhas": 0, "soma_estilo_vida": 0}
+
+    print(f"--- [1/2] Procurando linhas novas em {tabela_silver} (marca: {estado['marca']})... ---")
+    linhas, soma, marca = resumo_novas_linhas(tabela_silver, coluna_marca, estado["marca"])
+    if linhas == 0:
+        print("Nenhuma linha nova: a Gold já está atualizada.")
+        return {}
+
+    anexar = estado["linhas"] > 0
+    media_anterior = estado["soma_estilo_vida"] / estado["linhas"] if anexar else None
+    novo_estado = {**estado, "marca": marca, "linhas": estado["linhas"] + linhas,
+                   "soma_estilo_vida": estado["soma_estilo_vida"] + soma}
+    media = novo_estado["soma_estilo_vida"] / novo_estado["linhas"]
+    #Índice inteiro: (índice > média) <=> (índice > floor(média))
+    ajustar = anexar and math.floor(media) != math.floor(media_anterior)
+    print(f"{linhas:,} linhas novas (até {marca}). Média do índice de estilo de vida: {media:.4f}"
+          + (" -> recalculando comportamento_saudavel das linhas antigas" if ajustar else ""))
+
+    ajuste = ajuste_comportamento_saudavel(media) if ajustar else None
+    gravadores = [
+        GravadorParquet(caminho_parquet, anexar=anexar, ajustar_existentes=ajuste,
+                        metadados={CHAVE_ESTADO_INCREMENTAL: json.dumps(novo_estado, default=str)}),
+        GravadorParticionado(diretorio_particionado, ["classe_peso_oms"], anexar=anexar, ajustar_existentes=ajuste),
+    ]
+    if tabela_gold:
+        comandos = []
+        if ajustar:
+            comandos.append((f"UPDATE {tabela_gold} SET comportamento_saudavel ="
+                             " CASE WHEN indice_estilo_vida > :media THEN 1 ELSE 0 END", {"media": media}))
+        gravadores.append(GravadorTabela(tabela_gold, substituir=not anexar, comandos_finais=comandos))
+
+    #Limita à nova marca: linhas que chegarem durante a carga ficam para a próxima
+    filtro = f"{coluna_marca} <= :ate" if not anexar else f"{coluna_marca} > :de AND {coluna_marca} <= :ate"
+    print(f"--- [2/2] Movendo as linhas novas -> Gold em blocos de {tamanho_bloco:,} linhas... ---")
+    estatisticas = mover_camada(
+        f"SELECT * FROM {tabela_silver} WHERE {filtro} ORDER BY {coluna_marca}",
+        gravadores,
+        transformar=lambda bloco: aplicar_esquema(construir_features_gold(bloco.drop(columns=[coluna_marca]), media)),
+        tamanho_bloco=tamanho_bloco,
+        params={"de": estado["marca"], "ate": marca},
+    )
+    exibir_estatisticas(estatisticas)
+    return estatisticas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Movimentação em massa entre as camadas do medalhão.")
+    parser.add_argument("camada", choices=["gold"], help="Camada a reconstruir.")
+    parser.add_argument("--origem", default=TABELA_SILVER, help="Tabela de origem (Silver).")
+    parser.add_argument("--tabela", default=None, help="Também grava a Gold nesta tabela do banco.")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO)
+    parser.add_argument("--incremental", metavar="COLUNA_MARCA", default=None,
+                        help="Processa só as linhas com COLUNA_MARCA (id/timestamp de ingestão) maior que a última carga.")
+    args = parser.parse_args(argv)
+
+    if args.incremental:
+        construir_gold_incremental(args.incremental, args.origem, tabela_gold=args.tabela,
+                                   tamanho_bloco=args.tamanho_bloco)
+    else:
+        construir_gold(args.origem, tabela_gold=args.tabela, tamanho_bloco=args.tamanho_bloco)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# src/utils/cubo_analitico.py
+"""
+Cubo de agregados do Painel Analítico.
+
+Os gráficos do painel não precisam das linhas da base Gold, só de resumos:
+contagens por classe x gênero, quantis/faixas de IMC por classe e os cinco
+números dos boxplots dos índices. construir_cubo() calcula tudo de uma vez
+(uma passada de groupby por tabela) e o painel desenha os gráficos a partir
+dessas tabelas pequenas. Assim o custo da página e o volume enviado ao
+navegador não crescem com o número de linhas da base.
+
+Uso (tempo de construção e tamanho de cada tabela do cubo):
+    python src/utils/cubo_analitico.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+#Largura (em pontos de IMC) das faixas do histograma de IMC por classe
+LARGURA_FAIXA_IMC = 1.0
+
+#Boxplots calculados a partir de resumos: (nome da tabela, classe, coluna numérica, cor)
+BOXPLOTS = {
+    "imc_classe_genero": ("classe_peso_corporal", "IMC", "genero"),
+    "estilo_vida_oms": ("classe_peso_oms", "indice_estilo_vida", None),
+    "risco_alimentar_oms": ("classe_peso_oms", "indice_risco_alimentar", None),
+}
+
+
+def _ordem_aparicao(serie):
+    """Categorias na ordem em que aparecem na base (a mesma ordem do px.histogram)."""
+    return [str(valor) for valor in pd.unique(serie.dropna())]
+
+
+def contagem(df, coluna, cor=None):
+    """Contagem de linhas por `coluna` (e por `cor`, se informada)."""
+    chaves = [coluna] if cor is None else [coluna, cor]
+    return df.groupby(chaves, observed=True, sort=False).size().rename("contagem").reset_index()
+
+
+def resumo_boxplot(df, coluna, valor, cor=None):
+    """
+    Cinco números do boxplot por grupo, no mesmo critério do Plotly: quartis
+    por interpolação linear e bigodes no valor mais extremo dentro de
+    1,5 x IQR. Inclui contagem e média (usadas também na tabela de prova).
+    """
+    chaves = [coluna] if cor is None else [coluna, cor]
+    grupos = df.groupby(chaves, observed=True, sort=False)[valor]
+    resumo = grupos.quantile([0.25, 0.5, 0.75]).unstack()
+    resumo.columns = ["q1", "mediana", "q3"]
+    resumo = resumo.join(grupos.agg(["count", "min", "mean", "max"]))
+
+    #Limites dos bigodes: só as linhas dentro de [q1 - 1,5 IQR, q3 + 1,5 IQR]
+    iqr = resumo["q3"] - resumo["q1"]
+    limites = pd.DataFrame({"inferior": resumo["q1"] - 1.5 * iqr, "superior": resumo["q3"] + 1.5 * iqr})
+    linhas = df[chaves + [valor]].join(limites, on=chaves)
+    dentro = linhas[(linhas[valor] >= linhas["inferior"]) & (linhas[valor] <= linhas["superior"])]
+    bigodes = dentro.groupby(chaves, observed=True, sort=False)[valor].agg(["min", "max"])
+    resumo["limite_inferior"] = bigodes["min"]
+    resumo["limite_superior"] = bigodes["max"]
+    return resumo.astype("float64").reset_index()
+
+
+def faixas_imc(df, coluna, largura=LARGURA_FAIXA_IMC):
+    """Histograma do IMC por classe: contagem por faixa de `largura` pontos."""
+    imc = df["IMC"].astype("float64")
+    bordas = np.arange(np.floor(imc.min()), np.ceil(imc.max()) + largura, largura)
+    faixa = pd.cut(imc, bordas, right=False)
+    faixas = df[[coluna]].assign(faixa=faixa).groupby([coluna, "faixa"], observed=True, sort=False).size()
+    faixas = faixas.rename("contagem").reset_index()
+    faixas["inicio"] = faixas["faixa"].map(lambda intervalo: intervalo.left).astype("float64")
+    return faixas.drop(columns="faixa")
+
+
+def construir_cubo(df):
+    """Todas as tabelas de que o painel precisa, calculadas a partir da base Gold."""
+    contagem_genero = df["genero"].value_counts()
+    cubo = {
+        "metricas": {
+            "total": len(df),
+            "idade_media": float(df["idade"].mean()),
+            "imc_medio": float(df["IMC"].mean()),
+            "taxa_saudavel": float(df["comportamento_saudavel"].mean()),
+            "contagem_genero": {str(genero): int(n) for genero, n in contagem_genero.items()},
+        },
+        "ordem": {
+            "classe_peso_corporal": _ordem_aparicao(df["classe_peso_corporal"]),
+            "classe_peso_oms": _ordem_aparicao(df["classe_peso_oms"]),
+        },
+        "contagem_classe": contagem(df, "classe_peso_corporal"),
+        "contagem_classe_genero": contagem(df, "classe_peso_corporal", "genero"),
+        "contagem_oms": contagem(df, "classe_peso_oms"),
+        "contagem_oms_genero": contagem(df, "classe_peso_oms", "genero"),
+        "faixas_imc_oms": faixas_imc(df, "classe_peso_oms"),
+    }
+    for nome, (coluna, valor, cor) in BOXPLOTS.items():
+        cubo[nome] = resumo_boxplot(df, coluna, valor, cor)
+    return cubo
+
+
+def main():
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    if project_root not in sys.path:
+        sys.path.append(project_root)
+    from src.utils.dados_gold import carregar_gold
+
+    df = carregar_gold()
+    inicio = time.perf_counter()
+    cubo = construir_cubo(df)
+    tempo = time.perf_counter() - inicio
+
+    print(f"Cubo construído a partir de {len(df):,} linhas em {tempo * 1000:.1f} ms")
+    for nome, tabela in cubo.items():
+        if isinstance(tabela, pd.DataFrame):
+            print(f"  {nome:<24} {len(tabela):>4} linhas")
+
+
+if __name__ == "__main__":
+    main()
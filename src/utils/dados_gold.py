@@ -0,0 +1,108 @@
+# src/utils/dados_gold.py
+"""
+Camada de armazenamento da base Gold (obesity_gold).
+
+A base é gravada em Parquet com um esquema explícito: colunas de texto como
+`category` e colunas numéricas pequenas como int8/float32. Assim a leitura
+não precisa interpretar texto nem inferir tipos, e o DataFrame ocupa uma
+fração da memória. O CSV continua sendo gerado pelo notebook e serve de
+fallback quando o Parquet não existe (ou está desatualizado).
+
+Todos os consumidores (treino, SHAP e painel analítico) carregam a base por
+carregar_gold().
+
+Uso (converte o CSV atual para Parquet):
+    python src/utils/dados_gold.py
+"""
+import os
+import time
+
+import pandas as pd
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+GOLD_CSV_PATH = os.path.join(project_root, "data", "processed", "obesity_gold.csv")
+GOLD_PARQUET_PATH = os.path.join(project_root, "data", "processed", "obesity_gold.parquet")
+
+COLUNAS_CATEGORICAS = [
+    'genero', 'historico_familiar', 'consumo_frequente_alimentos_caloricos',
+    'consumo_lanches_entre_refeicoes', 'habito_fumar', 'monitora_caloria_diaria',
+    'consumo_bebida_alcoolica', 'transporte_habitual',
+    'classe_peso_corporal', 'classe_peso_oms',
+]
+#Inteiros pequenos (idade, escalas do questionário e índices derivados)
+COLUNAS_INT8 = [
+    'idade', 'consumo_frequente_vegetais', 'numero_refeicoes_principais_dia',
+    'consumo_diario_agua', 'frequencia_semanal_atividade_fisica', 'tempo_uso_dispositivo',
+    'indice_estilo_vida', 'risco_alimentos_caloricos_num', 'risco_lanches_num',
+    'risco_alcool_num', 'indice_risco_alimentar', 'comportamento_saudavel',
+]
+COLUNAS_FLOAT32 = ['altura_m', 'peso_kg', 'IMC']
+
+ESQUEMA_GOLD = {
+    **{coluna: "category" for coluna in COLUNAS_CATEGORICAS},
+    **{coluna: "int8" for coluna in COLUNAS_INT8},
+    **{coluna: "float32" for coluna in COLUNAS_FLOAT32},
+}
+
+
+def aplicar_esquema(df):
+    """Converte as colunas conhecidas para os tipos do esquema Gold."""
+    return df.astype({coluna: tipo for coluna, tipo in ESQUEMA_GOLD.items() if coluna in df.columns})
+
+
+def salvar_gold(df, caminho=GOLD_PARQUET_PATH):
+    """Grava a base Gold em Parquet já com o esquema aplicado."""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    aplicar_esquema(df).to_parquet(caminho, index=False)
+    return caminho
+
+
+def caminho_gold(caminho_parquet=GOLD_PARQUET_PATH, caminho_csv=GOLD_CSV_PATH):
+    """
+    Arquivo de onde a base é lida: o Parquet, a menos que ele não exista ou
+    que o CSV seja mais novo (ex: notebook rodado sem gerar o Parquet).
+    """
+    if os.path.exists(caminho_parquet):
+        if not os.path.exists(caminho_csv) or os.path.getmtime(caminho_parquet) >= os.path.getmtime(caminho_csv):
+            return caminho_parquet
+    return caminho_csv
+
+
+def ler_gold(caminho, colunas=None):
+    """Lê um arquivo Gold (Parquet ou CSV) com o esquema tipado (opcionalmente só `colunas`)."""
+    if caminho.endswith(".parquet"):
+        return pd.read_parquet(caminho, columns=colunas)
+
+    #No CSV os tipos já são passados na leitura (sem inferência nem strings em object)
+    tipos = {coluna: tipo for coluna, tipo in ESQUEMA_GOLD.items() if colunas is None or coluna in colunas}
+    return aplicar_esquema(pd.read_csv(caminho, usecols=colunas, dtype=tipos))
+
+
+def carregar_gold(colunas=None, caminho_parquet=GOLD_PARQUET_PATH, caminho_csv=GOLD_CSV_PATH):
+    """
+    Carrega a base Gold: o Parquet, ou o CSV quando o Parquet não existe ou
+    está desatualizado. Levanta FileNotFoundError se nenhum dos dois existir.
+    """
+    return ler_gold(caminho_gold(caminho_parquet, caminho_csv), colunas)
+
+
+def main():
+    print(f"--- [1/2] Lendo {GOLD_CSV_PATH}... ---")
+    inicio = time.perf_counter()
+    df_csv = pd.read_csv(GOLD_CSV_PATH)
+    tempo_csv = time.perf_counter() - inicio
+    memoria_csv = df_csv.memory_usage(deep=True).sum() / 1024 ** 2
+
+    print(f"--- [2/2] Gravando {GOLD_PARQUET_PATH}... ---")
+    salvar_gold(df_csv)
+    inicio = time.perf_counter()
+    df_parquet = carregar_gold()
+    tempo_parquet = time.perf_counter() - inicio
+    memoria_parquet = df_parquet.memory_usage(deep=True).sum() / 1024 ** 2
+
+    print(f"CSV:     {tempo_csv * 1000:7.1f} ms, {memoria_csv:6.2f} MB em memória")
+    print(f"Parquet: {tempo_parquet * 1000:7.1f} ms, {memoria_parquet:6.2f} MB em memória")
+
+
+if __name__ == "__main__":
+    main()
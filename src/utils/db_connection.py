@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
 import pandas as pd
 
@@ -7,34 +7,104 @@ import pandas as pd
 #Carrega as variaveis de ambiente do arquivo .env
 load_dotenv()
 
-#Lê as variáveis de ambiente necessárias para a conexão com o banco de dados
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT")
-DB_NAME = os.getenv("DB_NAME")
+#Variáveis obrigatórias para montar a conexão com o PostgreSQL
+VARIAVEIS_CONEXAO = ["DB_USER", "DB_PASSWORD", "DB_HOST", "DB_PORT", "DB_NAME"]
 
-#Cria a string de conexão com o banco de dados PostgreSQL
-DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+#Linhas por bloco na leitura em streaming
+TAMANHO_BLOCO = 50_000
 
-#Cria o engine de conexão com o banco de dados
-engine = create_engine(DATABASE_URL)
+#O engine só é criado no primeiro uso (importar o módulo não abre conexão)
+_engine = None
 
-def get_data(query: str) -> pd.DataFrame:
+
+def montar_url():
     """
-    Executa uma consulta SQL e retorna os resultados em um DataFrame do Pandas.
+    String de conexão: DATABASE_URL, se definida (ex: sqlite:///dados.db para
+    testes locais), ou PostgreSQL a partir das variáveis DB_*.
     """
-    with engine.connect() as connection:
-        df = pd.read_sql(query, connection)
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
+
+    faltando = [nome for nome in VARIAVEIS_CONEXAO if not os.getenv(nome)]
+    if faltando:
+        raise RuntimeError(f"Variáveis de ambiente ausentes para a conexão com o banco: {', '.join(faltando)}")
+    valores = {nome: os.getenv(nome) for nome in VARIAVEIS_CONEXAO}
+    return (f"postgresql+psycopg2://{valores['DB_USER']}:{valores['DB_PASSWORD']}"
+            f"@{valores['DB_HOST']}:{valores['DB_PORT']}/{valores['DB_NAME']}")
+
+
+def opcoes_pool(url):
+    """Configuração do pool de conexões (variáveis DB_POOL_*); o SQLite usa o pool padrão."""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_POOL_MAX_OVERFLOW", "10")),
+        #Recicla conexões antigas (evita conexões derrubadas pelo servidor/firewall)
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    }
+
+
+def obter_engine():
+    """Cria (na primeira chamada) e retorna o engine de conexão com o banco de dados."""
+    global _engine
+    if _engine is None:
+        url = montar_url()
+        _engine = create_engine(url, **opcoes_pool(url))
+    return _engine
+
+
+def configurar_engine(url=None, **opcoes):
+    """
+    Substitui o engine atual (ex: um SQLite local no lugar do PostgreSQL).
+    Sem argumentos, descarta o engine para que seja recriado a partir do ambiente.
+    """
+    global _engine
+    if _engine is not None:
+        _engine.dispose()
+    _engine = create_engine(url, **{**opcoes_pool(url), **opcoes}) if url else None
+    return _engine
+
+
+def __getattr__(nome):
+    #Compatibilidade: `from src.utils.db_connection import engine`
+    if nome == "engine":
+        return obter_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+
+def get_data(query: str, params=None) -> pd.DataFrame:
+    """
+    Executa uma consulta SQL (com parâmetros nomeados opcionais, ex: `:marca`)
+    e retorna os resultados em um DataFrame do Pandas.
+    Para tabelas grandes, prefira ler_em_blocos().
+    """
+    with obter_engine().connect() as connection:
+        df = pd.read_sql(text(query), connection, params=params)
     return df
 
-def test_connection():    
+
+def ler_em_blocos(query: str, tamanho_bloco: int = TAMANHO_BLOCO, params=None, dtype=None):
+    """
+    Executa a consulta e devolve os resultados aos poucos, em DataFrames de
+    até `tamanho_bloco` linhas. Usa cursor do lado do servidor (stream_results),
+    então só um bloco fica em memória por vez, qualquer que seja o tamanho da tabela.
+    """
+    with obter_engine().connect() as connection:
+        connection = connection.execution_options(stream_results=True, max_row_buffer=tamanho_bloco)
+        for bloco in pd.read_sql(text(query), connection, params=params, chunksize=tamanho_bloco, dtype=dtype):
+            yield bloco
+
+
+def test_connection():
     """
     Testa a conexão com o banco de dados.
     """
     try:
-        with engine.connect() as connection:
-            print("Conexão bem-sucedida ao banco de dados!")   
+        with obter_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+            print("Conexão bem-sucedida ao banco de dados!")
     except Exception as e:
             print(f"Erro ao conectar ao banco de dados: {e}")
-        
\ No newline at end of file
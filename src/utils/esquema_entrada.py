@@ -0,0 +1,236 @@
+# src/utils/esquema_entrada.py
+"""
+Contrato de entrada do modelo, compilado uma vez na carga.
+
+A cada chamada, o ColumnTransformer treinado procura as colunas do
+DataFrame pelo nome, aplica cada transformador e concatena os pedaços. O
+EsquemaEntrada faz esse trabalho uma vez só, a partir do pré-processador
+ajustado, e guarda:
+- a ordem das colunas de entrada (feature_names_in_) e o tipo de cada uma;
+- as categorias aceitas de cada coluna categórica (categories_ do
+  OneHotEncoder), já como dicionário categoria -> posição na matriz de saída;
+- média e escala do StandardScaler de cada coluna numérica.
+
+Com ele:
+- validar(dados) confere colunas, tipos e categorias, com uma mensagem que
+  diz o que está errado (ex: na carga de uma versão nova do modelo, contra a
+  saída da engenharia de features);
+- transformar(dados) escreve direto em uma matriz NumPy alocada uma vez, a
+  partir de um dicionário de arrays (sem montar DataFrame) ou de um
+  DataFrame, e o resultado vai direto para o estimador final do pipeline.
+
+Os blocos são os mesmos do modelo compacto (src/models/export_model.py).
+"""
+import numpy as np
+import pandas as pd
+
+TIPO_NUMERICO = "numerico"
+TIPO_CATEGORICO = "categorico"
+
+#Até quantas linhas cada valor é procurado no dicionário (acima disso, só os valores distintos, via pd.factorize)
+LIMITE_CONSULTA_DIRETA = 64
+
+
+def compilar_preprocessador(preprocessor):
+    """Converte o ColumnTransformer treinado em blocos (metadados) + arrays."""
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    colunas_entrada = list(preprocessor.feature_names_in_)
+    blocos, arrays = [], {}
+    for nome, transformador, colunas in preprocessor.transformers_:
+        #O remainder vem com as posições das colunas, não os nomes
+        colunas = [colunas_entrada[c] if isinstance(c, (int, np.integer)) else c for c in colunas]
+        if transformador == "drop" or not colunas:
+            continue
+        if transformador == "passthrough":
+            blocos.append({"tipo": TIPO_NUMERICO, "colunas": colunas})
+            continue
+
+        etapas = transformador.steps if hasattr(transformador, "steps") else [(nome, transformador)]
+        if len(etapas) != 1:
+            raise ValueError(f"Transformador '{nome}' com mais de uma etapa não é suportado.")
+        etapa = etapas[0][1]
+
+        if isinstance(etapa, StandardScaler):
+            bloco = {"tipo": TIPO_NUMERICO, "colunas": colunas}
+            if etapa.with_mean:
+                bloco["media"] = f"{nome}_media"
+                arrays[bloco["media"]] = np.asarray(etapa.mean_, dtype=np.float64)
+            if etapa.with_std:
+                bloco["escala"] = f"{nome}_escala"
+                arrays[bloco["escala"]] = np.asarray(etapa.scale_, dtype=np.float64)
+            blocos.append(bloco)
+        elif isinstance(etapa, OneHotEncoder):
+            if etapa.drop is not None:
+                raise ValueError("OneHotEncoder com 'drop' não é suportado.")
+            #Categoria nova vira linha de zeros: só equivale ao sklearn com handle_unknown='ignore'
+            if etapa.handle_unknown != "ignore":
+                raise ValueError(f"OneHotEncoder com handle_unknown={etapa.handle_unknown!r} não é suportado.")
+            #Categorias raras agrupadas (min_frequency/max_categories) dividem a mesma coluna
+            if any(infrequentes is not None for infrequentes in getattr(etapa, "infrequent_categories_", [])):
+                raise ValueError("OneHotEncoder com categorias infrequentes não é suportado.")
+            blocos.append({
+                "tipo": TIPO_CATEGORICO,
+                "colunas": colunas,
+                "categorias": [[str(c) for c in categorias] for categorias in etapa.categories_],
+            })
+        else:
+            raise ValueError(f"Transformador não suportado: {type(etapa).__name__}")
+
+    n_saida = sum(
+        len(b["colunas"]) if b["tipo"] == TIPO_NUMERICO else sum(len(c) for c in b["categorias"])
+        for b in blocos
+    )
+    return blocos, arrays, n_saida
+
+
+class EsquemaEntrada:
+    """Colunas de entrada, tipos, categorias e parâmetros do scaler, na ordem da matriz do modelo."""
+
+    def __init__(self, colunas_entrada, blocos, arrays):
+        self.colunas = [str(coluna) for coluna in colunas_entrada]
+        self.tipos = {}
+        self.categorias = {}
+        self._numericos = []
+        self._categoricos = []
+
+        posicao = 0
+        for bloco in blocos:
+            colunas = list(bloco["colunas"])
+            if bloco["tipo"] == TIPO_NUMERICO:
+                media = arrays[bloco["media"]] if "media" in bloco else None
+                escala = arrays[bloco["escala"]] if "escala" in bloco else None
+                self._numericos.append((posicao, colunas, media, escala))
+                self.tipos.update(dict.fromkeys(colunas, TIPO_NUMERICO))
+                posicao += len(colunas)
+            else:
+                for coluna, categorias in zip(colunas, bloco["categorias"]):
+                    self._categoricos.append((coluna, posicao, dict(zip(categorias, range(len(categorias))))))
+                    self.tipos[coluna] = TIPO_CATEGORICO
+                    self.categorias[coluna] = list(categorias)
+                    posicao += len(categorias)
+        self.n_saida = posicao
+
+    @classmethod
+    def do_preprocessador(cls, preprocessor):
+        """Compila o ColumnTransformer ajustado (ValueError se algum transformador não é suportado)."""
+        blocos, arrays, _ = compilar_preprocessador(preprocessor)
+        return cls(preprocessor.feature_names_in_, blocos, arrays)
+
+    def descrever(self):
+        """Uma linha por coluna de entrada: posição, tipo, categorias aceitas ou média/escala."""
+        linhas = {coluna: {"posicao": i, "tipo": self.tipos.get(coluna, "ignorada")}
+                  for i, coluna in enumerate(self.colunas)}
+        for _, colunas, media, escala in self._numericos:
+            for j, coluna in enumerate(colunas):
+                linhas[coluna]["media"] = None if media is None else float(media[j])
+                linhas[coluna]["escala"] = None if escala is None else float(escala[j])
+        for coluna, categorias in self.categorias.items():
+            linhas[coluna]["categorias"] = ", ".join(categorias)
+        descricao = pd.DataFrame.from_dict(linhas, orient="index")
+        descricao.index.name = "coluna"
+        return descricao
+
+    def validar(self, dados):
+        """
+        Confere `dados` (DataFrame ou dicionário de colunas) contra o esquema:
+        colunas ausentes (KeyError), valores não numéricos ou não finitos nas
+        numéricas e categorias que o OneHotEncoder não viu no treino
+        (ValueError; na previsão elas viram uma linha de zeros).
+        """
+        ausentes = [coluna for coluna in self.colunas if coluna not in dados]
+        if ausentes:
+            raise KeyError(f"Colunas ausentes para o modelo: {ausentes}")
+
+        problemas = []
+        for _, colunas, _, _ in self._numericos:
+            for coluna in colunas:
+                try:
+                    valores = np.asarray(dados[coluna], dtype=np.float64)
+                except (TypeError, ValueError):
+                    problemas.append(f"'{coluna}' não é numérica")
+                    continue
+                if not np.isfinite(valores).all():
+                    problemas.append(f"'{coluna}' tem valores ausentes ou infinitos")
+        for coluna, _, posicoes in self._categoricos:
+            valores = pd.unique(np.asarray(dados[coluna], dtype=object))
+            desconhecidas = [valor for valor in valores if valor not in posicoes]
+            if desconhecidas:
+                problemas.append(f"'{coluna}' com categorias fora do treino: {desconhecidas}")
+        if problemas:
+            raise ValueError("Entrada incompatível com o modelo: " + "; ".join(problemas))
+
+    def transformar(self, dados, saida=None):
+        """
+        Matriz numérica final (linhas x n_saida, float64), idêntica à do
+        ColumnTransformer. `saida` permite reaproveitar uma matriz já alocada.
+        Categorias desconhecidas viram linha de zeros (handle_unknown='ignore').
+        """
+        n_linhas = len(dados[self.colunas[0]])
+        if saida is None or saida.shape != (n_linhas, self.n_saida):
+            saida = np.empty((n_linhas, self.n_saida), dtype=np.float64)
+
+        for inicio, colunas, media, escala in self._numericos:
+            valores = [np.asarray(dados[coluna]) for coluna in colunas]
+            #Como o scikit-learn: o bloco fica no tipo comum das colunas se ele
+            #for float (ex: int8 + float32 -> float32) e o scaler calcula nesse tipo
+            tipo = np.result_type(*(coluna.dtype for coluna in valores))
+            if tipo.kind != "f":
+                tipo = np.dtype(np.float64)
+            if tipo == np.float64:
+                bloco = saida[:, inicio:inicio + len(colunas)]
+            else:
+                bloco = np.empty((n_linhas, len(colunas)), dtype=tipo)
+            for j, coluna in enumerate(valores):
+                bloco[:, j] = coluna
+            if media is not None:
+                bloco -= media.astype(tipo, copy=False)
+            if escala is not None:
+                bloco /= escala.astype(tipo, copy=False)
+            if tipo != np.float64:
+                saida[:, inicio:inicio + len(colunas)] = bloco
+
+        for coluna, inicio, posicoes in self._categoricos:
+            bloco = saida[:, inicio:inicio + len(posicoes)]
+            bloco[:] = 0.0
+            if n_linhas <= LIMITE_CONSULTA_DIRETA:
+                codigos = np.fromiter((posicoes.get(valor, -1) for valor in dados[coluna]), np.intp, n_linhas)
+            else:
+                indices, distintos = pd.factorize(np.asarray(dados[coluna], dtype=object))
+                if len(distintos) == 0:
+                    #Coluna inteira ausente (None/NaN)
+                    codigos = np.full(n_linhas, -1, dtype=np.intp)
+                else:
+                    por_distinto = np.fromiter((posicoes.get(valor, -1) for valor in distintos), np.intp, len(distintos))
+                    #None/NaN ficam com índice -1 no factorize: linha de zeros, como categoria desconhecida
+                    codigos = np.where(indices >= 0, por_distinto[indices], -1)
+            linhas = np.flatnonzero(codigos >= 0)
+            bloco[linhas, codigos[linhas]] = 1.0
+        return saida
+
+
+class PipelineCompilado:
+    """
+    Pipeline treinado (pré-processador + modelo) com o ColumnTransformer
+    trocado pelo EsquemaEntrada: predict_proba aceita um dicionário de
+    arrays e entrega a matriz direto ao estimador final.
+    """
+
+    def __init__(self, modelo_pipeline):
+        if len(modelo_pipeline.steps) != 2:
+            raise ValueError("Só pipelines com pré-processador + modelo são suportados.")
+        self.esquema = EsquemaEntrada.do_preprocessador(modelo_pipeline.steps[0][1])
+        self.estimador = modelo_pipeline.steps[-1][1]
+        self.classes_ = modelo_pipeline.classes_
+
+    def predict_proba(self, dados):
+        return self.estimador.predict_proba(self.esquema.transformar(dados))
+
+
+def compilar_pipeline(modelo_pipeline):
+    """PipelineCompilado do pipeline ou, se o pré-processador não é suportado, o próprio pipeline."""
+    try:
+        return PipelineCompilado(modelo_pipeline)
+    except ValueError as erro:
+        print(f"[AVISO] Pré-processador não compilado ({erro}); usando o pipeline original.")
+        return modelo_pipeline
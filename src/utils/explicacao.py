@@ -0,0 +1,75 @@
+# src/utils/explicacao.py
+"""
+Explicação de uma previsão individual (SHAP) para o formulário.
+
+O TreeExplainer é criado uma vez por versão do modelo e reaproveitado. Os
+valores SHAP das colunas geradas pelo OneHotEncoder são somados de volta na
+coluna original (a soma preserva a aditividade do SHAP), para que o médico
+veja "transporte_habitual" e não "cat__transporte_habitual_Caminhada".
+"""
+import numpy as np
+import pandas as pd
+import shap
+
+#Quantos fatores mostrar por previsão
+TOP_K_PADRAO = 5
+
+
+class ExplicadorPrevisao:
+    """TreeExplainer do modelo do pipeline + agrupamento por coluna de entrada."""
+
+    def __init__(self, modelo_pipeline, aproximado=False):
+        self.preprocessor = modelo_pipeline.named_steps["preprocessor"]
+        self.explainer = shap.TreeExplainer(modelo_pipeline.named_steps["model"])
+        #aproximado=True usa o método de Saabas (ordem de grandeza mais rápido, não exato)
+        self.aproximado = aproximado
+
+        #Para cada coluna transformada, o índice da coluna de entrada de origem
+        self.colunas_entrada = list(self.preprocessor.feature_names_in_)
+        posicao = {coluna: i for i, coluna in enumerate(self.colunas_entrada)}
+        grupos = []
+        for _, transformador, colunas in self.preprocessor.transformers_:
+            if transformador == "drop":
+                continue
+            etapa = transformador.steps[-1][1] if hasattr(transformador, "steps") else transformador
+            for j, coluna in enumerate(colunas):
+                n_saida = len(etapa.categories_[j]) if hasattr(etapa, "categories_") else 1
+                grupos.extend([posicao[coluna]] * n_saida)
+        self._grupos = np.asarray(grupos)
+
+    def contribuicoes(self, df_features):
+        """Matriz (colunas de entrada x classes) com o SHAP da primeira linha."""
+        X = self.preprocessor.transform(df_features.iloc[:1])
+        valores = self.explainer.shap_values(X, check_additivity=False, approximate=self.aproximado)
+        #SHAP atual: (linhas x features x classes); versões antigas: lista por classe
+        valores = np.moveaxis(np.asarray(valores), 0, -1)[0] if isinstance(valores, list) else np.asarray(valores)[0]
+        if valores.ndim == 1:
+            valores = valores[:, np.newaxis]
+
+        agrupado = np.zeros((len(self.colunas_entrada), valores.shape[1]))
+        np.add.at(agrupado, self._grupos, valores)
+        return agrupado
+
+    def explicar(self, df_features, indice_classe, k=TOP_K_PADRAO):
+        """
+        Os k fatores de maior impacto (em módulo) na probabilidade da classe
+        prevista: coluna, valor informado e contribuição (positiva = aumenta).
+        """
+        contribuicoes = self.contribuicoes(df_features)
+        indice_classe = int(indice_classe)
+        if contribuicoes.shape[1] == 1 and indice_classe in (0, 1):
+            #Binário com uma saída só (ex: XGBoost): o SHAP é o da classe 1 e o da classe 0 é o oposto
+            contribuicoes = contribuicoes[:, 0] if indice_classe == 1 else -contribuicoes[:, 0]
+        elif 0 <= indice_classe < contribuicoes.shape[1]:
+            contribuicoes = contribuicoes[:, indice_classe]
+        else:
+            raise IndexError(
+                f"Classe {indice_classe} fora das {contribuicoes.shape[1]} saídas do SHAP do modelo."
+            )
+        ordem = np.argsort(-np.abs(contribuicoes))[:k]
+        linha = df_features.iloc[0]
+        return pd.DataFrame({
+            "fator": [self.colunas_entrada[i] for i in ordem],
+            "valor": [str(linha[self.colunas_entrada[i]]) for i in ordem],
+            "contribuicao": contribuicoes[ordem],
+        })
@@ -0,0 +1,62 @@
+# src/utils/latencia.py
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+#Orçamento de latência do caminho interativo (formulário -> resultado)
+ORCAMENTO_LATENCIA_MS = 100.0
+
+
+class MonitorLatencia:
+    """
+    Guarda as últimas medições (em ms) de cada etapa da previsão em uma
+    janela deslizante e calcula os percentis p50/p95/p99 sob demanda.
+    É seguro para uso entre sessões (threads) do Streamlit.
+    """
+
+    def __init__(self, tamanho_janela=1000):
+        self.tamanho_janela = tamanho_janela
+        self._amostras = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, etapa, duracao_ms):
+        with self._lock:
+            if etapa not in self._amostras:
+                self._amostras[etapa] = deque(maxlen=self.tamanho_janela)
+            self._amostras[etapa].append(duracao_ms)
+
+    @contextmanager
+    def medir(self, etapa):
+        """Mede o tempo do bloco `with` e registra na etapa informada."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, (time.perf_counter() - inicio) * 1000)
+
+    def percentis(self, etapa, quantis=(50, 95, 99)):
+        """Retorna {'n': ..., 'p50': ..., ...} da etapa (vazio se não houver medições)."""
+        with self._lock:
+            amostras = np.array(self._amostras.get(etapa, ()), dtype=float)
+        if amostras.size == 0:
+            return {}
+        valores = np.percentile(amostras, quantis)
+        resumo = {"n": int(amostras.size)}
+        resumo.update({f"p{q}": float(v) for q, v in zip(quantis, valores)})
+        return resumo
+
+    def resumo(self):
+        """Percentis de todas as etapas, na ordem em que foram registradas."""
+        with self._lock:
+            etapas = list(self._amostras)
+        return {etapa: self.percentis(etapa) for etapa in etapas}
+
+    def dentro_do_orcamento(self, etapa, limite_ms=ORCAMENTO_LATENCIA_MS, quantil=95):
+        """True se o percentil `quantil` da etapa estiver abaixo do limite (None sem dados)."""
+        resumo = self.percentis(etapa, quantis=(quantil,))
+        if not resumo:
+            return None
+        return resumo[f"p{quantil}"] <= limite_ms
@@ -0,0 +1,92 @@
+# src/utils/memoria_dataframe.py
+"""
+Representação compacta de DataFrames analíticos em memória.
+
+- compactar_dataframe: texto de baixa cardinalidade -> category, inteiros e
+  floats -> o menor tipo que comporta os valores.
+- relatorio_memoria: memória por coluna antes/depois (bytes reais, deep=True).
+- gravar_arrow / abrir_arrow_mmap: grava o DataFrame compactado em um arquivo
+  Arrow IPC sem compressão e o abre com memory map. As colunas numéricas (e os
+  códigos das categorias) viram visões somente leitura sobre o arquivo, então
+  vários processos do Streamlit compartilham as mesmas páginas do page cache
+  em vez de cada um manter a sua cópia.
+
+Uso (relatório da base Gold lida do CSV sem tipos x compactada):
+    python src/utils/memoria_dataframe.py
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+#Texto vira category se tiver até esta fração de valores distintos
+LIMITE_CARDINALIDADE = 0.5
+
+
+def compactar_dataframe(df, limite_cardinalidade=LIMITE_CARDINALIDADE):
+    """Retorna uma cópia do DataFrame com os tipos reduzidos (valores idênticos)."""
+    colunas = {}
+    for coluna, serie in df.items():
+        if isinstance(serie.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(serie):
+            colunas[coluna] = serie
+        elif pd.api.types.is_integer_dtype(serie):
+            colunas[coluna] = pd.to_numeric(serie, downcast="integer")
+        elif pd.api.types.is_float_dtype(serie):
+            #float32 só se a conversão não mudar nenhum valor além da precisão do float32
+            reduzida = serie.astype(np.float32)
+            colunas[coluna] = reduzida if np.allclose(reduzida, serie, rtol=1e-6, equal_nan=True) else serie
+        elif serie.nunique(dropna=False) <= max(1, limite_cardinalidade * len(serie)):
+            colunas[coluna] = serie.astype("category")
+        else:
+            colunas[coluna] = serie
+    return pd.DataFrame(colunas, index=df.index)
+
+
+def relatorio_memoria(df_antes, df_depois):
+    """Tabela por coluna: tipo e memória (KB) antes/depois e a redução percentual."""
+    antes = df_antes.memory_usage(deep=True, index=False)
+    depois = df_depois.memory_usage(deep=True, index=False)
+    relatorio = pd.DataFrame({
+        "tipo_antes": df_antes.dtypes.astype(str),
+        "tipo_depois": df_depois.dtypes.astype(str),
+        "kb_antes": antes / 1024,
+        "kb_depois": depois / 1024,
+    })
+    relatorio.loc["TOTAL"] = ["", "", antes.sum() / 1024, depois.sum() / 1024]
+    relatorio["reducao_%"] = (1 - relatorio["kb_depois"] / relatorio["kb_antes"]) * 100
+    return relatorio.round(2)
+
+
+def gravar_arrow(df, caminho):
+    """Grava o DataFrame em Arrow IPC sem compressão (pré-requisito do mmap), de forma atômica."""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    feather.write_feather(df, temporario, compression="uncompressed")
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def abrir_arrow_mmap(caminho):
+    """
+    Abre o arquivo Arrow com memory map e devolve um DataFrame cujas colunas
+    apontam para o arquivo (somente leitura, sem cópia das colunas numéricas).
+    """
+    with pa.memory_map(caminho, "r") as fonte:
+        tabela = pa.ipc.open_file(fonte).read_all()
+    #split_blocks evita que o pandas junte as colunas em um bloco novo (cópia)
+    return tabela.to_pandas(split_blocks=True)
+
+
+def main():
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    caminho_csv = os.path.join(project_root, "data", "processed", "obesity_gold.csv")
+
+    df = pd.read_csv(caminho_csv)
+    df_compacto = compactar_dataframe(df)
+    print(relatorio_memoria(df, df_compacto).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# src/utils/memoria_processo.py
+"""
+Memória usada por processos (Linux, via /proc).
+
+- RSS: páginas residentes do processo, incluindo as compartilhadas com
+  outros processos (cada trabalhador conta o modelo mmap inteiro).
+- PSS: cada página compartilhada é dividida entre os processos que a usam;
+  a soma do PSS dos trabalhadores é a memória realmente ocupada.
+- Compartilhada / privada: partes do RSS usadas por mais de um processo ou só
+  por este.
+"""
+import os
+
+import pandas as pd
+
+#Campos do /proc/<pid>/smaps_rollup (em kB) -> colunas do relatório
+CAMPOS_SMAPS = {
+    "Rss": "rss_mb",
+    "Pss": "pss_mb",
+    "Shared_Clean": "compartilhada_mb",
+    "Shared_Dirty": "compartilhada_mb",
+    "Private_Clean": "privada_mb",
+    "Private_Dirty": "privada_mb",
+}
+
+
+def memoria_processo(pid="self"):
+    """RSS, PSS, memória compartilhada e privada (MB) de um processo."""
+    memoria = dict.fromkeys(CAMPOS_SMAPS.values(), 0.0)
+    with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as arquivo:
+        for linha in arquivo:
+            campo, _, valor = linha.partition(":")
+            if campo in CAMPOS_SMAPS:
+                memoria[CAMPOS_SMAPS[campo]] += int(valor.split()[0]) / 1024
+    return memoria
+
+
+def processos_filhos(pid):
+    """PIDs dos processos filhos diretos de `pid`."""
+    filhos = []
+    for tarefa in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{tarefa}/children", encoding="ascii") as arquivo:
+            filhos.extend(int(filho) for filho in arquivo.read().split())
+    return filhos
+
+
+def relatorio_memoria_processos(pids):
+    """Uma linha por processo (pid) e a linha TOTAL; processos que já terminaram são ignorados."""
+    linhas = {}
+    for pid in pids:
+        try:
+            linhas[pid] = memoria_processo(pid)
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+    relatorio = pd.DataFrame.from_dict(linhas, orient="index", columns=list(dict.fromkeys(CAMPOS_SMAPS.values())))
+    relatorio.index.name = "pid"
+    relatorio.loc["TOTAL"] = relatorio.sum()
+    return relatorio.round(1)
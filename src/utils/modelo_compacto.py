@@ -0,0 +1,128 @@
+# src/utils/modelo_compacto.py
+"""
+Avaliador do modelo compacto (depende apenas de NumPy e pandas).
+
+O formato é gerado por src/models/export_model.py a partir do pipeline
+treinado (ColumnTransformer + StandardScaler/OneHotEncoder + Random Forest ou
+XGBoost): uma pasta com `metadados.json` e os arrays em `.npy` (parâmetros do
+pré-processamento e os nós de todas as árvores concatenados). Assim o serviço
+de previsão não precisa de scikit-learn/XGBoost nem das mesmas versões usadas
+no treino, e os arrays podem ser abertos com mmap.
+"""
+import json
+import os
+
+import numpy as np
+
+from src.utils.esquema_entrada import EsquemaEntrada
+
+METADADOS_ARQUIVO = "metadados.json"
+
+#Linhas avaliadas por vez (limita a matriz linhas x árvores em memória)
+TAMANHO_BLOCO = 4096
+
+
+def percorrer_arvores(X, raizes, feature, limiar, esquerda, direita,
+                      menor_estrito=False, default_esquerda=None):
+    """
+    Desce todas as árvores ao mesmo tempo para todas as linhas de X e
+    retorna a matriz (linhas x árvores) com o índice da folha alcançada.
+
+    - Random Forest (scikit-learn): vai para a esquerda se x <= limiar.
+    - XGBoost: vai para a esquerda se x < limiar; NaN segue default_esquerda.
+    Nas folhas, esquerda == -1.
+    """
+    linhas = np.arange(X.shape[0])[:, None]
+    nos = np.broadcast_to(raizes, (X.shape[0], len(raizes))).copy()
+    while True:
+        internos = esquerda[nos] >= 0
+        if not internos.any():
+            return nos
+        valores = X[linhas, feature[nos]]
+        if menor_estrito:
+            vai_esquerda = valores < limiar[nos]
+        else:
+            vai_esquerda = valores <= limiar[nos]
+        if default_esquerda is not None:
+            vai_esquerda = np.where(np.isnan(valores), default_esquerda[nos], vai_esquerda)
+        proximos = np.where(vai_esquerda, esquerda[nos], direita[nos])
+        nos = np.where(internos, proximos, nos)
+
+
+class ModeloCompacto:
+    """Pré-processamento + ensemble de árvores avaliados com NumPy."""
+
+    def __init__(self, metadados, arrays):
+        self.metadados = metadados
+        self.arrays = arrays
+        self.tipo_modelo = metadados["tipo_modelo"]
+        self.colunas_entrada = metadados["colunas_entrada"]
+        self.classes = np.asarray(metadados["classes"], dtype=object)
+        self.n_saida = metadados["n_saida"]
+        #Pré-processamento (equivalente ao ColumnTransformer treinado), compilado uma vez
+        self.esquema = EsquemaEntrada(self.colunas_entrada, metadados["blocos"], arrays)
+
+    @classmethod
+    def carregar(cls, diretorio, mmap=False):
+        """
+        Lê a pasta exportada. Com mmap=True os arrays ficam no page cache do
+        sistema operacional e são compartilhados entre processos.
+        """
+        with open(os.path.join(diretorio, METADADOS_ARQUIVO), encoding="utf-8") as arquivo:
+            metadados = json.load(arquivo)
+        arrays = {
+            nome: np.load(os.path.join(diretorio, f"{nome}.npy"), mmap_mode="r" if mmap else None)
+            for nome in metadados["arrays"]
+        }
+        return cls(metadados, arrays)
+
+    # --- Pré-processamento ---
+    def transformar(self, dados):
+        """
+        Recebe um DataFrame (ou dicionário de colunas) com as colunas de
+        entrada do pipeline e devolve a matriz numérica final (float64).
+        """
+        return self.esquema.transformar(dados)
+
+    # --- Ensemble de árvores ---
+    def _probabilidades_random_forest(self, X):
+        a = self.arrays
+        folhas = percorrer_arvores(
+            X.astype(np.float32), a["raizes"], a["feature"], a["limiar"], a["esquerda"], a["direita"]
+        )
+        #Mesma ordem de soma do scikit-learn (árvore a árvore), para resultado idêntico
+        probabilidades = np.zeros((X.shape[0], len(self.classes)), dtype=np.float64)
+        for t in range(folhas.shape[1]):
+            probabilidades += a["valor"][folhas[:, t]]
+        probabilidades /= folhas.shape[1]
+        return probabilidades
+
+    def _probabilidades_xgboost(self, X):
+        a = self.arrays
+        folhas = percorrer_arvores(
+            X.astype(np.float32), a["raizes"], a["feature"], a["limiar"], a["esquerda"], a["direita"],
+            menor_estrito=True, default_esquerda=a["default_esquerda"],
+        )
+        #Margem = intercepto + soma das folhas de cada classe (em float32, como no XGBoost)
+        margens = np.tile(a["intercepto"], (X.shape[0], 1))
+        for t, classe in enumerate(a["classe_arvore"]):
+            margens[:, classe] += a["valor"][folhas[:, t]]
+        margens -= margens.max(axis=1, keepdims=True)
+        exponenciais = np.exp(margens)
+        return exponenciais / exponenciais.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, dados):
+        """Probabilidades (linhas x classes), na ordem de self.classes."""
+        X = self.transformar(dados)
+        calcular = (
+            self._probabilidades_random_forest if self.tipo_modelo == "random_forest"
+            else self._probabilidades_xgboost
+        )
+        blocos = [calcular(X[i:i + TAMANHO_BLOCO]) for i in range(0, X.shape[0], TAMANHO_BLOCO)]
+        if not blocos:
+            return np.zeros((0, len(self.classes)))
+        return np.vstack(blocos)
+
+    def predict(self, dados):
+        """Nome da classe prevista (ex: 'Sobrepeso') para cada linha."""
+        return self.classes[np.argmax(self.predict_proba(dados), axis=1)]
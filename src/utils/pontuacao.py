@@ -0,0 +1,164 @@
+# src/utils/pontuacao.py
+"""
+Pontuação vetorizada de pacientes (depende apenas de NumPy).
+
+Uma chamada de Pontuador.pontuar() devolve, para N linhas de uma vez:
+- a matriz de probabilidades (linhas x classes) do predict_proba do modelo;
+- as k classes mais prováveis de cada linha, com as probabilidades;
+- a classe prevista (argmax, o mesmo resultado do predict);
+- o nível de risco comportamental (Baixo/Moderado/Alto) e a probabilidade
+  de cada nível (soma das probabilidades das classes do nível).
+
+O nível de cada classe é resolvido uma única vez, na criação do Pontuador,
+em um array classe -> índice do nível; por linha só há indexação de arrays.
+Funciona com o pipeline do scikit-learn e com o ModeloCompacto (qualquer
+objeto com predict_proba). O pipeline é compilado na criação do Pontuador
+(esquema_entrada.PipelineCompilado): as features podem vir como DataFrame ou
+como dicionário coluna -> array, sem passar pelo ColumnTransformer.
+"""
+import numpy as np
+import pandas as pd
+
+from src.utils.esquema_entrada import compilar_pipeline
+
+NIVEIS_RISCO = ["Baixo", "Moderado", "Alto"]
+
+#Nível de risco de cada classe prevista; classes fora do dicionário são "Baixo"
+NIVEL_POR_CLASSE = {
+    "Obesidade Grau I": "Alto",
+    "Obesidade Grau II": "Alto",
+    "Obesidade Grau III": "Alto",
+    "Sobrepeso": "Moderado",
+}
+
+#Quantidade padrão de classes mais prováveis devolvidas por linha
+TOP_K_PADRAO = 3
+
+
+def nivel_risco(classe):
+    """Nível de risco (texto) de uma classe prevista."""
+    return NIVEL_POR_CLASSE.get(classe, NIVEIS_RISCO[0])
+
+
+class ResultadoPontuacao:
+    """Arrays da pontuação de N linhas (ver Pontuador.pontuar)."""
+
+    def __init__(self, probabilidades, nomes_classes, indices_top_k, indices_nivel, probabilidades_nivel, indice=None):
+        self.probabilidades = probabilidades
+        self.nomes_classes = nomes_classes
+        #Posições (colunas de `probabilidades`) das k classes mais prováveis, em ordem decrescente
+        self.indices_top_k = indices_top_k
+        self.indices_nivel = indices_nivel
+        self.probabilidades_nivel = probabilidades_nivel
+        self.indice = indice
+
+    def __len__(self):
+        return len(self.probabilidades)
+
+    @property
+    def indice_previsto(self):
+        return self.indices_top_k[:, 0]
+
+    @property
+    def classe_prevista(self):
+        return self.nomes_classes[self.indice_previsto]
+
+    @property
+    def classes_top_k(self):
+        return self.nomes_classes[self.indices_top_k]
+
+    @property
+    def probabilidades_top_k(self):
+        return np.take_along_axis(self.probabilidades, self.indices_top_k, axis=1)
+
+    @property
+    def nivel_risco(self):
+        return np.asarray(NIVEIS_RISCO, dtype=object)[self.indices_nivel]
+
+    def para_dataframe(self, incluir_probabilidades=True):
+        """
+        Uma linha por paciente: classe prevista, nível de risco, top-k
+        (classe_k/prob_k) e, opcionalmente, prob_<classe> e prob_risco_<nível>.
+        """
+        colunas = {"classe_prevista": self.classe_prevista, "nivel_risco": self.nivel_risco}
+        classes_top_k, probabilidades_top_k = self.classes_top_k, self.probabilidades_top_k
+        for k in range(self.indices_top_k.shape[1]):
+            colunas[f"classe_{k + 1}"] = classes_top_k[:, k]
+            colunas[f"prob_{k + 1}"] = probabilidades_top_k[:, k]
+        if incluir_probabilidades:
+            for j, nome in enumerate(self.nomes_classes):
+                colunas[f"prob_{nome}"] = self.probabilidades[:, j]
+            for j, nivel in enumerate(NIVEIS_RISCO):
+                colunas[f"prob_risco_{nivel}"] = self.probabilidades_nivel[:, j]
+        return pd.DataFrame(colunas, index=self.indice)
+
+    def para_registros(self):
+        """
+        Uma lista com um dicionário por paciente (pronto para JSON): classe
+        prevista, nível de risco, top-k e probabilidades por classe e por nível.
+        """
+        nomes = self.nomes_classes.tolist()
+        return [
+            {
+                "classe_prevista": classe,
+                "nivel_risco": nivel,
+                "top_k": [{"classe": c, "probabilidade": p} for c, p in zip(classes_top_k, probabilidades_top_k)],
+                "probabilidades": dict(zip(nomes, probabilidades)),
+                "probabilidades_nivel": dict(zip(NIVEIS_RISCO, probabilidades_nivel)),
+            }
+            for classe, nivel, classes_top_k, probabilidades_top_k, probabilidades, probabilidades_nivel in zip(
+                self.classe_prevista.tolist(), self.nivel_risco.tolist(), self.classes_top_k.tolist(),
+                self.probabilidades_top_k.tolist(), self.probabilidades.tolist(), self.probabilidades_nivel.tolist(),
+            )
+        ]
+
+
+class Pontuador:
+    """
+    Probabilidades, top-k e nível de risco de N linhas em uma chamada.
+    `nomes_classes` são os nomes das colunas do predict_proba do modelo, na
+    mesma ordem (ex: label_encoder.inverse_transform(pipeline.classes_)).
+    """
+
+    def __init__(self, modelo, nomes_classes, k=TOP_K_PADRAO):
+        self.modelo = modelo
+        self.nomes_classes = np.asarray([str(nome) for nome in nomes_classes], dtype=object)
+        self.k = min(k, len(self.nomes_classes))
+
+        #Classe -> índice do nível (array) e matriz classes x níveis (soma das probabilidades por nível)
+        self.nivel_por_classe = np.array(
+            [NIVEIS_RISCO.index(nivel_risco(nome)) for nome in self.nomes_classes], dtype=np.intp
+        )
+        self.matriz_nivel = np.zeros((len(self.nomes_classes), len(NIVEIS_RISCO)))
+        self.matriz_nivel[np.arange(len(self.nomes_classes)), self.nivel_por_classe] = 1.0
+
+    @classmethod
+    def do_pipeline(cls, modelo_pipeline, label_encoder, k=TOP_K_PADRAO):
+        """Pontuador do pipeline treinado (classes numéricas -> nomes pelo LabelEncoder)."""
+        return cls(compilar_pipeline(modelo_pipeline), label_encoder.inverse_transform(modelo_pipeline.classes_), k)
+
+    @property
+    def esquema(self):
+        """Contrato de entrada do modelo (EsquemaEntrada), se ele foi compilado."""
+        return getattr(self.modelo, "esquema", None)
+
+    def pontuar(self, df_features, k=None, indice=None):
+        """
+        Pontua as linhas de `df_features` (colunas do modelo, ver
+        engenharia.preparar_lote_para_previsao, ou o dicionário de arrays de
+        engenharia.preparar_colunas_para_previsao) com um único predict_proba.
+        `indice` rotula as linhas do resultado (padrão: o índice do DataFrame).
+        """
+        k = self.k if k is None else min(k, len(self.nomes_classes))
+        probabilidades = np.asarray(self.modelo.predict_proba(df_features), dtype=np.float64)
+
+        #Ordem decrescente estável: em empate vence a primeira classe, como no argmax/predict
+        indices_top_k = np.argsort(-probabilidades, axis=1, kind="stable")[:, :k]
+        return ResultadoPontuacao(
+            probabilidades,
+            self.nomes_classes,
+            indices_top_k,
+            self.nivel_por_classe[indices_top_k[:, 0]],
+            probabilidades @ self.matriz_nivel,
+            indice=getattr(df_features, "index", None) if indice is None else indice,
+        )
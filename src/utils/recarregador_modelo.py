@@ -0,0 +1,147 @@
+# src/utils/recarregador_modelo.py
+"""
+Troca da versão do modelo em produção sem pausa (hot-swap).
+
+O RecarregadorModelo guarda a versão carregada e, em uma thread de fundo,
+confere a cada `intervalo_s` segundos a versão apontada pelo registro
+(registro_modelos.resolver_versao, que só lê o atual.json). Quando ela muda:
+1. a nova versão é carregada (`carregar`) fora do caminho das requisições;
+2. passa por um lote sintético (`aquecer`), que paga as primeiras chamadas
+   lentas e confere a saída da engenharia de features contra o contrato de
+   entrada do modelo (src/utils/esquema_entrada.py): colunas, tipos e
+   categorias vistas no treino;
+3. só então a referência é trocada, de uma vez (quem já pegou a versão
+   antiga termina com ela).
+
+Se a carga ou o aquecimento falharem, a versão anterior continua atendendo
+e a nova só é tentada de novo quando o ponteiro mudar.
+"""
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import pandas as pd
+
+from src.features.engenharia import ORDEM_COLUNAS, gerar_formularios, preparar_colunas_para_previsao
+from src.utils.registro_modelos import resolver_versao
+
+#Segundos entre as conferências do registro (0 desliga a troca em segundo plano)
+INTERVALO_S = float(os.getenv("REGISTRO_INTERVALO_S", "5"))
+#Pacientes do lote sintético de aquecimento
+LINHAS_AQUECIMENTO = 256
+
+
+def aquecer_pontuador(pontuador, n_linhas=LINHAS_AQUECIMENTO):
+    """
+    Valida um lote sintético do formulário contra o esquema do modelo e o
+    pontua pelos dois caminhos (DataFrame e dicionário de arrays). Falha se
+    o modelo não aceitar as features atuais.
+    """
+    colunas_features = preparar_colunas_para_previsao(gerar_formularios(n_linhas))
+    if pontuador.esquema is not None:
+        pontuador.esquema.validar(colunas_features)
+    pontuador.pontuar(colunas_features)
+    pontuador.pontuar(pd.DataFrame(colunas_features, columns=ORDEM_COLUNAS))
+
+
+class RecarregadorModelo:
+    """
+    Versão atual do modelo + troca em segundo plano.
+
+    `carregar(versao)` recebe o dicionário de resolver_versao() e devolve o
+    objeto servido (ex: um Pontuador); `aquecer(objeto)` é opcional.
+    """
+
+    def __init__(self, carregar, aquecer=None, resolver=resolver_versao, intervalo_s=INTERVALO_S):
+        self.carregar = carregar
+        self.aquecer = aquecer
+        self.resolver = resolver
+        self.intervalo_s = intervalo_s
+        self._atual = None
+        self._versao_com_falha = None
+        self._estado = {"trocas": 0, "ultimo_erro": None}
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _preparar(self, versao):
+        """Carrega e aquece `versao`; retorna o objeto e os tempos (ms)."""
+        inicio = time.perf_counter()
+        objeto = self.carregar(versao)
+        carregado = time.perf_counter()
+        if self.aquecer is not None:
+            self.aquecer(objeto)
+        fim = time.perf_counter()
+        return objeto, {"tempo_carga_ms": round((carregado - inicio) * 1000, 1),
+                        "tempo_aquecimento_ms": round((fim - carregado) * 1000, 1)}
+
+    def _trocar(self, versao, objeto, tempos):
+        self._atual = (versao["versao"], objeto)
+        self._estado.update(tempos, versao=versao["versao"], carregada_em=datetime.now().isoformat(timespec="seconds"))
+
+    def carregar_inicial(self):
+        """Carrega a versão atual de forma síncrona (erros sobem para quem chamou)."""
+        with self._lock:
+            versao = self.resolver()
+            self._trocar(versao, *self._preparar(versao))
+        return self
+
+    def iniciar(self):
+        """Garante uma versão carregada e inicia a conferência em segundo plano (uma vez por processo)."""
+        if self._atual is None:
+            self.carregar_inicial()
+        #Depois de um fork a thread do pai não existe no filho: cria outra
+        if self.intervalo_s > 0 and (self._thread is None or not self._thread.is_alive()):
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._monitorar, name="recarregador-modelo", daemon=True)
+            self._thread.start()
+        return self
+
+    def atual(self):
+        """(versão, objeto) em produção. Use o par inteiro em uma requisição, não dois atual() seguidos."""
+        return self._atual
+
+    def verificar(self):
+        """Confere o registro e troca a versão se ela mudou. Retorna True se houve troca."""
+        with self._lock:
+            versao = self.resolver()
+            if versao["versao"] in (self._atual[0], self._versao_com_falha):
+                return False
+            try:
+                objeto, tempos = self._preparar(versao)
+            except Exception as erro:
+                self._versao_com_falha = versao["versao"]
+                self._estado["ultimo_erro"] = f"{versao['versao']}: {type(erro).__name__}: {erro}"
+                print(f"[ERRO] Versão {versao['versao']} não carregada; mantendo {self._atual[0]}. {erro}")
+                return False
+            anterior = self._atual[0]
+            self._trocar(versao, objeto, tempos)
+            self._estado["trocas"] += 1
+            print(f"Modelo trocado: {anterior} -> {versao['versao']} "
+                  f"(carga {tempos['tempo_carga_ms']} ms, aquecimento {tempos['tempo_aquecimento_ms']} ms)")
+            return True
+
+    def _monitorar(self):
+        while not self._parar.wait(self.intervalo_s):
+            try:
+                self.verificar()
+            except Exception as erro:
+                #Registro ilegível no momento (ex: pasta removida): tenta de novo no próximo ciclo
+                self._estado["ultimo_erro"] = f"{type(erro).__name__}: {erro}"
+
+    def estado(self):
+        """Versão atual, tempos da última troca, número de trocas e último erro."""
+        return dict(self._estado)
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
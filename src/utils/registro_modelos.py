@@ -0,0 +1,227 @@
+# src/utils/registro_modelos.py
+"""
+Registro de modelos versionados (models/registro/).
+
+Cada versão é uma pasta imutável `models/registro/<versao>/` com:
+- pipeline.joblib e label_encoder.joblib (cópias dos artefatos do treino);
+- compacto/ (modelo NumPy de src/models/export_model.py, quando o tipo de
+  modelo é suportado), usado pelo servidor multiprocesso;
+- manifesto.json: hash dos artefatos, features de entrada, classes,
+  métricas, tempo de carga e data de registro.
+
+O arquivo `atual.json` aponta para a versão em produção. Ele é gravado em um
+arquivo temporário e trocado com os.replace (atômico): quem lê vê a versão
+antiga ou a nova, nunca um arquivo pela metade. Registrar não muda a versão
+em produção (a não ser com `--ativar`); colocar uma versão em produção, ou
+voltar para uma anterior, é sempre um `ativar` explícito.
+
+Sem nenhuma versão ativa, resolver_versao() usa os caminhos antigos
+(models/random_forest_pipeline.joblib), para compatibilidade.
+
+Uso:
+    python src/utils/registro_modelos.py listar
+    python src/utils/registro_modelos.py registrar models/xgboost_pipeline.joblib [--ativar]
+    python src/utils/registro_modelos.py ativar <versao>
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+
+import joblib
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+#Adiciona a pasta raiz (que contém 'src') ao caminho de busca do Python
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.utils.cache_previsao import versao_artefato
+
+MODELS_DIR = os.path.join(project_root, "models")
+REGISTRO_DIR = os.getenv("REGISTRO_MODELOS_DIR", os.path.join(MODELS_DIR, "registro"))
+
+#Artefatos usados enquanto nenhuma versão foi registrada
+MODELO_LEGADO = os.path.join(MODELS_DIR, "random_forest_pipeline.joblib")
+LE_LEGADO = os.path.join(MODELS_DIR, "label_encoder.joblib")
+
+PONTEIRO_ARQUIVO = "atual.json"
+MANIFESTO_ARQUIVO = "manifesto.json"
+MODELO_ARQUIVO = "pipeline.joblib"
+LE_ARQUIVO = "label_encoder.joblib"
+COMPACTO_SUBDIR = "compacto"
+
+
+def _gravar_json_atomico(caminho, dados):
+    """Grava em um temporário na mesma pasta e troca com os.replace."""
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+
+def versao_atual(diretorio=REGISTRO_DIR):
+    """Versão apontada por atual.json (None se nenhuma foi ativada)."""
+    try:
+        with open(os.path.join(diretorio, PONTEIRO_ARQUIVO), encoding="utf-8") as arquivo:
+            return json.load(arquivo)["versao"]
+    except FileNotFoundError:
+        return None
+
+
+def carregar_manifesto(versao, diretorio=REGISTRO_DIR):
+    with open(os.path.join(diretorio, versao, MANIFESTO_ARQUIVO), encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def listar_versoes(diretorio=REGISTRO_DIR):
+    """Manifestos de todas as versões registradas, da mais antiga para a mais nova."""
+    if not os.path.isdir(diretorio):
+        return []
+    manifestos = []
+    for nome in os.listdir(diretorio):
+        if os.path.isfile(os.path.join(diretorio, nome, MANIFESTO_ARQUIVO)):
+            manifestos.append(carregar_manifesto(nome, diretorio))
+    return sorted(manifestos, key=lambda manifesto: manifesto["registrado_em"])
+
+
+def ativar(versao, diretorio=REGISTRO_DIR):
+    """Aponta atual.json para `versao` (troca atômica)."""
+    if not os.path.isfile(os.path.join(diretorio, versao, MANIFESTO_ARQUIVO)):
+        raise FileNotFoundError(f"Versão não registrada: {versao}")
+    _gravar_json_atomico(os.path.join(diretorio, PONTEIRO_ARQUIVO),
+                         {"versao": versao, "ativada_em": datetime.now().isoformat(timespec="seconds")})
+    return versao
+
+
+def resolver_versao(diretorio=REGISTRO_DIR):
+    """
+    Versão em produção: {"versao", "modelo", "label_encoder", "diretorio"}.
+    Sem versão ativa no registro, usa os artefatos antigos de models/ (a
+    versão é o hash do .joblib e "diretorio" é None).
+    """
+    versao = versao_atual(diretorio)
+    if versao is None:
+        return {"versao": versao_artefato(MODELO_LEGADO), "modelo": MODELO_LEGADO,
+                "label_encoder": LE_LEGADO, "diretorio": None}
+    pasta = os.path.join(diretorio, versao)
+    return {"versao": versao, "modelo": os.path.join(pasta, MODELO_ARQUIVO),
+            "label_encoder": os.path.join(pasta, LE_ARQUIVO), "diretorio": pasta}
+
+
+def caminhos_modelo_atual(diretorio=REGISTRO_DIR):
+    """(pipeline, label encoder) da versão em produção, para os scripts de linha de comando."""
+    if versao_atual(diretorio) is None:
+        return MODELO_LEGADO, LE_LEGADO
+    versao = resolver_versao(diretorio)
+    return versao["modelo"], versao["label_encoder"]
+
+
+def registrar(caminho_modelo, caminho_le, metricas=None, informacoes=None, diretorio=REGISTRO_DIR,
+              ativar_versao=False, exportar_compacto=True):
+    """
+    Copia os artefatos para uma nova versão e grava o manifesto; com
+    `ativar_versao`, também a coloca em produção. Os mesmos artefatos (mesmo
+    hash) registrados de novo devolvem a versão existente sem mexer no
+    atual.json (um rollback feito com `ativar` continua valendo). Retorna o
+    nome da versão.
+    """
+    hash_modelo = versao_artefato(caminho_modelo)
+    hash_le = versao_artefato(caminho_le)
+    for manifesto in listar_versoes(diretorio):
+        if manifesto["hash_modelo"] == hash_modelo and manifesto["hash_label_encoder"] == hash_le:
+            print(f"Artefatos já registrados como a versão {manifesto['versao']} (versão em produção mantida).")
+            return manifesto["versao"]
+
+    versao = f"{datetime.now():%Y%m%d-%H%M%S}-{hash_modelo[:8]}"
+    #A versão é montada em uma pasta temporária e só aparece no registro completa
+    temporaria = os.path.join(diretorio, f".{versao}.tmp")
+    shutil.rmtree(temporaria, ignore_errors=True)
+    os.makedirs(temporaria)
+    shutil.copy2(caminho_modelo, os.path.join(temporaria, MODELO_ARQUIVO))
+    shutil.copy2(caminho_le, os.path.join(temporaria, LE_ARQUIVO))
+
+    inicio = time.perf_counter()
+    modelo_pipeline = joblib.load(os.path.join(temporaria, MODELO_ARQUIVO))
+    label_encoder = joblib.load(os.path.join(temporaria, LE_ARQUIVO))
+    tempo_carga_ms = (time.perf_counter() - inicio) * 1000
+
+    compacto = False
+    if exportar_compacto:
+        from src.models.export_model import exportar
+        try:
+            exportar(modelo_pipeline, label_encoder, os.path.join(temporaria, COMPACTO_SUBDIR),
+                     versao_modelo=hash_modelo)
+            compacto = True
+        except ValueError as erro:
+            print(f"[AVISO] Modelo compacto não exportado: {erro}")
+
+    manifesto = {
+        "versao": versao,
+        "registrado_em": datetime.now().isoformat(timespec="seconds"),
+        "origem": os.path.relpath(os.path.abspath(caminho_modelo), project_root),
+        "tipo_modelo": type(modelo_pipeline.named_steps["model"]).__name__,
+        "hash_modelo": hash_modelo,
+        "hash_label_encoder": hash_le,
+        "tamanho_mb": round(os.path.getsize(caminho_modelo) / 1024 ** 2, 2),
+        "tempo_carga_ms": round(tempo_carga_ms, 1),
+        "features": [str(coluna) for coluna in modelo_pipeline.feature_names_in_],
+        "classes": [str(classe) for classe in label_encoder.classes_],
+        "metricas": metricas or {},
+        "compacto": compacto,
+        **(informacoes or {}),
+    }
+    _gravar_json_atomico(os.path.join(temporaria, MANIFESTO_ARQUIVO), manifesto)
+    os.replace(temporaria, os.path.join(diretorio, versao))
+    print(f"Versão {versao} registrada em: {os.path.join(diretorio, versao)}")
+
+    if ativar_versao:
+        ativar(versao, diretorio)
+        print(f"Versão {versao} ativada.")
+    else:
+        print(f"Para colocá-la em produção: python src/utils/registro_modelos.py ativar {versao}")
+    return versao
+
+
+def exibir_versoes(diretorio=REGISTRO_DIR):
+    atual = versao_atual(diretorio)
+    versoes = listar_versoes(diretorio)
+    if not versoes:
+        print(f"Nenhuma versão registrada em {diretorio}.")
+        return
+    for manifesto in versoes:
+        marcador = "*" if manifesto["versao"] == atual else " "
+        metricas = ", ".join(f"{nome}={valor:.4f}" if isinstance(valor, float) else f"{nome}={valor}"
+                             for nome, valor in manifesto["metricas"].items())
+        print(f"{marcador} {manifesto['versao']}  {manifesto['tipo_modelo']:<24} "
+              f"carga {manifesto['tempo_carga_ms']:>7.1f} ms  {metricas}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Registro de versões do modelo.")
+    parser.add_argument("--diretorio", default=REGISTRO_DIR, help="Pasta do registro.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    comandos.add_parser("listar", help="Lista as versões (* = em produção).")
+    registro = comandos.add_parser("registrar", help="Registra um pipeline treinado como nova versão.")
+    registro.add_argument("modelo", help="Caminho do pipeline treinado (.joblib).")
+    registro.add_argument("--label-encoder", default=LE_LEGADO, help="Caminho do label_encoder.joblib.")
+    registro.add_argument("--ativar", action="store_true", help="Coloca a nova versão em produção.")
+    ativacao = comandos.add_parser("ativar", help="Coloca uma versão registrada em produção (ex: rollback).")
+    ativacao.add_argument("versao")
+    args = parser.parse_args(argv)
+
+    if args.comando == "registrar":
+        registrar(args.modelo, args.label_encoder, diretorio=args.diretorio, ativar_versao=args.ativar)
+    elif args.comando == "ativar":
+        ativar(args.versao, args.diretorio)
+        print(f"Versão {args.versao} ativada.")
+    exibir_versoes(args.diretorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# src/utils/tabela_lookup.py
+"""
+Motor de inferência por tabela de consulta (depende apenas de NumPy).
+
+A tabela é gerada offline por src/models/build_lookup_table.py: cada perfil
+possível do formulário (combinação das opções + idade) recebe um índice em
+base mista e a classe prevista pelo pipeline é guardada nessa posição de um
+array uint8 (.npy). Em produção basta abrir o array com mmap e fazer uma
+consulta por índice, sem carregar scikit-learn/XGBoost.
+
+Os metadados guardam o hash do .joblib que gerou a tabela (versao_modelo):
+quem usa a tabela confere esse hash contra o modelo em produção e volta para
+o pipeline se a tabela for de outro modelo (ex: depois de um novo treino).
+"""
+import json
+import os
+
+import numpy as np
+
+
+def caminho_metadados(caminho_tabela):
+    """O arquivo de metadados fica ao lado da tabela (.npy -> .json)."""
+    return os.path.splitext(caminho_tabela)[0] + ".json"
+
+
+class TabelaLookup:
+    """Consulta a classe prevista de um perfil do formulário por indexação direta."""
+
+    def __init__(self, tabela, metadados):
+        self.tabela = tabela
+        self.metadados = metadados
+        self.campos = metadados["campos"]
+        self.idade_min = metadados["idade_min"]
+        self.idade_max = metadados["idade_max"]
+        self.classes = metadados["classes"]
+        #Hash do .joblib que gerou a tabela (cache_previsao.versao_artefato)
+        self.versao_modelo = metadados.get("versao_modelo")
+
+        #Posição de cada opção dentro do seu campo (dígito da base mista)
+        self._posicoes = [
+            {opcao: i for i, opcao in enumerate(metadados["opcoes"][campo])}
+            for campo in self.campos
+        ]
+        #Peso de cada dígito: a idade é o dígito menos significativo
+        bases = [len(metadados["opcoes"][campo]) for campo in self.campos]
+        bases.append(self.idade_max - self.idade_min + 1)
+        pesos = np.cumprod([1] + bases[::-1][:-1])[::-1]
+        self._pesos_campos = [int(p) for p in pesos[:-1]]
+
+    @classmethod
+    def carregar(cls, caminho_tabela):
+        """Abre a tabela em modo somente leitura (mmap) junto com os metadados."""
+        with open(caminho_metadados(caminho_tabela), encoding="utf-8") as arquivo:
+            metadados = json.load(arquivo)
+        tabela = np.load(caminho_tabela, mmap_mode="r")
+        return cls(tabela, metadados)
+
+    def gerada_pelo_modelo(self, versao_modelo):
+        """True se a tabela foi gerada pelo .joblib com hash `versao_modelo`."""
+        return self.versao_modelo is not None and self.versao_modelo == versao_modelo
+
+    def indice(self, inputs_humanos):
+        """Índice do perfil na tabela, ou None se o perfil estiver fora da grade."""
+        idade = inputs_humanos["idade"]
+        if not self.idade_min <= idade <= self.idade_max or idade != int(idade):
+            return None
+
+        indice = int(idade) - self.idade_min
+        for campo, posicoes, peso in zip(self.campos, self._posicoes, self._pesos_campos):
+            posicao = posicoes.get(inputs_humanos[campo])
+            if posicao is None:
+                return None
+            indice += posicao * peso
+        return indice
+
+    def prever(self, inputs_humanos):
+        """Nome da classe prevista (ex: 'Sobrepeso'), ou None fora da grade."""
+        indice = self.indice(inputs_humanos)
+        if indice is None:
+            return None
+        return self.classes[self.tabela[indice]]
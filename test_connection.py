@@ -1,3 +1,4 @@
 from src.utils.db_connection import test_connection
 
-test_connection()
\ No newline at end of file
+if __name__ == "__main__":
+    test_connection()
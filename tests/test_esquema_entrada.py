@@ -0,0 +1,34 @@
+# tests/test_esquema_entrada.py
+"""
+Pré-processador compilado (src/utils/esquema_entrada.py): só é usado quando
+reproduz o ColumnTransformer; nos outros casos fica o pipeline original.
+"""
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+from sklearn.tree import DecisionTreeClassifier
+
+from src.utils.esquema_entrada import PipelineCompilado, compilar_pipeline
+
+
+def pipeline_com(codificador):
+    X = pd.DataFrame({"transporte": ["Carro"] * 4 + ["Bicicleta"] * 4 + ["Moto"]})
+    y = [0, 1] * 4 + [0]
+    return Pipeline([("preprocessor", ColumnTransformer([("cat", codificador, ["transporte"])])),
+                     ("model", DecisionTreeClassifier(random_state=0))]).fit(X, y)
+
+
+def test_handle_unknown_ignore_compila():
+    assert isinstance(compilar_pipeline(pipeline_com(OneHotEncoder(handle_unknown="ignore"))), PipelineCompilado)
+
+
+@pytest.mark.parametrize("codificador", [
+    OneHotEncoder(),
+    OneHotEncoder(handle_unknown="infrequent_if_exist", min_frequency=2),
+    OneHotEncoder(handle_unknown="ignore", max_categories=2),
+], ids=["error", "infrequent_if_exist", "max_categories"])
+def test_codificador_nao_equivalente_usa_pipeline_original(codificador):
+    modelo_pipeline = pipeline_com(codificador)
+    assert compilar_pipeline(modelo_pipeline) is modelo_pipeline
@@ -0,0 +1,39 @@
+# tests/test_explicacao.py
+"""Explicação SHAP (src/utils/explicacao.py): coluna certa da classe prevista, sem ajuste silencioso."""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from xgboost import XGBClassifier
+
+from src.utils.explicacao import ExplicadorPrevisao
+
+
+@pytest.fixture(scope="module")
+def binario():
+    """Explicador de um XGBoost binário (uma saída de SHAP só) e uma linha de entrada."""
+    X = pd.DataFrame({"idade": [20, 25, 30, 35, 40, 45, 50, 55],
+                      "transporte": ["Carro", "Caminhada"] * 4})
+    y = [0, 0, 0, 1, 0, 1, 1, 1]
+    preprocessor = ColumnTransformer([("num", StandardScaler(), ["idade"]),
+                                      ("cat", OneHotEncoder(handle_unknown="ignore"), ["transporte"])])
+    modelo_pipeline = Pipeline([("preprocessor", preprocessor),
+                                ("model", XGBClassifier(n_estimators=5, max_depth=2))]).fit(X, y)
+    return ExplicadorPrevisao(modelo_pipeline), X.iloc[[5]]
+
+
+def test_binario_classe_0_e_o_oposto_da_classe_1(binario):
+    explicador, linha = binario
+    assert explicador.contribuicoes(linha).shape[1] == 1
+    classe_1 = explicador.explicar(linha, 1).set_index("fator")["contribuicao"]
+    classe_0 = explicador.explicar(linha, 0).set_index("fator")["contribuicao"]
+    assert np.allclose(classe_0, -classe_1.loc[classe_0.index])
+
+
+@pytest.mark.parametrize("indice_classe", [2, -1])
+def test_classe_fora_das_saidas_levanta_index_error(binario, indice_classe):
+    explicador, linha = binario
+    with pytest.raises(IndexError):
+        explicador.explicar(linha, indice_classe)
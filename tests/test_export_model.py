@@ -0,0 +1,49 @@
+# tests/test_export_model.py
+"""
+Paridade do modelo compacto (src/models/export_model.py) com o pipeline
+original na base Gold: Random Forest bit a bit e XGBoost dentro da
+tolerância da exponencial do softmax.
+"""
+import os
+import warnings
+
+import joblib
+import numpy as np
+import pytest
+
+from src.models.export_model import MODELS_DIR, TOLERANCIA, exportar
+from src.utils.dados_gold import carregar_gold
+from src.utils.modelo_compacto import ModeloCompacto
+
+MODELOS = {
+    "random_forest": os.path.join(MODELS_DIR, "random_forest_pipeline.joblib"),
+    "xgboost": os.path.join(MODELS_DIR, "xgboost_pipeline.joblib"),
+}
+LE_PATH = os.path.join(MODELS_DIR, "label_encoder.joblib")
+
+
+@pytest.fixture(scope="module", params=sorted(MODELOS))
+def exportado(request, tmp_path_factory):
+    """(pipeline, modelo compacto exportado, features da Gold) de cada tipo de modelo."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        modelo_pipeline = joblib.load(MODELOS[request.param])
+    diretorio = exportar(modelo_pipeline, joblib.load(LE_PATH), str(tmp_path_factory.mktemp(request.param)))
+    modelo_compacto = ModeloCompacto.carregar(diretorio)
+    assert modelo_compacto.tipo_modelo == request.param
+    return modelo_pipeline, modelo_compacto, carregar_gold(colunas=modelo_compacto.colunas_entrada)
+
+
+def test_preprocessamento_identico(exportado):
+    """Mesma matriz do ColumnTransformer, inclusive com colunas float32/int8 da Gold."""
+    modelo_pipeline, modelo_compacto, X = exportado
+    esperado = modelo_pipeline.named_steps["preprocessor"].transform(X)
+    assert np.array_equal(modelo_compacto.transformar(X), esperado)
+
+
+def test_predict_proba_identico(exportado):
+    modelo_pipeline, modelo_compacto, X = exportado
+    esperado = modelo_pipeline.predict_proba(X)
+    obtido = modelo_compacto.predict_proba(X)
+    assert np.abs(esperado - obtido).max() <= TOLERANCIA[modelo_compacto.tipo_modelo]
+    assert np.array_equal(esperado.argmax(axis=1), obtido.argmax(axis=1))
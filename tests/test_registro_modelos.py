@@ -0,0 +1,47 @@
+# tests/test_registro_modelos.py
+"""Registro de modelos: registrar não muda a versão em produção sem pedido explícito."""
+import joblib
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from src.utils.registro_modelos import ativar, registrar, versao_atual
+
+
+@pytest.fixture
+def artefatos(tmp_path):
+    """Dois pipelines diferentes (pequenos) e o label encoder, gravados em .joblib."""
+    X = pd.DataFrame({"idade": [20, 30, 40, 50]})
+    le = LabelEncoder().fit(["Peso Normal", "Sobrepeso"])
+    y = le.transform(["Peso Normal", "Peso Normal", "Sobrepeso", "Sobrepeso"])
+    caminhos = []
+    for profundidade in (1, 2):
+        pipeline = Pipeline([("preprocessor", ColumnTransformer([("num", StandardScaler(), ["idade"])])),
+                             ("model", DecisionTreeClassifier(max_depth=profundidade, random_state=profundidade))])
+        caminho = tmp_path / f"pipeline_{profundidade}.joblib"
+        joblib.dump(pipeline.fit(X, y), caminho)
+        caminhos.append(str(caminho))
+    caminho_le = tmp_path / "label_encoder.joblib"
+    joblib.dump(le, caminho_le)
+    return caminhos, str(caminho_le), str(tmp_path / "registro")
+
+
+def test_registrar_nao_ativa_por_padrao(artefatos):
+    (modelo, _), caminho_le, diretorio = artefatos
+    registrar(modelo, caminho_le, diretorio=diretorio, exportar_compacto=False)
+    assert versao_atual(diretorio) is None
+
+
+def test_registrar_de_novo_nao_desfaz_rollback(artefatos):
+    (antigo, novo), caminho_le, diretorio = artefatos
+    versao_antiga = registrar(antigo, caminho_le, diretorio=diretorio, ativar_versao=True, exportar_compacto=False)
+    versao_nova = registrar(novo, caminho_le, diretorio=diretorio, ativar_versao=True, exportar_compacto=False)
+    assert versao_atual(diretorio) == versao_nova
+
+    ativar(versao_antiga, diretorio)
+    #Mesmos artefatos do treino anterior: devolve a versão existente sem trocar a de produção
+    assert registrar(novo, caminho_le, diretorio=diretorio, ativar_versao=True, exportar_compacto=False) == versao_nova
+    assert versao_atual(diretorio) == versao_antiga
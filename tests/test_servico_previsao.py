@@ -0,0 +1,103 @@
+# tests/test_servico_previsao.py
+"""
+Respostas do serviço HTTP (src/servico/servico_previsao.py) para pacientes
+válidos e inválidos, passando pelo microlote como em produção.
+"""
+import asyncio
+
+import pytest
+
+from src.features.engenharia import gerar_formularios
+from src.servico.servico_previsao import ServicoPrevisao, _responder, carregar_pontuador_pipeline, resolver_arquivos
+from src.utils.recarregador_modelo import RecarregadorModelo
+from src.utils.registro_modelos import LE_LEGADO, MODELO_LEGADO
+
+
+@pytest.fixture(scope="module")
+def recarregador():
+    """Modelo carregado uma vez para o módulo inteiro (sem troca em segundo plano)."""
+    return RecarregadorModelo(carregar_pontuador_pipeline, resolver=resolver_arquivos(MODELO_LEGADO, LE_LEGADO),
+                              intervalo_s=0).carregar_inicial()
+
+
+def responder(recarregador, *pacientes):
+    """Envia cada paciente como um pedido concorrente; devolve (resultados, erro) de cada um."""
+    async def rodar():
+        servico = ServicoPrevisao(recarregador=recarregador)
+        servico.carregar()
+        try:
+            return await asyncio.gather(*(_responder(servico, [paciente]) for paciente in pacientes))
+        finally:
+            await servico.agrupador.fechar()
+    return asyncio.run(rodar())
+
+
+def paciente_valido(semente=0):
+    paciente = gerar_formularios(1, semente=semente).iloc[0].to_dict()
+    paciente["idade"] = int(paciente["idade"])
+    return paciente
+
+
+def test_paciente_valido(recarregador):
+    [(resultados, erro)] = responder(recarregador, paciente_valido())
+    assert erro is None
+    assert resultados[0]["classe_prevista"]
+
+
+@pytest.mark.parametrize("valor", ["X", None, 3, ["Feminino"]])
+def test_opcao_fora_do_formulario_responde_422(recarregador, valor):
+    paciente = {**paciente_valido(), "genero": valor}
+    [(_, erro)] = responder(recarregador, paciente)
+    assert erro.status_code == 422
+
+
+@pytest.mark.parametrize("idade", [None, "30", 500, -1, float("nan"), True])
+def test_idade_invalida_responde_422(recarregador, idade):
+    paciente = {**paciente_valido(), "idade": idade}
+    [(_, erro)] = responder(recarregador, paciente)
+    assert erro.status_code == 422
+
+
+def test_idade_decimal_aceita(recarregador):
+    [(_, erro)] = responder(recarregador, {**paciente_valido(), "idade": 30.5})
+    assert erro is None
+
+
+def test_paciente_invalido_nao_derruba_o_microlote(recarregador):
+    invalido = {**paciente_valido(), "transporte_habitual": "Foguete"}
+    (resultados_1, erro_1), (_, erro_invalido), (resultados_2, erro_2) = responder(
+        recarregador, paciente_valido(1), invalido, paciente_valido(2))
+    assert erro_invalido.status_code == 422
+    assert erro_1 is None and erro_2 is None
+    assert resultados_1[0]["classe_prevista"] and resultados_2[0]["classe_prevista"]
+
+
+class PontuadorComFalha:
+    """Pontuador que sempre falha (ex: modelo corrompido), contando as chamadas."""
+
+    def __init__(self):
+        self.chamadas = 0
+
+    def pontuar(self, features):
+        self.chamadas += 1
+        raise RuntimeError("modelo indisponível")
+
+
+class RecarregadorFixo:
+    """Mesma interface do RecarregadorModelo usada pelo serviço, com um objeto fixo."""
+
+    def __init__(self, pontuador):
+        self.pontuador = pontuador
+
+    def iniciar(self):
+        return self
+
+    def atual(self):
+        return "teste", self.pontuador
+
+
+def test_falha_do_lote_responde_500_sem_refazer_pedido_a_pedido():
+    pontuador = PontuadorComFalha()
+    respostas = responder(RecarregadorFixo(pontuador), *(paciente_valido(semente) for semente in range(3)))
+    assert [erro.status_code for _, erro in respostas] == [500, 500, 500]
+    assert pontuador.chamadas == 1